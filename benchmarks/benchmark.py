@@ -0,0 +1,201 @@
+"""
+Benchmark of the overhead of the decorators.
+
+The suite measures :
+
+- the overhead per call of `Decorator`, `Counter`, `Timer`, `TimerCounter` and `TimerCounterLogger`, activated and deactivated,
+  in a single thread and in several threads (threadsafe decorators), compared to the undecorated function.
+- the memory per record of `TimerCounterLogger` for each number of records.
+- the rendering time of the ``*_repr`` properties for each number of records.
+
+The results are printed (or written) in JSON. With a baseline (a previous output), the suite exits with the status 1
+if a result exceeds its baseline value by more than the threshold.
+
+.. code-block:: console
+
+    python benchmarks/benchmark.py --output baseline.json
+    python benchmarks/benchmark.py --baseline baseline.json --threshold 0.25
+    python benchmarks/benchmark.py --sizes 3,4,5,6,7 # 10^3 to 10^7 records (10^7 records needs several GB)
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+# The repository root, so the script runs from a checkout without installing the package.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import decoratepy
+from decoratepy import Decorator, Counter, Timer, TimerCounter, TimerCounterLogger
+
+class _NoRecord(Decorator):
+    """
+    Decorator measuring the calls without recording them, to benchmark the wrapper of `Decorator` alone.
+    """
+
+    def initialize(self) -> None:
+        pass
+
+    def _record(self, slot: int, start: int, runtime: int) -> None:
+        pass
+
+DECORATORS = {
+    "Decorator": _NoRecord,
+    "Counter": Counter,
+    "Timer": Timer,
+    "TimerCounter": TimerCounter,
+    "TimerCounterLogger": TimerCounterLogger,
+}
+
+REPRS = {
+    "Decorator": [],
+    "Counter": ["name_repr"],
+    "Timer": ["name_repr"],
+    "TimerCounter": ["name_repr"],
+    "TimerCounterLogger": ["name_repr", "log_repr", "details_repr"],
+}
+
+def _noop():
+    pass
+
+def _run(func: Callable, number: int, threads: int) -> float:
+    """
+    Returns the wall time in ns of number calls of the function in each thread.
+    """
+    if threads == 1:
+        tic = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        return time.perf_counter_ns() - tic
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        for _ in range(number):
+            func()
+        barrier.wait()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    tic = time.perf_counter_ns()
+    barrier.wait()
+    toc = time.perf_counter_ns()
+    for thread in workers:
+        thread.join()
+    return toc - tic
+
+def _best(func: Callable, number: int, threads: int, repeat: int) -> float:
+    """
+    Returns the best time in ns per call over the repetitions.
+    """
+    return min(_run(func, number, threads) for _ in range(repeat)) / (number * threads)
+
+def bench_overhead(number: int, repeat: int, threads: int) -> Dict[str, dict]:
+    """
+    Returns the overhead in ns per call of each decorator, activated and deactivated, in 1 and in the given number of threads.
+    """
+    results = {}
+    for thread_count in sorted({1, threads}):
+        reference = _best(_noop, number, thread_count, repeat)
+        for name, cls in DECORATORS.items():
+            for state in ("activated", "deactivated"):
+                decorator = cls(threadsafe=thread_count > 1)
+                decorator.set_activated(state == "activated")
+                wrapped = decorator(_noop)
+                # The logger grows with each call : it is recreated for each repetition.
+                timings = []
+                for _ in range(repeat):
+                    decorator.initialize()
+                    timings.append(_run(wrapped, number, thread_count) / (number * thread_count))
+                results[f"overhead/{name}/{state}/{thread_count}-thread"] = {"value": min(timings) - reference, "unit": "ns/call"}
+    return results
+
+def bench_records(sizes: List[int]) -> Dict[str, dict]:
+    """
+    Returns the memory per record of the logger and the rendering time of the representations for each number of records.
+    """
+    results = {}
+    for size in sizes:
+        for name, cls in DECORATORS.items():
+            if not REPRS[name]:
+                continue
+            decorator = cls()
+            wrapped = decorator(_noop)
+            if name == "TimerCounterLogger":
+                tracemalloc.start()
+                before = tracemalloc.get_traced_memory()[0]
+                for _ in range(size):
+                    wrapped()
+                decorator.logger # merges the shards as the representations do
+                results[f"memory/{name}/{size}-records"] = {"value": (tracemalloc.get_traced_memory()[0] - before) / size, "unit": "B/record"}
+                tracemalloc.stop()
+            else:
+                for _ in range(size):
+                    wrapped()
+            for attribute in REPRS[name]:
+                tic = time.perf_counter_ns()
+                getattr(decorator, attribute)
+                results[f"repr/{name}.{attribute}/{size}-records"] = {"value": (time.perf_counter_ns() - tic) / 1e9, "unit": "s"}
+    return results
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """
+    Returns the descriptions of the results exceeding their baseline value by more than the threshold (the values are lower is better).
+    The results missing in the baseline, and the baseline values not strictly positive, are not compared.
+    """
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None or reference["value"] <= 0:
+            continue
+        if result["value"] > reference["value"] * (1 + threshold):
+            regressions.append(f"{key} : {result['value']:.4g} {result['unit']} > {reference['value']:.4g} {reference['unit']} (+{100 * threshold:.0f}%)")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark of the overhead of the decoratepy decorators.")
+    parser.add_argument("--number", type=int, default=100000, help="number of calls per measurement and per thread (default 100000)")
+    parser.add_argument("--repeat", type=int, default=5, help="number of measurements, the best is kept (default 5)")
+    parser.add_argument("--threads", type=int, default=4, help="number of threads of the multi-threaded measurements (default 4)")
+    parser.add_argument("--sizes", default="3,4,5", help="exponents of the numbers of records (default 3,4,5 for 10^3 to 10^5)")
+    parser.add_argument("--output", help="JSON file of the results (default standard output)")
+    parser.add_argument("--baseline", help="JSON file of previous results to compare with")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative increase over the baseline (default 0.25)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    results.update(bench_overhead(args.number, args.repeat, args.threads))
+    results.update(bench_records([10 ** int(exponent) for exponent in args.sizes.split(",")]))
+    output = {
+        "decoratepy": decoratepy.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    text = json.dumps(output, indent=4)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as stream:
+            stream.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as stream:
+            baseline = json.load(stream)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"regression : {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
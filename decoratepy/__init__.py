@@ -1,17 +1,42 @@
 from .__version__ import __version__
+from .clock import Clock
+from .histogram import Histogram
+from .snapshot import Snapshot
 from .decorator import Decorator
 from .timer import Timer
 from .counter import Counter
 from .timer_counter import TimerCounter
 from .timer_counter_logger import TimerCounterLogger
+from .memoize import Memoize
+from .single_flight import SingleFlight
+from .micro_batch import MicroBatch
+from .composite import Composite
+from .log_view import LogView
 from .class_propagate import class_propagate
+from .module_propagate import module_propagate, Instrumentation
+from .binary_log import BinaryLogSink, BinaryLogReader
+from .openmetrics import OpenMetricsExporter, MetricsServer
 
 __all__ = [
     "__version__",
+    "Clock",
+    "Histogram",
+    "Snapshot",
     "Decorator",
     "Timer",
     "Counter",
     "TimerCounter",
     "TimerCounterLogger",
-    "class_propagate"
+    "Memoize",
+    "SingleFlight",
+    "MicroBatch",
+    "Composite",
+    "LogView",
+    "class_propagate",
+    "module_propagate",
+    "Instrumentation",
+    "BinaryLogSink",
+    "BinaryLogReader",
+    "OpenMetricsExporter",
+    "MetricsServer",
 ]
\ No newline at end of file
@@ -0,0 +1,331 @@
+import os
+import mmap
+import queue
+import struct
+import atexit
+import datetime
+import threading
+from typing import List, Tuple, Iterator, Optional
+from .report import _local_date
+
+_MAGIC = b"DPYLOG\x00\x01"
+_RECORD = struct.Struct("<qqI") # (date since the epoch in ns, runtime in ns, function id)
+
+def _read_names(path: str) -> List[str]:
+    """
+    Reads the function names table of a binary log.
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as file:
+        return [line.rstrip("\n") for line in file]
+
+class BinaryLogSink(object):
+    """
+    Append-only binary file receiving the call records of a `TimerCounterLogger`.
+
+    The records are fixed-width (20 bytes: date since the epoch in ns, runtime in ns and function id).
+    They are stored in the file ``path`` after an 8-byte header.
+    The function names are appended to the table ``path + ".names"``, one name per line, the line number being the function id.
+    An existing file is continued, so the logs survive process restarts.
+
+    The records are buffered and the full batches are written by a background thread.
+    The buffer is flushed every ``flush_interval`` seconds and when the sink is closed (at the latest at interpreter exit).
+    The records written after the sink is closed are dropped, so closing the sink never breaks the decorated functions.
+
+    Parameters
+    ----------
+        path: str
+            The path of the records file.
+
+        batch_size: int, optional
+            The number of records of a batch. Default is 4096.
+
+        flush_interval: float, optional
+            The maximal delay in seconds before a record is written. Default is 1.0.
+
+    Raises
+    ------
+        TypeError: If a parameter has a wrong type.
+        ValueError: If ``batch_size`` or ``flush_interval`` is not strictly positive, or the file is not a binary log.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        timercounterlogger = TimerCounterLogger(max_records=1000, sink=BinaryLogSink("calls.log"))
+
+        with BinaryLogReader("calls.log") as reader:
+            print(reader.number_calls("func_name"))
+    """
+
+    def __init__(self, path: str, batch_size: int = 4096, flush_interval: float = 1.0):
+        if not isinstance(path, str):
+            raise TypeError("Parameter path is not a string.")
+        if not isinstance(batch_size, int) or isinstance(batch_size, bool):
+            raise TypeError("Parameter batch_size is not an integer.")
+        if batch_size <= 0:
+            raise ValueError("Parameter batch_size must be strictly positive.")
+        if not isinstance(flush_interval, (int, float)) or isinstance(flush_interval, bool):
+            raise TypeError("Parameter flush_interval is not a number.")
+        if flush_interval <= 0:
+            raise ValueError("Parameter flush_interval must be strictly positive.")
+        self._path = path
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        # Continuing an existing log.
+        self._ids = {name: func_id for func_id, name in enumerate(_read_names(path + ".names"))}
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            # The header is written at once so that a reader can open the file before the first batch.
+            self._file.write(_MAGIC)
+            self._file.flush()
+        else:
+            with open(path, "rb") as file:
+                if file.read(len(_MAGIC)) != _MAGIC:
+                    self._file.close()
+                    raise ValueError(f"The file `{path}` is not a binary log.")
+            # Dropping a partial record left by an interrupted process.
+            size = self._file.tell() - len(_MAGIC)
+            self._file.truncate(len(_MAGIC) + size - size % _RECORD.size)
+        self._names_file = open(path + ".names", "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._records = [] # pending records (date, runtime, function id)
+        self._names = [] # pending new function names
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="BinaryLogSink", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def path(self) -> str:
+        """
+        Returns the path of the records file.
+        """
+        return self._path
+
+    def write(self, func_name: str, date: int, runtime: int) -> None:
+        """
+        Adds a record to the sink.
+
+        Parameters
+        ----------
+            func_name: str
+                The name of the function.
+
+            date: int
+                The start of the call in nanoseconds since the epoch.
+
+            runtime: int
+                The runtime of the call in nanoseconds.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            func_id = self._ids.get(func_name)
+            if func_id is None:
+                func_id = len(self._ids)
+                self._ids[func_name] = func_id
+                self._names.append(func_name)
+            self._records.append((date, runtime, func_id))
+            if len(self._records) >= self._batch_size:
+                self._push()
+
+    def _push(self) -> None:
+        """
+        Sends the pending records to the background writer (the lock must be held).
+        """
+        if self._records or self._names:
+            self._queue.put((self._names, self._records))
+            self._names, self._records = [], []
+
+    def _run(self) -> None:
+        """
+        Writes the batches received from the queue.
+        """
+        while True:
+            try:
+                batch = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                with self._lock:
+                    self._push()
+                continue
+            if batch is None:
+                self._queue.task_done()
+                return
+            names, records = batch
+            # The names are written first so that every record refers to a known name.
+            if names:
+                self._names_file.write("".join(name + "\n" for name in names))
+                self._names_file.flush()
+            self._file.write(b"".join(_RECORD.pack(*record) for record in records))
+            self._file.flush()
+            self._queue.task_done()
+
+    def flush(self) -> None:
+        """
+        Writes all the pending records and waits for the background writer.
+        """
+        with self._lock:
+            self._push()
+        self._queue.join()
+
+    def close(self) -> None:
+        """
+        Writes all the pending records and closes the files.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._push()
+            self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+        self._names_file.close()
+        atexit.unregister(self.close)
+
+    def __enter__(self) -> "BinaryLogSink":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+class BinaryLogReader(object):
+    """
+    Reader of a binary log written by `BinaryLogSink`.
+
+    The records file is memory-mapped and the queries scan it without loading the records into memory.
+
+    Parameters
+    ----------
+        path: str
+            The path of the records file.
+
+    Raises
+    ------
+        TypeError: If path is not a string.
+        ValueError: If the file is not a binary log.
+    """
+
+    def __init__(self, path: str):
+        if not isinstance(path, str):
+            raise TypeError("Parameter path is not a string.")
+        self._path = path
+        self._names = _read_names(path + ".names")
+        self._file = open(path, "rb")
+        # An empty file is a log created by a sink whose header is not written yet.
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(self._file.fileno()).st_size else None
+        if self._mmap is None:
+            self._size = 0
+            return
+        if self._mmap[:len(_MAGIC)] != _MAGIC:
+            self.close()
+            raise ValueError(f"The file `{path}` is not a binary log.")
+        size = len(self._mmap) - len(_MAGIC)
+        self._size = size - size % _RECORD.size
+
+    def close(self) -> None:
+        """
+        Closes the memory map and the file.
+        """
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> "BinaryLogReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of records.
+        """
+        return self._size // _RECORD.size
+
+    def _iter_raw(self) -> Iterator[Tuple[int, int, int]]:
+        """
+        Iterates over the records as tuples (date in ns, runtime in ns, function id).
+        """
+        if self._mmap is None:
+            return
+        view = memoryview(self._mmap)[len(_MAGIC):len(_MAGIC) + self._size]
+        try:
+            yield from _RECORD.iter_unpack(view)
+        finally:
+            view.release()
+
+    def __iter__(self) -> Iterator[list]:
+        """
+        Iterates over the records as lists ``[date, function name, runtime]``.
+        """
+        for date, runtime, func_id in self._iter_raw():
+            yield [_local_date(date), self._names[func_id], runtime / 1e9]
+
+    def _function_id(self, func_name: str) -> Optional[int]:
+        if not isinstance(func_name, str):
+            raise TypeError("Parameter func_name is not a string.")
+        try:
+            return self._names.index(func_name)
+        except ValueError:
+            return None
+
+    @property
+    def total_runcall(self) -> int:
+        """
+        Returns the total runcall.
+        """
+        return len(self)
+
+    @property
+    def total_runtime(self) -> float:
+        """
+        Returns the total runtime in seconds.
+        """
+        return sum(runtime for _, runtime, _ in self._iter_raw()) / 1e9
+
+    def get_functions(self) -> List[str]:
+        """
+        Returns the names of the logged functions sorted in alphabetic order.
+        """
+        func_ids = set(func_id for _, _, func_id in self._iter_raw())
+        return sorted(self._names[func_id] for func_id in func_ids)
+
+    def number_calls(self, func_name: str) -> int:
+        """
+        Computes the number of calls of the given function.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        func_id = self._function_id(func_name)
+        return sum(1 for _, _, record_id in self._iter_raw() if record_id == func_id)
+
+    def cumul_runtime(self, func_name: str) -> float:
+        """
+        Computes the cumulative runtime of the given function in seconds.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        func_id = self._function_id(func_name)
+        return sum(runtime for _, runtime, record_id in self._iter_raw() if record_id == func_id) / 1e9
+
+    def get_logcall(self, func_name: str) -> List[list]:
+        """
+        Extracts the records of the given function sorted in date order.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        func_id = self._function_id(func_name)
+        logcalls = [[_local_date(date), func_name, runtime / 1e9] for date, runtime, record_id in self._iter_raw() if record_id == func_id]
+        logcalls.sort(key=lambda logcall: logcall[0])
+        return logcalls
@@ -0,0 +1,577 @@
+import time
+import heapq
+import bisect
+import datetime
+from array import array
+from operator import itemgetter
+from typing import List, Optional, Iterable, Callable, Tuple
+from .report import _local_date
+
+_INT64_MAX = 2 ** 63 - 1
+
+_timestamp_key = itemgetter(0) # timestamp of a record tuple (timestamp, function id, runtime)
+
+class CallLog(object):
+    """
+    Columnar storage of call records used by `TimerCounterLogger`.
+
+    Each record is split into three typed arrays instead of a Python list per call :
+
+    - the interned function identifier (``uint32``),
+    - the start timestamp in nanoseconds (``int64``),
+    - the runtime in nanoseconds (``int64``).
+
+    A record therefore costs 20 bytes, and aggregations such as the total runtime run over a contiguous buffer.
+    Per-function aggregates (count, sum, min, max) and the record numbers of each function are updated as the records are appended,
+    so the summary queries are constant-time and the listing of a function only visits its own records.
+    The timestamps are readings of a monotonic clock (``time.monotonic_ns`` by default) and are converted into dates with an epoch offset,
+    measured when the log is created unless it is given : the logs sharing a clock should share the offset, so that their dates stay comparable.
+
+    Records are identified by a record number increasing with each call.
+    A retention policy can drop the oldest records :
+
+    - with ``max_records``, the columns are preallocated as a ring buffer of that size and each new record overwrites the oldest one,
+    - with ``max_age``, the records started more than ``max_age`` seconds ago are dropped.
+
+    The aggregates always cover every call ever appended, including the dropped records.
+
+    Parameters
+    ----------
+        max_records: int, optional
+            The maximal number of retained records. Default is None (no limit).
+
+        max_age: float, optional
+            The maximal age of the retained records in seconds. Default is None (no limit).
+
+        clock: callable, optional
+            The function returning the current timestamp in nanoseconds. Default is ``time.monotonic_ns``.
+
+        epoch: int, optional
+            The offset in nanoseconds from the timestamps to the time since the epoch. Default is None (measured with the clock).
+
+    Raises
+    ------
+        TypeError: If ``max_records`` is not an integer, ``max_age`` is not a number or ``epoch`` is not an integer.
+        ValueError: If ``max_records`` or ``max_age`` is not strictly positive.
+    """
+
+    def __init__(self, max_records: Optional[int] = None, max_age: Optional[float] = None, clock: Callable[[], int] = time.monotonic_ns, epoch: Optional[int] = None):
+        if max_records is not None:
+            if not isinstance(max_records, int) or isinstance(max_records, bool):
+                raise TypeError("Parameter max_records is not an integer.")
+            if max_records <= 0:
+                raise ValueError("Parameter max_records must be strictly positive.")
+        if max_age is not None:
+            if not isinstance(max_age, (int, float)) or isinstance(max_age, bool):
+                raise TypeError("Parameter max_age is not a number.")
+            if max_age <= 0:
+                raise ValueError("Parameter max_age must be strictly positive.")
+        if epoch is not None and (not isinstance(epoch, int) or isinstance(epoch, bool)):
+            raise TypeError("Parameter epoch is not an integer.")
+        self._capacity = max_records
+        self._clock = clock
+        self._epoch = time.time_ns() - clock() if epoch is None else epoch # offset from the clock to the epoch in ns
+        self._max_age = None if max_age is None else int(max_age * 1e9) # in ns
+        self.initialize()
+
+    @property
+    def max_records(self) -> Optional[int]:
+        """
+        Returns the maximal number of retained records (None if unlimited).
+        """
+        return self._capacity
+
+    @property
+    def max_age(self) -> Optional[float]:
+        """
+        Returns the maximal age of the retained records in seconds (None if unlimited).
+        """
+        return None if self._max_age is None else self._max_age / 1e9
+
+    def initialize(self) -> None:
+        """
+        Clears the records and the function names table, keeping the epoch.
+        """
+        self._names = [] # index: int = function id // value: str = function name
+        self._ids = {} # key: str = function name // value: int = function id
+        if self._capacity is None:
+            self._func_ids = array('I') # function id of each record
+            self._timestamps = array('q') # start time of each record in ns
+            self._runtimes = array('q') # runtime of each record in ns
+        else:
+            # Preallocation of the ring buffer.
+            self._func_ids = array('I', bytes(4 * self._capacity))
+            self._timestamps = array('q', bytes(8 * self._capacity))
+            self._runtimes = array('q', bytes(8 * self._capacity))
+        self._first = 0 # record number of the oldest retained record
+        self._next = 0 # record number of the next record
+        self._sorted_until = 0 # record number of the first record not known to be in date order
+        self._shift = 0 # number of records removed from the start of the growable columns
+        self._counts = array('Q') # index: int = function id // value: int = number of calls
+        self._sums = array('q') # index: int = function id // value: int = cumulative runtime in ns
+        self._mins = array('q') # index: int = function id // value: int = minimal runtime in ns
+        self._maxs = array('q') # index: int = function id // value: int = maximal runtime in ns
+        self._offsets = [] # index: int = function id // value: array = record numbers of the retained records
+        self._heads = [] # index: int = function id // value: int = first retained entry in the offsets
+        self._total_runtime = 0
+        self._total_count = 0
+
+    def clear(self) -> None:
+        """
+        Removes the records and resets the aggregates, keeping the function names table, the epoch and the record numbering.
+        """
+        names, number = self._names, self._next
+        self.initialize()
+        self._first = self._next = self._sorted_until = self._shift = number
+        for func_name in names:
+            self.intern(func_name)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of retained records.
+        """
+        return self._next - self._first
+
+    @property
+    def epoch(self) -> int:
+        """
+        Returns the offset in nanoseconds from the timestamps of the log to the time since the epoch.
+        """
+        return self._epoch
+
+    @property
+    def total_count(self) -> int:
+        """
+        Returns the number of records ever appended, including the dropped ones.
+        """
+        return self._total_count
+
+    def _position(self, number: int) -> int:
+        """
+        Returns the position in the columns of the given record number.
+        """
+        if self._capacity is None:
+            return number - self._shift
+        return number % self._capacity
+
+    def intern(self, func_name: str) -> int:
+        """
+        Returns the identifier of the given function name, registering it if needed.
+
+        Parameters
+        ----------
+            func_name: str
+                The name of the function.
+
+        Returns
+        -------
+            func_id: int
+                The identifier of the function in the names table.
+        """
+        func_id = self._ids.get(func_name)
+        if func_id is None:
+            func_id = len(self._names)
+            self._ids[func_name] = func_id
+            self._names.append(func_name)
+            self._counts.append(0)
+            self._sums.append(0)
+            self._mins.append(_INT64_MAX)
+            self._maxs.append(0)
+            self._offsets.append(array('Q'))
+            self._heads.append(0)
+        return func_id
+
+    def append(self, func_id: int, timestamp: int, runtime: int) -> None:
+        """
+        Appends a record to the log, dropping the oldest records following the retention policy.
+
+        Parameters
+        ----------
+            func_id: int
+                The identifier returned by `intern`.
+
+            timestamp: int
+                The start time of the call in nanoseconds.
+
+            runtime: int
+                The runtime of the call in nanoseconds.
+        """
+        # The retained records stay sorted while each record starts after the previous one.
+        in_order = self._sorted_until == self._next and (self._next == self._first or timestamp >= self._timestamps[self._position(self._next - 1)])
+        if self._capacity is None:
+            self._func_ids.append(func_id)
+            self._timestamps.append(timestamp)
+            self._runtimes.append(runtime)
+        else:
+            if self._next - self._first == self._capacity:
+                self._drop()
+            position = self._next % self._capacity
+            self._func_ids[position] = func_id
+            self._timestamps[position] = timestamp
+            self._runtimes[position] = runtime
+        self._offsets[func_id].append(self._next)
+        self._next += 1
+        if in_order:
+            self._sorted_until = self._next
+        # Updating the aggregates.
+        self._counts[func_id] += 1
+        self._sums[func_id] += runtime
+        if runtime < self._mins[func_id]:
+            self._mins[func_id] = runtime
+        if runtime > self._maxs[func_id]:
+            self._maxs[func_id] = runtime
+        self._total_runtime += runtime
+        self._total_count += 1
+        if self._max_age is not None:
+            self.expire(timestamp)
+
+    def _drop(self) -> None:
+        """
+        Drops the oldest retained record.
+        """
+        func_id = self._func_ids[self._position(self._first)]
+        self._first += 1
+        if self._sorted_until < self._first:
+            self._sorted_until = self._first
+        # Removing the record number from the function index.
+        head = self._heads[func_id] + 1
+        offsets = self._offsets[func_id]
+        if 2 * head >= len(offsets):
+            del offsets[:head]
+            head = 0
+        self._heads[func_id] = head
+
+    def expire(self, now: Optional[int] = None) -> None:
+        """
+        Drops the records older than ``max_age``.
+
+        Parameters
+        ----------
+            now: int, optional
+                The current timestamp in nanoseconds. Default is the current time.
+        """
+        if self._max_age is None:
+            return
+        if now is None:
+            now = self.now()
+        limit = now - self._max_age
+        while self._first < self._next and self._timestamps[self._position(self._first)] < limit:
+            self._drop()
+        # Releasing the memory of the dropped records of the growable columns.
+        removed = self._first - self._shift
+        if self._capacity is None and removed > 1024 and 2 * removed >= len(self._runtimes):
+            del self._func_ids[:removed]
+            del self._timestamps[:removed]
+            del self._runtimes[:removed]
+            self._shift = self._first
+
+    def now(self) -> int:
+        """
+        Returns the current timestamp in nanoseconds.
+        """
+        return self._clock()
+
+    def date(self, timestamp: int) -> datetime.datetime:
+        """
+        Converts a timestamp of the log into a local date.
+        """
+        return _local_date(timestamp + self._epoch)
+
+    def function_id(self, func_name: str) -> Optional[int]:
+        """
+        Returns the identifier of the given function name or None if the function was never logged.
+        """
+        return self._ids.get(func_name)
+
+    def function_names(self) -> List[str]:
+        """
+        Returns the names table, the index of a name being its function identifier.
+        """
+        return list(self._names)
+
+    def function_name(self, func_id: int) -> str:
+        """
+        Returns the function name associated with the given identifier.
+        """
+        return self._names[func_id]
+
+    def timestamp(self, number: int) -> int:
+        """
+        Returns the start timestamp of the given record in nanoseconds.
+        """
+        return self._timestamps[self._position(number)]
+
+    def record_function(self, number: int) -> int:
+        """
+        Returns the function id of the given record.
+        """
+        return self._func_ids[self._position(number)]
+
+    def is_retained(self, number: int) -> bool:
+        """
+        Returns True if the given record number is a retained record.
+        """
+        return self._first <= number < self._next
+
+    def record(self, number: int) -> list:
+        """
+        Returns the given record as a list ``[date, function name, runtime in seconds]``.
+        """
+        position = self._position(number)
+        return [self.date(self._timestamps[position]), self._names[self._func_ids[position]], self._runtimes[position] / 1e9]
+
+    def numbers(self) -> range:
+        """
+        Returns the record numbers of the retained records.
+        """
+        return range(self._first, self._next)
+
+    def columns(self) -> Tuple[array, array, array]:
+        """
+        Returns copies of the columns of the retained records (function ids, timestamps, runtimes) in record number order.
+        """
+        if len(self) == 0:
+            return array('I'), array('q'), array('q')
+        start, stop = self._position(self._first), self._position(self._next - 1) + 1
+        if start < stop:
+            return self._func_ids[start:stop], self._timestamps[start:stop], self._runtimes[start:stop]
+        # The ring buffer wraps around.
+        return self._func_ids[start:] + self._func_ids[:stop], self._timestamps[start:] + self._timestamps[:stop], self._runtimes[start:] + self._runtimes[:stop]
+
+    def records(self, numbers: Optional[Iterable[int]] = None) -> List[list]:
+        """
+        Returns the given records (all the retained records by default) as lists ``[date, function name, runtime in seconds]``.
+        """
+        if numbers is None:
+            numbers = self.numbers()
+        return [self.record(number) for number in numbers]
+
+    def indices(self, func_id: int) -> List[int]:
+        """
+        Returns the record numbers of the retained records of the given function.
+        """
+        return self._offsets[func_id][self._heads[func_id]:].tolist()
+
+    def count(self, func_id: int) -> int:
+        """
+        Returns the number of calls of the given function, including the dropped records.
+        """
+        return self._counts[func_id]
+
+    def runtime(self, func_id: int) -> int:
+        """
+        Returns the sum of the runtimes of the given function in nanoseconds, including the dropped records.
+        """
+        return self._sums[func_id]
+
+    def min_runtime(self, func_id: int) -> int:
+        """
+        Returns the minimal runtime of the given function in nanoseconds (0 if the function has no record).
+        """
+        return self._mins[func_id] if self._counts[func_id] else 0
+
+    def max_runtime(self, func_id: int) -> int:
+        """
+        Returns the maximal runtime of the given function in nanoseconds.
+        """
+        return self._maxs[func_id]
+
+    def function_ids(self) -> List[int]:
+        """
+        Returns the identifiers of the functions having at least one call.
+        """
+        return [func_id for func_id, count in enumerate(self._counts) if count]
+
+    def total_runtime(self) -> int:
+        """
+        Returns the sum of the runtimes of all the calls in nanoseconds, including the dropped records.
+        """
+        return self._total_runtime
+
+    def _reorder(self, order: List[int], start: Optional[int] = None) -> None:
+        """
+        Permutes the retained records numbered from ``start`` (the oldest retained record by default) following the given record numbers.
+        """
+        if start is None:
+            start = self._first
+        numbers = range(start, self._next)
+        func_ids = [self._func_ids[self._position(number)] for number in order]
+        timestamps = [self._timestamps[self._position(number)] for number in order]
+        runtimes = [self._runtimes[self._position(number)] for number in order]
+        for number, func_id, timestamp, runtime in zip(numbers, func_ids, timestamps, runtimes):
+            position = self._position(number)
+            self._func_ids[position] = func_id
+            self._timestamps[position] = timestamp
+            self._runtimes[position] = runtime
+        # Rebuilding the record numbers of each function from start.
+        for func_id, offsets in enumerate(self._offsets):
+            del offsets[bisect.bisect_left(offsets, start, self._heads[func_id]):]
+        for number, func_id in zip(numbers, func_ids):
+            self._offsets[func_id].append(number)
+
+    @property
+    def is_sorted(self) -> bool:
+        """
+        Returns True if the retained records are in date order.
+        """
+        return self._sorted_until >= self._next
+
+    @classmethod
+    def merge(cls, logs: List["CallLog"], max_records: Optional[int] = None, max_age: Optional[float] = None, clock: Callable[[], int] = time.monotonic_ns, epoch: Optional[int] = None) -> "CallLog":
+        """
+        Merges several logs into a new log.
+
+        The retained records are interleaved by start date and the retention policy is applied to the result.
+        The aggregates of the result cover every call of the merged logs.
+
+        Parameters
+        ----------
+            logs: list of CallLog
+                The logs to merge.
+
+            max_records: int, optional
+                The maximal number of retained records of the result. Default is None (no limit).
+
+            max_age: float, optional
+                The maximal age of the retained records of the result in seconds. Default is None (no limit).
+
+            clock: callable, optional
+                The clock of the timestamps of the logs. Default is ``time.monotonic_ns``.
+
+            epoch: int, optional
+                The offset in nanoseconds from the timestamps of the result to the time since the epoch. Default is None (measured with the clock).
+
+        Returns
+        -------
+            log: CallLog
+                The merged log.
+        """
+        merged = cls(max_records, max_age, clock, epoch)
+        merged.append_new(logs, [0] * len(logs))
+        merged.sum_aggregates(logs)
+        return merged
+
+    def append_new(self, logs: List["CallLog"], starts: List[int]) -> List[int]:
+        """
+        Appends in date order the records of several logs, starting from the given record numbers.
+
+        The records of each log form a run, sorted only if the log is not already in date order, and the runs are merged.
+        Called again with the returned record numbers, it only appends the records added since the previous call,
+        so a log can be kept merged incrementally. The aggregates are not replaced (see `sum_aggregates`).
+
+        Parameters
+        ----------
+            logs: list of CallLog
+                The logs whose records are appended.
+
+            starts: list of int
+                The record number of the first record to append of each log (the dropped records are skipped).
+
+        Returns
+        -------
+            starts: list of int
+                The record numbers following the appended records of each log.
+        """
+        runs = []
+        for log, start in zip(logs, starts):
+            shift = log._epoch - self._epoch
+            mapping = [self.intern(func_name) for func_name in log._names]
+            positions = map(log._position, range(max(start, log._first), log._next))
+            run = [(log._timestamps[position] + shift, mapping[log._func_ids[position]], log._runtimes[position]) for position in positions]
+            if log._sorted_until < log._next:
+                run.sort(key=_timestamp_key)
+            runs.append(run)
+        for timestamp, func_id, runtime in (runs[0] if len(runs) == 1 else heapq.merge(*runs, key=_timestamp_key)):
+            self.append(func_id, timestamp, runtime)
+        return [log._next for log in logs]
+
+    def sum_aggregates(self, logs: List["CallLog"]) -> None:
+        """
+        Replaces the aggregates by the sum of the aggregates of the given logs, which cover every call including the dropped records.
+
+        Parameters
+        ----------
+            logs: list of CallLog
+                The logs whose aggregates are summed.
+        """
+        for func_id in range(len(self._names)):
+            self._counts[func_id] = 0
+            self._sums[func_id] = 0
+            self._mins[func_id] = _INT64_MAX
+            self._maxs[func_id] = 0
+        self._total_runtime = 0
+        self._total_count = 0
+        for log in logs:
+            for func_id, func_name in enumerate(log._names):
+                merged_id = self.intern(func_name)
+                self._counts[merged_id] += log._counts[func_id]
+                self._sums[merged_id] += log._sums[func_id]
+                self._mins[merged_id] = min(self._mins[merged_id], log._mins[func_id])
+                self._maxs[merged_id] = max(self._maxs[merged_id], log._maxs[func_id])
+            self._total_runtime += log._total_runtime
+            self._total_count += log._total_count
+
+    def extend(self, other: "CallLog") -> None:
+        """
+        Appends the retained records of another log, following the retention policy, and adds its aggregates.
+
+        Parameters
+        ----------
+            other: CallLog
+                The log to append.
+        """
+        counts, sums = array('Q', self._counts), array('q', self._sums)
+        total_runtime, total_count = self._total_runtime, self._total_count
+        shift = other._epoch - self._epoch
+        for number in other.numbers():
+            position = other._position(number)
+            self.append(self.intern(other._names[other._func_ids[position]]), other._timestamps[position] + shift, other._runtimes[position])
+        # Replacing the aggregates by the ones of all the calls, including the records dropped by the other log.
+        for func_id, func_name in enumerate(other._names):
+            merged_id = self._ids[func_name]
+            self._counts[merged_id] = (counts[merged_id] if merged_id < len(counts) else 0) + other._counts[func_id]
+            self._sums[merged_id] = (sums[merged_id] if merged_id < len(sums) else 0) + other._sums[func_id]
+            self._mins[merged_id] = min(self._mins[merged_id], other._mins[func_id])
+            self._maxs[merged_id] = max(self._maxs[merged_id], other._maxs[func_id])
+        self._total_runtime = total_runtime + other._total_runtime
+        self._total_count = total_count + other._total_count
+
+    def sort_by_date(self) -> None:
+        """
+        Sorts the retained records by start date.
+
+        The log tracks the records appended in date order, so only the records appended out of order are sorted,
+        then merged into the end of the sorted records which start after the first of them.
+        Sorting a sorted log costs nothing.
+        """
+        if self._sorted_until >= self._next:
+            return
+        timestamp = self.timestamp
+        tail = sorted(range(self._sorted_until, self._next), key=timestamp)
+        # The sorted records starting before the first record of the tail keep their place.
+        low, high = self._first, self._sorted_until
+        limit = timestamp(tail[0])
+        while low < high:
+            middle = (low + high) // 2
+            if timestamp(middle) <= limit:
+                low = middle + 1
+            else:
+                high = middle
+        self._reorder(list(heapq.merge(range(low, self._sorted_until), tail, key=timestamp)), low)
+        self._sorted_until = self._next
+
+    def sort_by_name(self) -> None:
+        """
+        Sorts the retained records by function name.
+        """
+        names = self._names
+        self._reorder(sorted(self.numbers(), key=lambda number: names[self._func_ids[self._position(number)]]))
+        # Finding the records still in date order.
+        self._sorted_until = self._first
+        previous = None
+        for number in self.numbers():
+            current = self.timestamp(number)
+            if previous is not None and current < previous:
+                break
+            previous = current
+            self._sorted_until = number + 1
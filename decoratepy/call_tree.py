@@ -0,0 +1,192 @@
+from typing import Dict, List
+
+class CallTree(object):
+    """
+    Aggregated call tree of the decorated functions used in the call tree mode of `Decorator`.
+
+    Each node is a call path from a root call to a decorated function. Its children are the decorated functions called
+    during the calls of the path. For each node, the tree stores the number of calls, the inclusive runtime (the whole calls)
+    and the exclusive runtime (the calls minus the runtime of their decorated children) in nanoseconds.
+
+    The nodes are stored in parallel lists indexed by node identifier, the node 0 being the root of the tree.
+    A tree is written by a single thread; the lists are only appended, so the tree can be read while it grows.
+    """
+
+    def __init__(self):
+        self._children = {} # key: (int, int) = (parent node, slot) // value: int = node
+        self._slots = [-1] # index: int = node // value: int = slot of the function
+        self._parents = [-1] # index: int = node // value: int = parent node
+        self._counts = [0] # index: int = node // value: int = number of calls
+        self._inclusive = [0] # index: int = node // value: int = inclusive runtime in ns
+        self._exclusive = [0] # index: int = node // value: int = exclusive runtime in ns
+
+    def __len__(self) -> int:
+        """
+        Returns the number of nodes, including the root.
+        """
+        return len(self._exclusive)
+
+    def child(self, parent: int, slot: int) -> int:
+        """
+        Returns the node of the given function called from the given node, creating it if needed.
+
+        Parameters
+        ----------
+            parent: int
+                The parent node (0 for a root call).
+
+            slot: int
+                The slot of the called function.
+
+        Returns
+        -------
+            node: int
+                The child node.
+        """
+        key = (parent, slot)
+        node = self._children.get(key)
+        if node is None:
+            node = len(self._exclusive)
+            self._children[key] = node
+            # The exclusive runtimes are appended last : the nodes below their length are complete.
+            self._slots.append(slot)
+            self._parents.append(parent)
+            self._counts.append(0)
+            self._inclusive.append(0)
+            self._exclusive.append(0)
+        return node
+
+    def add(self, node: int, inclusive: int, exclusive: int) -> None:
+        """
+        Adds a call to the given node.
+
+        Parameters
+        ----------
+            node: int
+                The node of the call.
+
+            inclusive: int
+                The runtime of the call in nanoseconds.
+
+            exclusive: int
+                The runtime of the call minus the runtime of its decorated children in nanoseconds.
+        """
+        self._counts[node] += 1
+        self._inclusive[node] += inclusive
+        self._exclusive[node] += exclusive
+
+    @classmethod
+    def merge(cls, trees: List["CallTree"]) -> "CallTree":
+        """
+        Merges several trees into a new tree, summing the nodes with the same call path.
+
+        Parameters
+        ----------
+            trees: list of CallTree
+                The trees to merge.
+
+        Returns
+        -------
+            tree: CallTree
+                The merged tree.
+        """
+        merged = cls()
+        for tree in trees:
+            mapping = [0] * len(tree) # index: int = node of the tree // value: int = node of the merged tree
+            for node in range(1, len(mapping)):
+                # A parent is always created before its children.
+                merged_node = merged.child(mapping[tree._parents[node]], tree._slots[node])
+                mapping[node] = merged_node
+                merged._counts[merged_node] += tree._counts[node]
+                merged._inclusive[merged_node] += tree._inclusive[node]
+                merged._exclusive[merged_node] += tree._exclusive[node]
+        return merged
+
+    def nodes(self) -> range:
+        """
+        Returns the identifiers of the nodes, excluding the root.
+        """
+        return range(1, len(self))
+
+    def called_nodes(self) -> List[int]:
+        """
+        Returns the identifiers of the nodes with at least one call or a called descendant (a call raising an exception is not counted).
+        """
+        called = [count > 0 for count in self._counts[:len(self)]]
+        for node in reversed(self.nodes()):
+            if called[node]:
+                called[self._parents[node]] = True
+        return [node for node in self.nodes() if called[node]]
+
+    def parent(self, node: int) -> int:
+        """
+        Returns the parent of the given node (0 for a root call).
+        """
+        return self._parents[node]
+
+    def slot(self, node: int) -> int:
+        """
+        Returns the slot of the function of the given node.
+        """
+        return self._slots[node]
+
+    def count(self, node: int) -> int:
+        """
+        Returns the number of calls of the given node.
+        """
+        return self._counts[node]
+
+    def inclusive(self, node: int) -> int:
+        """
+        Returns the inclusive runtime of the given node in nanoseconds.
+        """
+        return self._inclusive[node]
+
+    def exclusive(self, node: int) -> int:
+        """
+        Returns the exclusive runtime of the given node in nanoseconds.
+        """
+        return self._exclusive[node]
+
+    def children(self, node: int) -> List[int]:
+        """
+        Returns the children of the given node in creation order.
+        """
+        return [child for child in range(node + 1, len(self)) if self._parents[child] == node]
+
+    def is_recursive(self, node: int) -> bool:
+        """
+        Returns True if the function of the given node is also the function of one of its ancestors.
+        """
+        slot = self._slots[node]
+        parent = self._parents[node]
+        while parent > 0:
+            if self._slots[parent] == slot:
+                return True
+            parent = self._parents[parent]
+        return False
+
+    def function_totals(self) -> Dict[int, List[int]]:
+        """
+        Returns the number of calls, the inclusive runtime and the exclusive runtime in nanoseconds of each function.
+        The inclusive runtime of a recursive call is already included in the one of the outer call, so it is not added again.
+
+        Returns
+        -------
+            totals: dict
+                key: int = slot // value: list = [number of calls, inclusive runtime, exclusive runtime]
+        """
+        totals = {}
+        for node in self.nodes():
+            total = totals.setdefault(self._slots[node], [0, 0, 0])
+            total[0] += self._counts[node]
+            total[2] += self._exclusive[node]
+            if not self.is_recursive(node):
+                total[1] += self._inclusive[node]
+        return totals
+
+    def total_runtime(self) -> int:
+        """
+        Returns the runtime of the root calls in nanoseconds, in which every nested call is counted once.
+        """
+        return sum(self._inclusive[node] for node in self.children(0))
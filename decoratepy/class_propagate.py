@@ -1,8 +1,58 @@
 from .decorator import Decorator
-from typing import Optional, List
+from typing import Optional, List, Pattern, Union
+import fnmatch
+import re
 import types
 
-def class_propagate(decorator: Decorator, names: Optional[List[str]] = None):  
+def _is_method(member: object) -> bool:
+    """
+    Returns True if the class member is a function or a method descriptor.
+    """
+    return isinstance(member, (types.FunctionType, staticmethod, classmethod, property))
+
+def _accessor(func: types.FunctionType, kind: str) -> types.FunctionType:
+    """
+    Returns a copy of a property accessor named after its kind (``value.fget``, ``value.fset`` or ``value.fdel``),
+    so the getter, the setter and the deleter of a property are reported under different names.
+    """
+    accessor = types.FunctionType(func.__code__, func.__globals__, f"{func.__name__}.{kind}", func.__defaults__, func.__closure__)
+    accessor.__kwdefaults__ = func.__kwdefaults__
+    accessor.__dict__.update(func.__dict__)
+    accessor.__module__ = func.__module__
+    accessor.__doc__ = func.__doc__
+    accessor.__annotations__ = func.__annotations__
+    accessor.__qualname__ = f"{func.__qualname__}.{kind}"
+    return accessor
+
+def _decorate_member(decorator: Decorator, member: object):
+    """
+    Returns the decorated version of a class member and the decorated functions,
+    or (None, []) if the member is not a method.
+
+    The functions of the staticmethod, classmethod and property descriptors are decorated and wrapped again in the same descriptor type.
+    The accessors of a property are decorated under the names ``{name}.fget``, ``{name}.fset`` and ``{name}.fdel``.
+    """
+    if isinstance(member, types.FunctionType):
+        if decorator._is_wrapper(member):
+            return None, []
+        decorated = decorator(member)
+        return decorated, [decorated]
+    if isinstance(member, (staticmethod, classmethod)):
+        if not isinstance(member.__func__, types.FunctionType) or decorator._is_wrapper(member.__func__):
+            return None, []
+        decorated = decorator(member.__func__)
+        return type(member)(decorated), [decorated]
+    if isinstance(member, property):
+        accessors = [member.fget, member.fset, member.fdel]
+        if not any(isinstance(accessor, types.FunctionType) and not decorator._is_wrapper(accessor) for accessor in accessors):
+            return None, []
+        accessors = [decorator(_accessor(accessor, kind)) if isinstance(accessor, types.FunctionType) and not decorator._is_wrapper(accessor) else accessor
+                     for accessor, kind in zip(accessors, ("fget", "fset", "fdel"))]
+        decorated = type(member)(*accessors, member.__doc__)
+        return decorated, [accessor for accessor in accessors if decorator._is_wrapper(accessor)]
+    return None, []
+
+def class_propagate(decorator: Decorator, names: Optional[List[str]] = None, pattern: Optional[Union[str, Pattern]] = None, inherited: bool = False):  
     """
     Applies a given decorator to specific methods of a class. 
     
@@ -13,9 +63,20 @@ def class_propagate(decorator: Decorator, names: Optional[List[str]] = None):
         
         names: list of str, optional
             A list of method names to which the decorator should be applied.
-            If `None`, the decorator is applied to all methods of the class.
+            The names can be glob patterns (``"get_*"``, ``"_load?"``, ...).
+            If `None` and `pattern` is `None`, the decorator is applied to all methods of the class.
+            Default value is `None`.
+
+        pattern: str or re.Pattern, optional
+            A regular expression matching the whole name of the methods to which the decorator should be applied,
+            in addition to the methods selected by `names`.
             Default value is `None`.
 
+        inherited: bool, optional
+            If True, the selected methods inherited from the base classes are also decorated.
+            The decorated methods are set on the decorated class, so the base classes are not modified.
+            Default value is False.
+
     Returns
     -------
         class_decorator: function
@@ -26,12 +87,16 @@ def class_propagate(decorator: Decorator, names: Optional[List[str]] = None):
         TypeError:
             - If `decorator` is not an instance of the `Decorator` class.
             - If `names` is provided and is not a list of strings.
-            - If any of the specified method names in `names` does not exist in the class.
+            - If `pattern` is provided and is not a string or a compiled regular expression.
+            - If `inherited` is not a booleen.
+            - If any of the method names in `names` (not a glob pattern) is an attribute of the class which is not a method.
 
     Notes
     -----
-    - Only methods that are regular functions (of type `types.FunctionType`) will be targeted.
-    - Does not apply the decorator to special methods (e.g., `__init__`, `__str__`) unless explicitly listed in `names`.
+    - The methods are the regular and asynchronous functions, the `staticmethod` and `classmethod` objects and the accessors of the `property` objects
+      (reported as ``{name}.fget``, ``{name}.fset`` and ``{name}.fdel``).
+      The functions of the descriptors are decorated and wrapped again in the same descriptor type.
+    - The methods already decorated by the decorator are not decorated twice.
 
     Examples
     --------
@@ -58,6 +123,11 @@ def class_propagate(decorator: Decorator, names: Optional[List[str]] = None):
             
             def method2(self):
                 pass
+
+        #Decorating the methods starting with `get_`, including the inherited ones:
+        @class_propagate(my_decorator, names=["get_*"], inherited=True)
+        class MyChildClass(MyClass):
+            pass
     """
     if not isinstance(decorator, Decorator):
         raise TypeError("The parameter `decorator` must be an instance of the `Decorator` class.")
@@ -66,12 +136,40 @@ def class_propagate(decorator: Decorator, names: Optional[List[str]] = None):
         if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
             raise TypeError("The `names` parameter must be a list of strings or `None`.")
 
+    if pattern is not None:
+        if isinstance(pattern, str):
+            pattern = re.compile(pattern)
+        elif not isinstance(pattern, re.Pattern):
+            raise TypeError("The `pattern` parameter must be a string, a compiled regular expression or `None`.")
+
+    if not isinstance(inherited, bool):
+        raise TypeError("Parameter inherited is not a booleen.")
+
+    def selected(attr_name: str) -> bool:
+        if names is None and pattern is None:
+            return True
+        if names is not None and any(fnmatch.fnmatchcase(attr_name, name) for name in names):
+            return True
+        return pattern is not None and pattern.fullmatch(attr_name) is not None
+
     def class_decorator(cls):
-        for attr_name, attr_value in cls.__dict__.items():
-            # Check if the attribute is a regular function and matches the specified names
-            if isinstance(attr_value, types.FunctionType) and (names is None or attr_name in names):
-                setattr(cls, attr_name, decorator(attr_value))
-            elif names is not None and attr_name in names and not isinstance(attr_value, types.FunctionType):
+        members = dict(cls.__dict__)
+        if inherited:
+            # Following the method resolution order, the first definition of a name is the inherited one.
+            for base in cls.__mro__[1:]:
+                if base is object:
+                    continue
+                for attr_name, attr_value in vars(base).items():
+                    members.setdefault(attr_name, attr_value)
+        for attr_name, attr_value in members.items():
+            if not selected(attr_name):
+                continue
+            decorated, functions = _decorate_member(decorator, attr_value)
+            if decorated is not None:
+                setattr(cls, attr_name, decorated)
+                for function in functions:
+                    decorator._register_site(function, cls, attr_name, decorated, attr_value)
+            elif names is not None and attr_name in names and attr_name in cls.__dict__ and not _is_method(attr_value):
                 raise TypeError(f"The attribute `{attr_name}` is not a valid method to decorate.")
         return cls
 
@@ -0,0 +1,138 @@
+import time
+from typing import Callable, Optional, Union, List
+
+class Clock(object):
+    """
+    Clock used by the decorators to measure the runtimes in integer nanoseconds.
+
+    The available clocks are :
+
+    - ``"perf_counter"`` : highest available resolution, monotonic (default),
+    - ``"monotonic"`` : monotonic, not affected by system time updates,
+    - ``"process_time"`` : CPU time of the current process (system and user),
+    - ``"thread_time"`` : CPU time of the current thread (system and user),
+    - ``"time"`` : wall-clock time, affected by system time updates.
+
+    The clocks following the elapsed time (``perf_counter``, ``monotonic``, ``time``) are absolute:
+    their readings can be converted into dates.
+
+    Parameters
+    ----------
+        name: str
+            The name of the clock.
+
+        read: callable
+            The function returning the current value of the clock in nanoseconds.
+
+        absolute: bool, optional
+            If the clock follows the elapsed time. Default is True.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        timer = Timer(clock="process_time")
+        timer = Timer(clock=Clock.get("thread_time"))
+    """
+
+    def __init__(self, name: str, read: Callable[[], int], absolute: bool = True):
+        if not isinstance(name, str):
+            raise TypeError("Parameter name is not a string.")
+        if not callable(read):
+            raise TypeError("Parameter read is not callable.")
+        if not isinstance(absolute, bool):
+            raise TypeError("Parameter absolute is not a booleen.")
+        self.name = name
+        self.read = read
+        self.absolute = absolute
+
+    def __repr__(self) -> str:
+        return f"Clock({self.name})"
+
+    def epoch(self) -> Optional[int]:
+        """
+        Returns the offset in nanoseconds to add to the readings of the clock to get the time since the epoch,
+        or None if the clock is not absolute.
+        """
+        if not self.absolute:
+            return None
+        return time.time_ns() - self.read()
+
+    def measure_overhead(self, n: int = 10000) -> int:
+        """
+        Measures the median time between two consecutive readings of the clock.
+
+        This is the time added to each measured runtime by the measurement itself.
+
+        Parameters
+        ----------
+            n: int, optional
+                The number of samples. Default is 10000.
+
+        Returns
+        -------
+            overhead: int
+                The overhead in nanoseconds.
+
+        Raises
+        ------
+            TypeError: If n is not an integer.
+            ValueError: If n is not strictly positive.
+        """
+        if not isinstance(n, int) or isinstance(n, bool):
+            raise TypeError("Parameter n is not an integer.")
+        if n <= 0:
+            raise ValueError("Parameter n must be strictly positive.")
+        read = self.read
+        samples = []
+        for _ in range(n):
+            tic = read()
+            toc = read()
+            samples.append(toc - tic)
+        samples.sort()
+        return samples[n // 2]
+
+    @staticmethod
+    def available() -> List[str]:
+        """
+        Returns the names of the clocks available on the platform.
+        """
+        return list(_CLOCKS.keys())
+
+    @staticmethod
+    def get(clock: Union[str, "Clock"]) -> "Clock":
+        """
+        Returns the clock with the given name.
+
+        Parameters
+        ----------
+            clock: str or Clock
+                The name of the clock or a clock.
+
+        Returns
+        -------
+            clock: Clock
+                The clock.
+
+        Raises
+        ------
+            TypeError: If clock is not a string or a Clock.
+            ValueError: If no clock has the given name.
+        """
+        if isinstance(clock, Clock):
+            return clock
+        if not isinstance(clock, str):
+            raise TypeError("Parameter clock is not a string or a Clock.")
+        if clock not in _CLOCKS:
+            raise ValueError(f"Unknown clock `{clock}`, available clocks are {Clock.available()}.")
+        return _CLOCKS[clock]
+
+_CLOCKS = {
+    "perf_counter": Clock("perf_counter", time.perf_counter_ns),
+    "monotonic": Clock("monotonic", time.monotonic_ns),
+    "process_time": Clock("process_time", time.process_time_ns, absolute=False),
+    "time": Clock("time", time.time_ns),
+}
+if hasattr(time, "thread_time_ns"):
+    _CLOCKS["thread_time"] = Clock("thread_time", time.thread_time_ns, absolute=False)
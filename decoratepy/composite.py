@@ -0,0 +1,299 @@
+from typing import Sequence, Tuple
+from .decorator import Decorator
+from .snapshot import Snapshot
+
+class Composite(Decorator):
+    """
+    Fuse several decorators into a single wrapper.
+
+    Stacking decorators adds a wrapper, an activation check and a clock reading at every layer.
+    The composite decorates the functions once : the slot of the function in each component is resolved at the decoration,
+    the clock is read once per call and the same measurement is recorded by each activated component.
+    Each component keeps its own activation status and sampling, and its own measurements and representations.
+    The composite itself has no measurements : its snapshot is the tuple of the snapshots of the components.
+
+    The components are the decorators recording the measured calls (`Counter`, `Timer`, `TimerCounter`, `TimerCounterLogger`
+    and their subclasses), with the same clock, without the hotswap and call tree modes.
+
+    HELP Composite
+    ==============
+
+    Create a composite with :
+
+    .. code-block:: python
+
+        counter = Counter()
+        timer = Timer()
+        logger = TimerCounterLogger()
+        composite = Composite(counter, timer, logger)
+
+    Then decorate functions with the composite.
+
+    .. code-block:: python
+
+        @composite
+        def func_name():
+            pass
+
+    Initialize the components with :
+
+    .. code-block:: python
+
+        composite.initialize()
+
+    Deactivate and re-activate a component alone, or every component, with :
+
+    .. code-block:: python
+
+        timer.set_deactivated()
+        timer.set_activated()
+        composite.set_deactivated()
+        composite.set_activated()
+
+    Print the representations of the components with :
+
+    .. code-block:: python
+
+        print(composite.name_repr) # equivalent of print(composite)
+
+    The result will be :
+
+    .. code-block:: console
+
+        Composite(
+        {component name_repr}
+        {component name_repr}
+        )
+    """
+
+    __help__ = """
+HELP Composite
+==============
+
+Create a composite with :
+
+.. code-block:: python
+
+    counter = Counter()
+    timer = Timer()
+    logger = TimerCounterLogger()
+    composite = Composite(counter, timer, logger)
+
+Then decorate functions with the composite.
+
+.. code-block:: python
+
+    @composite
+    def func_name():
+        pass
+
+Initialize the components with :
+
+.. code-block:: python
+
+    composite.initialize()
+
+Deactivate and re-activate a component alone, or every component, with :
+
+.. code-block:: python
+
+    timer.set_deactivated()
+    timer.set_activated()
+    composite.set_deactivated()
+    composite.set_activated()
+
+Print the representations of the components with :
+
+.. code-block:: python
+
+    print(composite.name_repr) # equivalent of print(composite)
+
+The result will be :
+
+.. code-block:: console
+
+    Composite(
+    {component name_repr}
+    {component name_repr}
+    )
+"""
+
+    _supports_sampling = False
+
+    def __init__(self, *components: Decorator, hotswap: bool = False):
+        """
+        Parameters
+        ----------
+            components: Decorator
+                The decorators to fuse.
+            hotswap: bool, optional
+                Restore the original functions when the composite is deactivated.
+                Default value is False.
+
+        Raises
+        ------
+            TypeError: If a component is not a decorator recording the measured calls, or hotswap is not a booleen.
+            ValueError: If there is no component, a component is given twice, is in hotswap or call tree mode, or the clocks of the components differ.
+        """
+        if not components:
+            raise ValueError("Composite needs at least one component.")
+        for component in components:
+            if not isinstance(component, Decorator) or type(component).__call__ is not Decorator.__call__:
+                raise TypeError("The components must be decorators recording the measured calls.")
+            if component.is_hotswap() or component.is_calltree():
+                raise ValueError("The hotswap and call tree modes of the components are not supported by Composite.")
+            if component.get_clock() is not components[0].get_clock():
+                raise ValueError("The components must use the same clock.")
+        if len(set(map(id, components))) != len(components):
+            raise ValueError("A component is given twice.")
+        super().__init__(hotswap=hotswap, clock=components[0].get_clock())
+        self._components = components
+        self._targets = [] # index: int = slot // value: tuple = (component, slot of the function in the component, recording method) of each component
+
+    @property
+    def components(self) -> Tuple[Decorator, ...]:
+        """
+        Returns the fused decorators.
+        """
+        return self._components
+
+    def initialize(self) -> None:
+        """
+        Initializes the measurements of each component.
+        """
+        for component in self._components:
+            component.initialize()
+
+    def snapshot(self, measurements: bool = True, reset: bool = False) -> Tuple[Snapshot, ...]:
+        """
+        Returns the snapshots of the components, in the order of the components (see `Decorator.snapshot`).
+
+        Each component is locked during its own snapshot : a call recorded between two snapshots is only in the last ones.
+
+        Parameters
+        ----------
+            measurements: bool, optional
+                If False, the snapshots only hold the totals of each function.
+                Default value is True.
+
+            reset: bool, optional
+                If True, the measurements of each component are reset in the same operation.
+                Default value is False.
+
+        Returns
+        -------
+            snapshots: Tuple[Snapshot, ...]
+                The snapshot of each component.
+
+        Raises
+        ------
+            TypeError: If measurements or reset is not a booleen.
+        """
+        return tuple(component.snapshot(measurements=measurements, reset=reset) for component in self._components)
+
+    def merge(self, snapshots: Sequence[Snapshot]) -> None:
+        """
+        Adds the snapshots of a composite with the same types of components to the components (see `Decorator.merge`).
+
+        Parameters
+        ----------
+            snapshots: Sequence[Snapshot]
+                The snapshots returned by `snapshot`.
+
+        Raises
+        ------
+            TypeError: If snapshots is not a sequence of snapshots.
+            ValueError: If the number of snapshots differs from the number of components, or a snapshot cannot be merged in its component.
+        """
+        if not isinstance(snapshots, (tuple, list)) or not all(isinstance(snapshot, Snapshot) for snapshot in snapshots):
+            raise TypeError("Parameter snapshots is not a sequence of snapshots.")
+        if len(snapshots) != len(self._components):
+            raise ValueError(f"Composite has {len(self._components)} components, not {len(snapshots)}.")
+        for component, snapshot in zip(self._components, snapshots):
+            if snapshot.kind != type(component).__name__:
+                raise ValueError(f"The snapshot was taken from a {snapshot.kind}, not a {type(component).__name__}.")
+            if snapshot.data is None:
+                raise ValueError("The snapshot does not contain the measurements.")
+        for component, snapshot in zip(self._components, snapshots):
+            component.merge(snapshot)
+
+    def _add_slot(self) -> None:
+        """
+        Adds the targets of a new decorated function (set by `__call__`).
+        """
+        self._targets.append(())
+
+    def __call__(self, func):
+        """
+        Decorates the given function once for every component.
+
+        Parameters
+        ----------
+            func: callable
+                The function to decorate.
+
+        Returns
+        -------
+            wrapped: callable
+                The decorated function.
+        """
+        slot = self._register(func)
+        self._targets[slot] = tuple((component, component._register(func), component._record) for component in self._components)
+        return super().__call__(func)
+
+    def _record(self, slot: int, start: int, runtime: int) -> None:
+        """
+        Records the measurement of a call in each activated component measuring it (counted by the sampling of the component),
+        minus the measurement overhead of the component.
+        """
+        for component, component_slot, record in self._targets[slot]:
+            if component._activated and (component._sampling_mode is None or not component._skip(component_slot)):
+                measured = runtime - component._overhead
+                record(component_slot, start, measured if measured > 0 else 0)
+
+    def _wrapper(self, slot: int, func, *args, **kwargs):
+        """
+        Runs the function with a single runtime measurement for every component.
+        """
+        tic = self._clock()
+        outputs = func(*args, **kwargs)
+        toc = self._clock()
+        self._record(slot, tic, toc - tic)
+        return outputs
+
+    async def _async_wrapper(self, slot: int, func, *args, **kwargs):
+        """
+        Awaits the coroutine function with a single runtime measurement for every component.
+        """
+        tic = self._clock()
+        outputs = await func(*args, **kwargs)
+        toc = self._clock()
+        self._record(slot, tic, toc - tic)
+        return outputs
+
+    def __repr__(self) -> str:
+        """
+        Returns the string representation.
+        Default = self.name_repr
+        """
+        return self.name_repr
+
+    def get_help(self) -> str:
+        """
+        Returns the documentation 'How to Use' of the decorator
+        """
+        return self.__help__
+
+    @property
+    def name_repr(self) -> str:
+        """
+        Returns the string representation in the following format:
+
+        .. code-block:: console
+
+            Composite(
+            {component name_repr}
+            {component name_repr}
+            )
+        """
+        return "Composite(\n" + "\n".join(component.name_repr for component in self._components) + "\n)"
@@ -1,11 +1,13 @@
-from .decorator import Decorator
+import threading
+from typing import Tuple
+from .decorator import Decorator, _sum_lists
 
 class Counter(Decorator):
     """
     Compute the number of call of various functions. 
 
-    .. warning::
-        If 2 functions/methods have the same '__name__' attribute, the Counter will combined the two runcalls. 
+    .. note::
+        Each decorated function is reported under its '__name__' attribute. If another decorated function already uses this name, the Counter reports it under its '__qualname__' (then its module and '__qualname__').
 
     HELP Counter
     ============
@@ -112,8 +114,16 @@ The result will be :
     )
 """
 
-    def __init__(self):
-        super().__init__()
+    _measures_runtime = False
+
+    def __init__(self, **kwargs):
+        """
+        Parameters
+        ----------
+            kwargs:
+                The options of `Decorator` (threadsafe, hotswap, clock, sampling, calltree).
+        """
+        super().__init__(**kwargs)
         self.initialize()
 
     @property
@@ -121,13 +131,84 @@ The result will be :
         """
         Returns the total runcall.
         """
-        return sum(self._counter[func_name] for func_name in self._counter.keys())
+        counter = self._merged_counter()
+        return sum(counter[func_name] for func_name in counter.keys())
 
     def initialize(self) -> None:
         """
         Sets the counter to 0 for each functions.
         """
-        self._counter = {} # key: str = function name // value: int = number of call
+        self._counter = [0] * len(self._names) # index: int = slot // value: int = number of call
+        self._reset_shards()
+
+    def _add_slot(self) -> None:
+        """
+        Adds a counter for a new decorated function.
+        """
+        self._counter.append(0)
+        for _, counter in self._shards:
+            counter.append(0)
+
+    def _new_shard(self) -> tuple:
+        """
+        Returns a lock and an empty counter for a new thread.
+        """
+        return (threading.RLock(), [0] * len(self._names))
+
+    def _measured_counter(self) -> list:
+        """
+        Returns the number of measured calls of each slot, merging the per-thread shards in threadsafe mode.
+        """
+        if self._threadsafe:
+            with self._locked_shards() as shards:
+                return _sum_lists([counter for _, counter in shards], len(self._names))
+        return list(self._counter)
+
+    def _merged_counter(self) -> dict:
+        """
+        Returns the number of calls of each called function, merging the per-thread shards in threadsafe mode.
+        In sampling mode, the calls not measured are added.
+        """
+        counter = self._measured_counter()
+        for slot, skipped in enumerate(self._sampling_counters()[1]):
+            counter[slot] += skipped
+        return {self._names[slot]: count for slot, count in enumerate(counter) if count}
+
+    def _snapshot_data(self) -> dict:
+        """
+        Returns the number of measured calls of each called function.
+        """
+        counter = self._measured_counter()
+        return {self._names[slot]: count for slot, count in enumerate(counter) if count}
+
+    def _merge_data(self, data: dict) -> None:
+        """
+        Adds the number of calls of each function of a snapshot.
+        """
+        slots = {func_name: self._named_slot(func_name) for func_name in data.keys()}
+        if self._threadsafe:
+            lock, counter = self._local_shard()
+            with lock:
+                for func_name, count in data.items():
+                    counter[slots[func_name]] += count
+        else:
+            for func_name, count in data.items():
+                self._counter[slots[func_name]] += count
+
+    def _snapshot_totals(self) -> Tuple[list, list]:
+        """
+        Returns the number of measured calls of each slot, without runtime.
+        """
+        counter = self._measured_counter()
+        return counter, [0] * len(counter)
+
+    def _reset_data(self) -> None:
+        """
+        Sets the counter of each slot to 0.
+        """
+        for counter in [self._counter] + [counter for _, counter in self._shards]:
+            for slot in range(len(counter)):
+                counter[slot] = 0
 
     def __repr__(self) -> str:
         """
@@ -136,19 +217,27 @@ The result will be :
         """
         return self.name_repr
 
-    def _wrapper(self, func, *args, **kwargs):
+    def _wrapper(self, slot: int, func, *args, **kwargs):
         """
         Runs the function with call counter.
         """
-        # Adding the name into the dictionnary.
-        if func.__name__ not in self._counter.keys():
-            self._counter[func.__name__] = 0
-        # Runcall measurement.
         outputs = func(*args, **kwargs)
-        self._counter[func.__name__] += 1
+        # Runcall measurement.
+        self._record(slot, 0, 0)
         # Return outputs of func.
         return outputs
 
+    def _record(self, slot: int, start: int, runtime: int) -> None:
+        """
+        Counts a call of the function of the given slot.
+        """
+        if self._threadsafe:
+            lock, counter = self._local_shard()
+            with lock:
+                counter[slot] += 1
+        else:
+            self._counter[slot] += 1
+
     def get_help(self) -> str:
         """
         Returns the documentation 'How to Use' of the decorator
@@ -170,8 +259,9 @@ The result will be :
             -----------
             total number of calls : {total_runcall}
         """
+        counter = self._merged_counter()
         string = "Counter(\n"
-        for func_name in self._counter.keys():
-            string += f"[{func_name}] number of calls : {self._counter[func_name]}\n"
+        for func_name in counter.keys():
+            string += f"[{func_name}] number of calls : {counter[func_name]}\n"
         string += f"-----------\ntotal number of calls : {self.total_runcall}\n)"
         return string
\ No newline at end of file
@@ -1,6 +1,834 @@
+import inspect
+import functools
+import contextlib
+import contextvars
+import random
+import sys
+import threading
+import time
+import types
+import weakref
+from typing import Iterator, List, Optional, Tuple, Union
+from .clock import Clock
+from .call_tree import CallTree
+from .snapshot import Snapshot
+
+# The frames of the current calls in call tree mode : one variable for every decorator, as the context variables are never freed.
+_FRAMES = contextvars.ContextVar("decoratepy_frames", default={}) # key: Decorator // value: list = frame of its current call (the mappings are copied, never modified)
+
+def _sum_lists(shards: List[list], size: int) -> list:
+    """
+    Sums the given lists element by element.
+    """
+    merged = [0] * size
+    for shard in shards:
+        for index, value in enumerate(shard[:size]):
+            merged[index] += value
+    return merged
+
+def _function_key(func) -> tuple:
+    """
+    Returns the identity of a decorated function : its module, its qualified name and its code object.
+    Two closures created by the same definition share the same identity.
+    """
+    original = inspect.unwrap(func)
+    return (getattr(func, "__module__", None), getattr(func, "__qualname__", None), getattr(original, "__code__", original))
+
+def _resolve_site(func) -> Optional[Tuple[object, str]]:
+    """
+    Returns the object and the attribute name under which the given function is defined,
+    following its module and its qualified name, or None if the function is not reachable (local functions, ...).
+    """
+    qualname = getattr(func, "__qualname__", None)
+    owner = sys.modules.get(getattr(func, "__module__", None))
+    if owner is None or qualname is None or "<locals>" in qualname:
+        return None
+    *path, name = qualname.split(".")
+    for part in path:
+        owner = getattr(owner, part, None)
+        if not isinstance(owner, (types.ModuleType, type)):
+            return None # unreachable, or an attribute of an object such as the accessors of a property
+    return owner, name
+
+def _is_legacy_wrapper(wrapper) -> bool:
+    """
+    Returns True if a bound `_wrapper` method has the signature of the first versions of the hook : ``_wrapper(self, func, *args, **kwargs)``.
+    """
+    try:
+        parameters = inspect.signature(wrapper).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    positional = [parameter for parameter in parameters if parameter.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)]
+    return len(positional) == 1
+
+def _check_sampling(sampling: Optional[Union[int, float]]) -> Optional[str]:
+    """
+    Checks a sampling value and returns its mode : None (every call measured), "period" (1-in-N) or "fraction" (random).
+    """
+    if sampling is None:
+        return None
+    if isinstance(sampling, bool) or not isinstance(sampling, (int, float)):
+        raise TypeError("Parameter sampling is not an integer or a float.")
+    if isinstance(sampling, int):
+        if sampling < 1:
+            raise ValueError("Parameter sampling must be greater than or equal to 1.")
+        return "period"
+    if not 0 < sampling <= 1:
+        raise ValueError("Parameter sampling must be between 0 (excluded) and 1.")
+    return "fraction"
+
 class Decorator(object):
-    def __init__(self):
+    _supports_sampling = True # False for the decorators changing the calls instead of measuring them (no sampling and call tree modes)
+    _measures_runtime = True # False for the decorators whose totals hold no runtime (the runtimes of `_snapshot_totals` are 0)
+
+    def __init__(self, threadsafe: bool = False, hotswap: bool = False, clock: Union[str, Clock] = "perf_counter", sampling: Optional[Union[int, float]] = None, calltree: bool = False):
+        """
+        Parameters
+        ----------
+            threadsafe: bool, optional
+                If True, each thread records its calls into its own shard and the shards are merged when the results are read.
+                The recording stays exact under concurrent calls without any shared lock on the hot path :
+                the lock of each shard is only contended while the results are read.
+                Default value is False.
+
+            hotswap: bool, optional
+                If True, deactivating the decorator rebinds the decorated functions to the original functions
+                in their module or class (also under a staticmethod or a classmethod), so a deactivated decorator costs nothing.
+                Activating the decorator binds the decorated functions again.
+                References to the decorated functions kept elsewhere still check the activation status.
+                Default value is False.
+
+            clock: str or Clock, optional
+                The clock measuring the runtimes (see `Clock`).
+                Default value is "perf_counter".
+
+            sampling: int or float, optional
+                If an integer N, only 1 call in N of each function is measured.
+                If a float p, each call is measured with the probability p.
+                The other calls are only counted, and the reported totals are estimated from the measured calls (see `set_sampling`).
+                Default value is None (every call is measured).
+
+            calltree: bool, optional
+                If True, the decorator follows the stack of the decorated calls of each thread and asynchronous task,
+                and aggregates the call tree with the inclusive and exclusive runtime of each function (see `call_tree`).
+                The runtime of the nested calls is then counted once in the total runtime.
+                Default value is False.
+
+        Raises
+        ------
+            TypeError: If threadsafe, hotswap or calltree is not a booleen, clock is not a string or a Clock, or sampling is not a number.
+            ValueError: If clock is not the name of an available clock, sampling is out of range,
+                or the sampling or call tree mode is requested and not supported by the decorator.
+        """
+        if not self._supports_sampling and (sampling is not None or calltree is True):
+            raise ValueError(f"The sampling and call tree modes are not supported by {type(self).__name__}.")
+        if not isinstance(threadsafe, bool):
+            raise TypeError("Parameter threadsafe is not a booleen.")
+        if not isinstance(hotswap, bool):
+            raise TypeError("Parameter hotswap is not a booleen.")
+        if not isinstance(calltree, bool):
+            raise TypeError("Parameter calltree is not a booleen.")
+        self._calltree = calltree
         self._activated = True # The decorator is activated by default.
+        self._threadsafe = threadsafe
+        self._shards_lock = threading.RLock()
+        self._slots = {} # key: tuple = function identity // value: int = slot
+        self._names = [] # index: int = slot // value: str = function name
+        self._labels = {} # key: str = function name // value: int = slot
+        self._sampling_mode = None # None, "period" (1-in-N) or "fraction" (random)
+        self._reset_shards()
+        self._hotswap = hotswap
+        self._decorated = [] # (decorated function, original function, explicit sites (owner, name, installed object, original object))
+        self._swapped = [] # (owner, name, installed object, original object)
+        self._wrappers = weakref.WeakSet() # functions returned by the decorator
+        self._clock_source = Clock.get(clock)
+        self._clock = self._clock_source.read # returns the current time in ns
+        self._overhead = 0 # measurement overhead in ns subtracted from the runtimes
+        self._sampling = None # sampling of the new slots
+        self._sampling_rates = [] # index: int = slot // value: int = period or float = fraction
+        self.set_sampling(sampling)
+
+    def get_clock(self) -> Clock:
+        """
+        Returns the clock measuring the runtimes.
+        """
+        return self._clock_source
+
+    def calibrate(self, n: int = 10000) -> int:
+        """
+        Measures the overhead of a measurement with the clock of the decorator.
+        The overhead is then subtracted from every measured runtime.
+
+        Parameters
+        ----------
+            n: int, optional
+                The number of samples. Default is 10000.
+
+        Returns
+        -------
+            overhead: int
+                The overhead in nanoseconds.
+        """
+        self._overhead = self._clock_source.measure_overhead(n)
+        return self._overhead
+
+    def is_hotswap(self) -> bool:
+        """
+        Returns True if the deactivation rebinds the decorated functions to the original functions.
+        """
+        return self._hotswap
+
+    def _register_site(self, wrapped, owner: object, name: str, installed: object = None, original: object = None) -> None:
+        """
+        Registers an attribute holding a decorated function, in addition to the module or class where the function is defined.
+        Used in hotswap mode to restore the original function on deactivation.
+
+        Parameters
+        ----------
+            wrapped: callable
+                The decorated function returned by the decorator.
+
+            owner: object
+                The module or class holding the decorated function.
+
+            name: str
+                The name of the attribute.
+
+            installed: object, optional
+                The value of the attribute when the decorator is activated, for example a staticmethod wrapping the decorated function.
+                Default is the decorated function.
+
+            original: object, optional
+                The value of the attribute to restore on deactivation. Default is the original function.
+        """
+        for decorated, func, sites in self._decorated:
+            if decorated is wrapped:
+                sites.append((owner, name, wrapped if installed is None else installed, func if original is None else original))
+
+    def _is_wrapper(self, func) -> bool:
+        """
+        Returns True if the given function was returned by the decorator.
+        """
+        try:
+            return func in self._wrappers
+        except TypeError:
+            return False
+
+    def _swap(self, activated: bool) -> None:
+        """
+        Binds the decorated functions (activated) or the original functions (deactivated) in their sites.
+        """
+        if activated:
+            for owner, name, installed, original in self._swapped:
+                if vars(owner).get(name) is original:
+                    setattr(owner, name, installed)
+            self._swapped = []
+            return
+        for wrapped, func, sites in self._decorated:
+            site = _resolve_site(wrapped)
+            if site is not None:
+                current = vars(site[0]).get(site[1])
+                if isinstance(current, (staticmethod, classmethod)) and current.__func__ is wrapped:
+                    # Decorated under @staticmethod or @classmethod : the original is restored in the same descriptor type.
+                    sites = sites + [site + (current, type(current)(func))]
+                else:
+                    sites = sites + [site + (wrapped, func)]
+            for owner, name, installed, original in sites:
+                if vars(owner).get(name) is installed:
+                    setattr(owner, name, original)
+                    self._swapped.append((owner, name, installed, original))
+
+    def is_threadsafe(self) -> bool:
+        """
+        Returns True if the calls are recorded into per-thread shards.
+        """
+        return self._threadsafe
+
+    def _register(self, func) -> int:
+        """
+        Returns the slot of the given function, allocating it on the first decoration.
+
+        The slot is resolved once when the function is decorated, so the recording of a call updates the preallocated slot directly.
+        The name of the slot is the ``__name__`` of the function. If another function already uses this name,
+        the qualified name is used, then the module and the qualified name.
+        """
+        key = _function_key(func)
+        with self._shards_lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                name = getattr(func, "__name__", repr(func))
+                if name in self._labels:
+                    name = getattr(func, "__qualname__", name)
+                if name in self._labels:
+                    name = f"{getattr(func, '__module__', None)}.{name}"
+                base, index = name, 1
+                while name in self._labels:
+                    index += 1
+                    name = f"{base}#{index}"
+                slot = self._allocate_slot(key, name)
+        return slot
+
+    def _named_slot(self, func_name: str) -> int:
+        """
+        Returns the slot of the function with the given name, allocating it if no decorated function has this name.
+        Used to merge the measurements of functions decorated in another process.
+        """
+        with self._shards_lock:
+            slot = self._labels.get(func_name)
+            if slot is None:
+                slot = self._allocate_slot(("name", func_name), func_name)
+        return slot
+
+    def _allocate_slot(self, key: tuple, name: str) -> int:
+        """
+        Allocates a new slot with the given identity and name (called with the shards lock held).
+        """
+        slot = len(self._names)
+        self._slots[key] = slot
+        self._names.append(name)
+        self._labels[name] = slot
+        self._sampling_rates.append(self._sampling if self._sampling is not None else 1)
+        for calls, skipped, countdown in [self._sampling_state] + self._sampling_shards:
+            calls.append(0)
+            skipped.append(0)
+            countdown.append(1)
+        self._add_slot()
+        return slot
+
+    def _slot(self, func_name: str) -> Optional[int]:
+        """
+        Returns the slot of the function with the given name, or None if no decorated function has this name.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        if not isinstance(func_name, str):
+            raise TypeError("Parameter func_name is not a string.")
+        return self._labels.get(func_name)
+
+    def _slot_value(self, values: list, func_name: str) -> int:
+        """
+        Returns the value of the given function in a per-slot list (0 if the function is unknown).
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        slot = self._slot(func_name)
+        return 0 if slot is None else values[slot]
+
+    def _add_slot(self) -> None:
+        """
+        Extends the recording storage and the shards with a new slot (called with the shards lock held).
+        Must be implemented by the subclasses with a per-slot storage.
+        """
+        pass
+
+    def snapshot(self, measurements: bool = True, reset: bool = False) -> Snapshot:
+        """
+        Returns a picklable copy of the measurements of the decorator.
+
+        The snapshot can be sent to another process and added to a decorator of the same type with `merge`,
+        for example to gather the measurements of the workers of a process pool into the parent process.
+        It also holds the number of calls and the runtime of each function, and `Snapshot.delta` returns their changes
+        since a previous snapshot, so a scraper can compute rates at a cost proportional to the number of functions.
+
+        In threadsafe mode, the shards of the threads are locked during the snapshot : the snapshot never contains
+        a partially recorded call, and with ``reset`` every call is either in the snapshot or in the next one.
+
+        Parameters
+        ----------
+            measurements: bool, optional
+                If False, the snapshot only holds the totals of each function, without copying the measurements
+                (the histograms of `TimerCounter`, the records of `TimerCounterLogger`), and cannot be merged.
+                Default is True.
+
+            reset: bool, optional
+                If True, the measurements are reset in the same operation, as with `initialize` but keeping the decorated functions.
+                The call tree is not reset.
+                Default is False.
+
+        Returns
+        -------
+            snapshot: Snapshot
+                The copy of the measurements.
+
+        Raises
+        ------
+            TypeError: If measurements or reset is not a booleen.
+        """
+        if not isinstance(measurements, bool):
+            raise TypeError("Parameter measurements is not a booleen.")
+        if not isinstance(reset, bool):
+            raise TypeError("Parameter reset is not a booleen.")
+        with self._locked_shards():
+            data = self._snapshot_data() if measurements else None
+            calls, runtimes = self._snapshot_totals()
+            sampled_calls, skipped = self._sampling_counters()
+            if reset:
+                self._reset_data()
+                self._reset_sampling_counters(sampled_calls, skipped)
+            names = list(self._names)
+        totals = {}
+        for slot, (count, runtime) in enumerate(zip(calls, runtimes)):
+            if count or skipped[slot]:
+                totals[names[slot]] = (count + skipped[slot], self._estimated(slot, count, runtime, skipped) / 1e9)
+        return Snapshot(type(self).__name__, data, {names[slot]: count for slot, count in enumerate(skipped) if count}, totals)
+
+    def merge(self, snapshot: Snapshot) -> None:
+        """
+        Adds the measurements of a snapshot to the decorator.
+
+        The functions are matched by name. The functions unknown to the decorator are added to its results.
+
+        Parameters
+        ----------
+            snapshot: Snapshot
+                A snapshot taken from a decorator of the same type (see `snapshot`).
+
+        Raises
+        ------
+            TypeError: If snapshot is not a Snapshot.
+            ValueError: If the snapshot was taken from a decorator of another type or without the measurements.
+        """
+        if not isinstance(snapshot, Snapshot):
+            raise TypeError("Parameter snapshot is not a Snapshot.")
+        if snapshot.kind != type(self).__name__:
+            raise ValueError(f"The snapshot was taken from a {snapshot.kind}, not a {type(self).__name__}.")
+        if snapshot.data is None:
+            raise ValueError("The snapshot does not contain the measurements.")
+        self._merge_data(snapshot.data)
+        for func_name, count in snapshot.skipped.items():
+            self._sampled = True
+            slot = self._named_slot(func_name)
+            calls, skipped, _ = self._local_sampling_state() if self._threadsafe else self._sampling_state
+            calls[slot] += count
+            skipped[slot] += count
+
+    def _snapshot_data(self) -> object:
+        """
+        Returns a picklable copy of the measurements.
+        Must be implemented by the subclasses.
+        """
+        raise NotImplementedError("The decorator does not define snapshots.")
+
+    def _merge_data(self, data: object) -> None:
+        """
+        Adds the measurements of a snapshot, in the format returned by `_snapshot_data`.
+        Must be implemented by the subclasses.
+        """
+        raise NotImplementedError("The decorator does not define snapshots.")
+
+    def _snapshot_totals(self) -> Tuple[list, list]:
+        """
+        Returns the number of measured calls and their runtime in ns of each slot.
+        Must be implemented by the subclasses.
+        """
+        raise NotImplementedError("The decorator does not define snapshots.")
+
+    def _reset_data(self) -> None:
+        """
+        Resets the measurements of each slot, in place in the shards (called with the shards locked).
+        Must be implemented by the subclasses.
+        """
+        raise NotImplementedError("The decorator does not define snapshots.")
+
+    def _reset_sampling_counters(self, calls: list, skipped: list) -> None:
+        """
+        Removes the given numbers of calls from the sampling counters.
+        The per-thread counters are written without lock, so their values are kept and the removed calls are subtracted when they are read.
+        """
+        if not self._threadsafe:
+            for slot in range(len(calls)):
+                self._sampling_state[0][slot] -= calls[slot]
+                self._sampling_state[1][slot] -= skipped[slot]
+        else:
+            offsets = self._sampling_offsets
+            for offset, removed in zip(offsets, (calls, skipped)):
+                offset.extend([0] * (len(removed) - len(offset)))
+                for slot, count in enumerate(removed):
+                    offset[slot] += count
+        if self._adaptation is not None:
+            previous_time, previous_calls = self._adaptation
+            self._adaptation = (previous_time, [count - (calls[slot] if slot < len(calls) else 0) for slot, count in enumerate(previous_calls)])
+
+    @contextlib.contextmanager
+    def _locked_shards(self) -> Iterator[list]:
+        """
+        Locks the recording shards of all the threads and yields them, so they can be read and reset consistently.
+        The threads recording a call wait for the release. Outside of the threadsafe mode, nothing is locked.
+        """
+        if not self._threadsafe:
+            yield []
+            return
+        with self._shards_lock:
+            shards = list(self._shards)
+            for shard in shards:
+                shard[0].acquire()
+            try:
+                yield shards
+            finally:
+                for shard in shards:
+                    shard[0].release()
+
+    def _new_shard(self):
+        """
+        Returns an empty recording shard for a new thread, with an entry for each slot (called with the shards lock held).
+        The first item of the shard is its lock, held by the thread while it records a call.
+        Must be implemented by the decorators supporting the threadsafe mode.
+        """
+        raise NotImplementedError("The decorator does not define recording shards.")
+
+    def _reset_shards(self) -> None:
+        """
+        Forgets all the recording shards and the sampling counters.
+        """
+        self._local = threading.local()
+        self._shards = []
+        self._sampling_state = self._new_sampling_state()
+        self._sampling_shards = []
+        self._sampling_offsets = ([], []) # calls and calls not measured removed from the per-thread sampling counters by a reset
+        self._sampled = self._sampling_mode is not None # the sampling counters may be non-zero (sampling mode enabled since the reset)
+        self._trees = [] # call tree of each thread
+        self._adaptation = None # (time, number of calls of each slot) at the previous adaptation
+
+    def _local_shard(self):
+        """
+        Returns the recording shard of the current thread, creating it on the first call of the thread.
+        """
+        try:
+            return self._local.shard
+        except AttributeError:
+            with self._shards_lock:
+                shard = self._new_shard()
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def _new_sampling_state(self) -> tuple:
+        """
+        Returns the sampling counters of each slot : number of calls, number of calls not measured and countdown to the next measured call.
+        """
+        size = len(self._names)
+        return ([0] * size, [0] * size, [1] * size)
+
+    def _local_sampling_state(self) -> tuple:
+        """
+        Returns the sampling counters of the current thread, creating them on the first sampled call of the thread.
+        """
+        try:
+            return self._local.sampling
+        except AttributeError:
+            with self._shards_lock:
+                state = self._new_sampling_state()
+                self._sampling_shards.append(state)
+            self._local.sampling = state
+            return state
+
+    def _skip(self, slot: int) -> bool:
+        """
+        Counts a call in sampling mode and returns True if the call must not be measured.
+        """
+        calls, skipped, countdown = self._local_sampling_state() if self._threadsafe else self._sampling_state
+        calls[slot] += 1
+        if self._sampling_mode == "period":
+            countdown[slot] -= 1
+            if countdown[slot] > 0:
+                skipped[slot] += 1
+                return True
+            countdown[slot] = self._sampling_rates[slot]
+            return False
+        if random.random() < self._sampling_rates[slot]:
+            return False
+        skipped[slot] += 1
+        return True
+
+    def _sampling_counters(self) -> Tuple[list, list]:
+        """
+        Returns the number of calls seen by the sampling and the number of calls not measured of each slot,
+        merging the per-thread counters in threadsafe mode.
+        """
+        if not self._sampled:
+            size = len(self._names)
+            return [0] * size, [0] * size
+        if self._threadsafe:
+            with self._shards_lock:
+                states = list(self._sampling_shards)
+            size = len(self._names)
+            counters = (_sum_lists([state[0] for state in states], size), _sum_lists([state[1] for state in states], size))
+            for counter, offset in zip(counters, self._sampling_offsets):
+                for slot, count in enumerate(offset[:size]):
+                    counter[slot] -= count
+            return counters
+        return list(self._sampling_state[0]), list(self._sampling_state[1])
+
+    def _skipped_calls(self, slot: Optional[int]) -> int:
+        """
+        Returns the number of calls of a slot not measured by the sampling, reading only the counters of this slot
+        (0 for the None slot of an unknown function).
+        """
+        if not self._sampled or slot is None:
+            return 0
+        if self._threadsafe:
+            with self._shards_lock:
+                states = list(self._sampling_shards)
+            offset = self._sampling_offsets[1]
+            return sum(state[1][slot] for state in states if slot < len(state[1])) - (offset[slot] if slot < len(offset) else 0)
+        return self._sampling_state[1][slot]
+
+    def _estimated(self, slot: int, measured_calls: int, measured_value: float, skipped: Optional[list] = None) -> float:
+        """
+        Extrapolates a total over the measured calls of a slot to all its calls, including the calls not measured by the sampling.
+        The calls not measured of each slot can be given when several slots are estimated, otherwise only the slot is read.
+        """
+        if skipped is None:
+            count = self._skipped_calls(slot)
+        else:
+            count = skipped[slot] if slot < len(skipped) else 0
+        if measured_calls == 0 or count == 0:
+            return measured_value
+        return measured_value * (measured_calls + count) / measured_calls
+
+    def get_sampling(self, func_name: Optional[str] = None) -> Optional[Union[int, float]]:
+        """
+        Returns the sampling of the decorator, or of the given function if its sampling was adapted.
+
+        Parameters
+        ----------
+            func_name: str, optional
+                The name of a decorated function.
+
+        Returns
+        -------
+            sampling: int, float or None
+                The period N (1 call in N measured), the fraction of measured calls, or None if every call is measured.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        if func_name is None or self._sampling_mode is None:
+            return self._sampling
+        slot = self._slot(func_name)
+        if slot is None:
+            return self._sampling
+        return self._sampling_rates[slot]
+
+    def set_sampling(self, sampling: Optional[Union[int, float]] = None) -> None:
+        """
+        Sets the sampling of all the decorated functions.
+
+        With an integer N, only 1 call in N of each function is measured. With a float p, each call is measured with the probability p.
+        The calls not measured only go through a fast path incrementing a counter.
+        The numbers of calls stay exact, and the runtimes of the measured calls are extrapolated to all the calls,
+        which is an unbiased estimation as long as the measured calls are representative of the others.
+        `TimerCounter.runtime_error` gives the error bound of the estimated runtimes.
+
+        Parameters
+        ----------
+            sampling: int or float, optional
+                The period N, the fraction p, or None to measure every call.
+                Default value is None.
+
+        Raises
+        ------
+            TypeError: If sampling is not a number.
+            ValueError: If sampling is lower than 1 (integer) or not between 0 and 1 (float), or the decorator does not support the sampling mode.
+        """
+        if sampling is not None and not self._supports_sampling:
+            raise ValueError(f"The sampling and call tree modes are not supported by {type(self).__name__}.")
+        mode = _check_sampling(sampling)
+        self._sampling = sampling
+        self._sampling_rates = [sampling if sampling is not None else 1] * len(self._names)
+        self._sampling_mode = mode
+        self._sampled = self._sampled or mode is not None
+        self._restart_countdowns()
+
+    def adapt_sampling(self, target: float) -> None:
+        """
+        Adapts the sampling of each function to its call frequency, so that about ``target`` calls per second of each function are measured.
+
+        The frequencies are measured between two calls of `adapt_sampling`, which should be called periodically (for example every second).
+        The first call only starts the measurement, enabling the sampling mode with every call measured if it was disabled.
+        A 1-in-N sampling stays a 1-in-N sampling and a random sampling stays a random sampling.
+
+        Parameters
+        ----------
+            target: float
+                The number of measured calls per second of each function.
+
+        Raises
+        ------
+            TypeError: If target is not a number.
+            ValueError: If target is not strictly positive.
+        """
+        if isinstance(target, bool) or not isinstance(target, (int, float)):
+            raise TypeError("Parameter target is not a number.")
+        if target <= 0:
+            raise ValueError("Parameter target must be strictly positive.")
+        if self._sampling_mode is None:
+            self.set_sampling(1)
+        now = time.monotonic()
+        calls = self._sampling_counters()[0]
+        if self._adaptation is not None and now > self._adaptation[0]:
+            previous_time, previous_calls = self._adaptation
+            rates = list(self._sampling_rates)
+            for slot, count in enumerate(calls):
+                frequency = (count - (previous_calls[slot] if slot < len(previous_calls) else 0)) / (now - previous_time)
+                if self._sampling_mode == "period":
+                    rates[slot] = max(int(frequency / target), 1)
+                else:
+                    rates[slot] = min(target / frequency, 1.0) if frequency > 0 else 1.0
+            self._sampling_rates = rates
+            self._restart_countdowns()
+        self._adaptation = (now, calls)
+
+    def _restart_countdowns(self) -> None:
+        """
+        Bounds the countdowns of the 1-in-N sampling by the new periods.
+        """
+        with self._shards_lock:
+            states = [self._sampling_state] + self._sampling_shards
+        for state in states:
+            countdown = state[2]
+            for slot, period in enumerate(self._sampling_rates[:len(countdown)]):
+                if countdown[slot] > period:
+                    countdown[slot] = period
+
+    def _local_tree(self) -> CallTree:
+        """
+        Returns the call tree of the current thread, creating it on the first call of the thread.
+        """
+        try:
+            return self._local.tree
+        except AttributeError:
+            tree = CallTree()
+            with self._shards_lock:
+                self._trees.append(tree)
+            self._local.tree = tree
+            return tree
+
+    def _merged_tree(self) -> CallTree:
+        """
+        Returns the call tree of all the threads.
+
+        Raises
+        ------
+            ValueError: If the call tree mode is not enabled.
+        """
+        if not self._calltree:
+            raise ValueError("The call tree mode is not enabled.")
+        with self._shards_lock:
+            trees = list(self._trees)
+        return CallTree.merge(trees)
+
+    def is_calltree(self) -> bool:
+        """
+        Returns True if the decorator aggregates the call tree of the decorated functions.
+        """
+        return self._calltree
+
+    def call_tree(self) -> dict:
+        """
+        Returns the aggregated call tree of the decorated functions.
+
+        Returns
+        -------
+            tree: dict
+                The root calls, as a dictionary whose keys are the function names and whose values are dictionaries with the keys
+                ``"number_calls"``, ``"inclusive_runtime"`` and ``"exclusive_runtime"`` (in seconds) and ``"children"`` (the called functions, with the same structure).
+
+        Raises
+        ------
+            ValueError: If the call tree mode is not enabled.
+        """
+        tree = self._merged_tree()
+        root = {}
+        branches = {0: root}
+        for node in tree.called_nodes():
+            branch = {
+                "number_calls": tree.count(node),
+                "inclusive_runtime": tree.inclusive(node) / 1e9,
+                "exclusive_runtime": tree.exclusive(node) / 1e9,
+                "children": {},
+            }
+            branches[tree.parent(node)][self._names[tree.slot(node)]] = branch
+            branches[node] = branch["children"]
+        return root
+
+    def inclusive_runtime(self, func_name: str) -> float:
+        """
+        Returns the runtime of the calls of the given function in seconds, including the decorated functions they call.
+        The recursive calls are counted once.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+            ValueError: If the call tree mode is not enabled.
+        """
+        slot = self._slot(func_name)
+        totals = self._merged_tree().function_totals()
+        return totals[slot][1] / 1e9 if slot in totals else 0.0
+
+    def exclusive_runtime(self, func_name: str) -> float:
+        """
+        Returns the runtime of the calls of the given function in seconds, excluding the decorated functions they call.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+            ValueError: If the call tree mode is not enabled.
+        """
+        slot = self._slot(func_name)
+        totals = self._merged_tree().function_totals()
+        return totals[slot][2] / 1e9 if slot in totals else 0.0
+
+    @property
+    def tree_repr(self) -> str:
+        """
+        Returns the string representation of the call tree in the following format:
+
+        .. code-block:: console
+
+            CallTree(
+            [{func_name}] number of calls : {Ncalls} - inclusive runtime : {hours}h {minutes}m {seconds}s - exclusive runtime : {hours}h {minutes}m {seconds}s
+                [{func_name}] number of calls : {Ncalls} - inclusive runtime : {hours}h {minutes}m {seconds}s - exclusive runtime : {hours}h {minutes}m {seconds}s
+            -----------
+            total runtime : {total_runtime_hours}h {total_runtime_minutes}m {total_runtime_seconds}s
+            )
+
+        Raises
+        ------
+            ValueError: If the call tree mode is not enabled.
+        """
+        tree = self._merged_tree()
+        children = {0: []}
+        for node in tree.called_nodes():
+            children[node] = []
+            children[tree.parent(node)].append(node)
+        lines = ["CallTree(\n"]
+        stack = [(node, 0) for node in reversed(children[0])]
+        while stack:
+            node, depth = stack.pop()
+            # Conversion in hours, minutes, seconds.
+            hours, remainder = divmod(tree.inclusive(node) / 1e9, 3600)
+            minutes, seconds = divmod(remainder, 60)
+            exclusive_hours, remainder = divmod(tree.exclusive(node) / 1e9, 3600)
+            exclusive_minutes, exclusive_seconds = divmod(remainder, 60)
+            lines.append(f"{'    ' * depth}[{self._names[tree.slot(node)]}] number of calls : {tree.count(node)} - inclusive runtime : {int(hours)}h {int(minutes)}m {seconds:.4f}s - exclusive runtime : {int(exclusive_hours)}h {int(exclusive_minutes)}m {exclusive_seconds:.4f}s\n")
+            stack.extend((child, depth + 1) for child in reversed(children[node]))
+        hours, remainder = divmod(tree.total_runtime() / 1e9, 3600)
+        minutes, seconds = divmod(remainder, 60)
+        lines.append(f"-----------\ntotal runtime : {int(hours)}h {int(minutes)}m {seconds:.4f}s\n)")
+        return "".join(lines)
+
+    def _all_shards(self) -> List:
+        """
+        Returns the recording shards of all the threads.
+        """
+        with self._shards_lock:
+            return list(self._shards)
     
     def is_activated(self) -> bool:
         """ 
@@ -55,6 +883,8 @@ class Decorator(object):
         """
         if not isinstance(activated, bool):
             raise TypeError("Parameter activated is not a booleen.")
+        if self._hotswap and activated != self._activated:
+            self._swap(activated)
         self._activated = activated
 
     def set_deactivated(self, deactivated: bool = True) -> None:
@@ -78,12 +908,228 @@ class Decorator(object):
         """
         if not isinstance(deactivated, bool):
             raise TypeError("Parameter deactivated is not a booleen.")
-        self._activated = not deactivated
+        self.set_activated(not deactivated)
+
+    def _record(self, slot: int, start: int, runtime: int) -> None:
+        """
+        Records a call of a decorated function.
+        Must be implemented by the subclasses.
+
+        Parameters
+        ----------
+            slot: int
+                The slot of the decorated function.
+
+            start: int
+                The clock value at the start of the call in nanoseconds.
+
+            runtime: int
+                The runtime of the call in nanoseconds.
+        """
+        raise NotImplementedError("The decorator does not define how to record a call.")
+
+    def _wrapper(self, slot: int, func, *args, **kwargs):
+        """
+        Runs the function with runtime measurement.
+        The subclasses record the measurement in `_record`. An override with the former signature
+        ``_wrapper(self, func, *args, **kwargs)`` is still called for every call (see `__call__`).
+        """
+        tic = self._clock()
+        outputs = func(*args, **kwargs)
+        toc = self._clock()
+        runtime = toc - tic - self._overhead
+        self._record(slot, tic, runtime if runtime > 0 else 0)
+        return outputs
+
+    def _enter(self, slot: int) -> list:
+        """
+        Pushes a call of the function of the given slot on the call stack of the current thread or task.
+        Returns the frame of the call : [tree, node, runtime of the decorated children in ns, token to restore the parent frames].
+        """
+        tree = self._local_tree()
+        frames = _FRAMES.get()
+        parent = frames.get(self)
+        node = tree.child(parent[1] if parent is not None and parent[0] is tree else 0, slot)
+        frame = [tree, node, 0, None]
+        frame[3] = _FRAMES.set({**frames, self: frame})
+        return frame
+
+    def _exit(self, frame: list, runtime: int) -> None:
+        """
+        Pops a call from the call stack and adds its runtime to the call tree and to its parent.
+        """
+        tree, node, children, _ = frame
+        tree.add(node, runtime, runtime - children if runtime > children else 0)
+        parent = _FRAMES.get().get(self)
+        if parent is not None and parent[0] is tree:
+            parent[2] += runtime
+
+    def _tree_wrapper(self, slot: int, func, *args, **kwargs):
+        """
+        Runs the function with runtime measurement in call tree mode.
+        """
+        frame = self._enter(slot)
+        tic = self._clock()
+        try:
+            outputs = func(*args, **kwargs)
+            toc = self._clock()
+        finally:
+            _FRAMES.reset(frame[3])
+        runtime = toc - tic - self._overhead
+        runtime = runtime if runtime > 0 else 0
+        self._exit(frame, runtime)
+        self._record(slot, tic, runtime)
+        return outputs
+
+    async def _tree_async_wrapper(self, slot: int, func, *args, **kwargs):
+        """
+        Awaits the coroutine function with runtime measurement in call tree mode.
+        """
+        frame = self._enter(slot)
+        tic = self._clock()
+        try:
+            outputs = await func(*args, **kwargs)
+            toc = self._clock()
+        finally:
+            _FRAMES.reset(frame[3])
+        runtime = toc - tic - self._overhead
+        runtime = runtime if runtime > 0 else 0
+        self._exit(frame, runtime)
+        self._record(slot, tic, runtime)
+        return outputs
+
+    async def _async_wrapper(self, slot: int, func, *args, **kwargs):
+        """
+        Awaits the coroutine function with runtime measurement.
+        The runtime covers the whole execution of the coroutine, including the awaited operations.
+        """
+        tic = self._clock()
+        outputs = await func(*args, **kwargs)
+        toc = self._clock()
+        runtime = toc - tic - self._overhead
+        self._record(slot, tic, runtime if runtime > 0 else 0)
+        return outputs
+
+    def _generator_wrapper(self, slot: int, func, *args, **kwargs):
+        """
+        Iterates over the generator function with runtime measurement.
+        The runtime is the time spent inside the generator, excluding the time spent by the consumer between two items.
+        The call is recorded when the generator is exhausted or closed.
+        """
+        generator = func(*args, **kwargs)
+        start = self._clock()
+        runtime = 0
+        method, argument = generator.send, None
+        while True:
+            tic = self._clock()
+            try:
+                item = method(argument)
+            except StopIteration as stop:
+                runtime += max(self._clock() - tic - self._overhead, 0)
+                self._record(slot, start, runtime)
+                return stop.value
+            runtime += max(self._clock() - tic - self._overhead, 0)
+            try:
+                argument = yield item
+                method = generator.send
+            except GeneratorExit:
+                generator.close()
+                self._record(slot, start, runtime)
+                raise
+            except BaseException as error:
+                method, argument = generator.throw, error
+
+    async def _async_generator_wrapper(self, slot: int, func, *args, **kwargs):
+        """
+        Iterates over the asynchronous generator function with runtime measurement.
+        The runtime is the time spent to produce the items, including the awaited operations and excluding the time spent by the consumer.
+        The call is recorded when the generator is exhausted or closed.
+        """
+        generator = func(*args, **kwargs)
+        start = self._clock()
+        runtime = 0
+        method, argument = generator.asend, None
+        while True:
+            tic = self._clock()
+            try:
+                item = await method(argument)
+            except StopAsyncIteration:
+                runtime += max(self._clock() - tic - self._overhead, 0)
+                self._record(slot, start, runtime)
+                return
+            runtime += max(self._clock() - tic - self._overhead, 0)
+            try:
+                argument = yield item
+                method = generator.asend
+            except GeneratorExit:
+                await generator.aclose()
+                self._record(slot, start, runtime)
+                raise
+            except BaseException as error:
+                method, argument = generator.athrow, error
 
     def __call__(self, func):
-        def wrapped(*args, **kwargs):
-            if self._activated:
-                return self._wrapper(func, *args, **kwargs)
-            else:
+        """
+        Decorates the given function.
+
+        Coroutine functions, generator functions and asynchronous generator functions are detected,
+        and the returned function is of the same kind so that the measurement covers the real execution of the call.
+        In sampling mode, the calls not measured run the function directly after being counted.
+        In call tree mode, the functions and the coroutine functions are pushed on the call stack,
+        the generators are measured without being pushed, so the functions they call are attached to their consumer.
+
+        The subclasses written for the first versions, which override ``_wrapper(self, func, *args, **kwargs)`` instead of
+        `_record`, keep working : every call of every kind of function is passed to their ``_wrapper`` as before,
+        without the call tree. New subclasses should only implement `_record` (see `_wrapper`).
+
+        Parameters
+        ----------
+            func: callable
+                The function to decorate.
+
+        Returns
+        -------
+            wrapped: callable
+                The decorated function.
+        """
+        slot = self._register(func)
+        original = inspect.unwrap(func)
+        if _is_legacy_wrapper(self._wrapper):
+            legacy_wrapper = self._wrapper
+            def wrapped(*args, **kwargs):
+                if self._activated and (self._sampling_mode is None or not self._skip(slot)):
+                    return legacy_wrapper(func, *args, **kwargs)
+                return func(*args, **kwargs)
+        elif inspect.iscoroutinefunction(original):
+            async_wrapper = self._tree_async_wrapper if self._calltree else self._async_wrapper
+            async def wrapped(*args, **kwargs):
+                if self._activated and (self._sampling_mode is None or not self._skip(slot)):
+                    return await async_wrapper(slot, func, *args, **kwargs)
+                return await func(*args, **kwargs)
+        elif inspect.isasyncgenfunction(original):
+            def wrapped(*args, **kwargs):
+                if self._activated and (self._sampling_mode is None or not self._skip(slot)):
+                    return self._async_generator_wrapper(slot, func, *args, **kwargs)
+                return func(*args, **kwargs)
+        elif inspect.isgeneratorfunction(original):
+            def wrapped(*args, **kwargs):
+                if self._activated and (self._sampling_mode is None or not self._skip(slot)):
+                    return self._generator_wrapper(slot, func, *args, **kwargs)
                 return func(*args, **kwargs)
-        return wrapped
\ No newline at end of file
+        else:
+            wrapper = self._tree_wrapper if self._calltree else self._wrapper
+            def wrapped(*args, **kwargs):
+                if self._activated and (self._sampling_mode is None or not self._skip(slot)):
+                    return wrapper(slot, func, *args, **kwargs)
+                return func(*args, **kwargs)
+        return self._install(wrapped, func)
+
+    def _install(self, wrapped, func):
+        """
+        Copies the attributes of the function onto its decorated version and registers it as a wrapper of the decorator (and for the hotswap).
+        """
+        functools.update_wrapper(wrapped, func)
+        self._wrappers.add(wrapped)
+        if self._hotswap:
+            self._decorated.append((wrapped, func, []))
+        return wrapped
@@ -0,0 +1,262 @@
+import math
+from typing import List, Optional
+
+class Histogram(object):
+    """
+    Constant-memory histogram of non-negative integer values (runtimes in nanoseconds).
+
+    The buckets are log-linear (HDR-style): the values lower than ``2 ** significant_bits`` have their own bucket,
+    and each power of two above is split into ``2 ** (significant_bits - 1)`` buckets of equal width.
+    The relative error of a percentile is therefore lower than ``2 ** (1 - significant_bits)``,
+    and the number of buckets is bounded whatever the number of recorded values.
+
+    The count, sum, minimum and maximum are exact. Histograms with the same precision can be merged.
+
+    Parameters
+    ----------
+        significant_bits: int, optional
+            The precision of the buckets, between 2 and 16. Default is 7 (relative error lower than 1.6%).
+
+    Raises
+    ------
+        TypeError: If significant_bits is not an integer.
+        ValueError: If significant_bits is not between 2 and 16.
+    """
+
+    def __init__(self, significant_bits: int = 7):
+        if not isinstance(significant_bits, int) or isinstance(significant_bits, bool):
+            raise TypeError("Parameter significant_bits is not an integer.")
+        if not 2 <= significant_bits <= 16:
+            raise ValueError("Parameter significant_bits must be between 2 and 16.")
+        self._bits = significant_bits
+        self._linear = 1 << significant_bits # values recorded exactly
+        self._half_bits = significant_bits - 1
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Removes all the recorded values.
+        """
+        self._buckets = {} # key: int = bucket index // value: int = number of values
+        self._count = 0
+        self._total = 0
+        self._total_squares = 0
+        self._min = None
+        self._max = None
+
+    def _index(self, value: int) -> int:
+        """
+        Returns the bucket index of the given value.
+        """
+        if value < self._linear:
+            return value
+        shift = value.bit_length() - self._bits
+        return (shift << self._half_bits) + (value >> shift)
+
+    def _bounds(self, index: int):
+        """
+        Returns the lowest and highest values of the given bucket.
+        """
+        if index < self._linear:
+            return index, index
+        shift = (index >> self._half_bits) - 1
+        mantissa = index - (shift << self._half_bits)
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, value: int) -> None:
+        """
+        Adds a value to the histogram.
+
+        Parameters
+        ----------
+            value: int
+                The non-negative value to add.
+        """
+        if value < self._linear:
+            index = value
+        else:
+            shift = value.bit_length() - self._bits
+            index = (shift << self._half_bits) + (value >> shift)
+        buckets = self._buckets
+        buckets[index] = buckets.get(index, 0) + 1
+        self._count += 1
+        self._total += value
+        self._total_squares += value * value
+        if self._min is None or value < self._min:
+            self._min = value
+        if self._max is None or value > self._max:
+            self._max = value
+
+    @property
+    def significant_bits(self) -> int:
+        """
+        Returns the precision of the buckets.
+        """
+        return self._bits
+
+    @property
+    def count(self) -> int:
+        """
+        Returns the number of recorded values.
+        """
+        return self._count
+
+    @property
+    def total(self) -> int:
+        """
+        Returns the sum of the recorded values.
+        """
+        return self._total
+
+    @property
+    def min(self) -> Optional[int]:
+        """
+        Returns the minimal recorded value (None if the histogram is empty).
+        """
+        return self._min
+
+    @property
+    def max(self) -> Optional[int]:
+        """
+        Returns the maximal recorded value (None if the histogram is empty).
+        """
+        return self._max
+
+    @property
+    def mean(self) -> float:
+        """
+        Returns the mean of the recorded values (0 if the histogram is empty).
+        """
+        if self._count == 0:
+            return 0.0
+        return self._total / self._count
+
+    @property
+    def stddev(self) -> float:
+        """
+        Returns the standard deviation of the recorded values (0 if the histogram is empty).
+        """
+        if self._count == 0:
+            return 0.0
+        # Exact integer computation of count ** 2 * variance.
+        scaled_variance = self._count * self._total_squares - self._total * self._total
+        return math.sqrt(max(scaled_variance, 0)) / self._count
+
+    def percentile(self, q: float) -> int:
+        """
+        Returns an estimation of the given percentile of the recorded values.
+
+        Parameters
+        ----------
+            q: float
+                The percentile between 0 and 100.
+
+        Returns
+        -------
+            value: int
+                The middle of the bucket containing the percentile, bounded by the minimal and maximal values (0 if the histogram is empty).
+
+        Raises
+        ------
+            TypeError: If q is not a number.
+            ValueError: If q is not between 0 and 100.
+        """
+        if not isinstance(q, (int, float)) or isinstance(q, bool):
+            raise TypeError("Parameter q is not a number.")
+        if not 0 <= q <= 100:
+            raise ValueError("Parameter q must be between 0 and 100.")
+        if self._count == 0:
+            return 0
+        rank = max(math.ceil(q / 100 * self._count), 1)
+        # The extreme percentiles are exact.
+        if q == 0:
+            return self._min
+        if rank >= self._count:
+            return self._max
+        cumulated = 0
+        for index in sorted(self._buckets.keys()):
+            cumulated += self._buckets[index]
+            if cumulated >= rank:
+                low, high = self._bounds(index)
+                return min(max((low + high) // 2, self._min), self._max)
+        return self._max
+
+    def cumulative_counts(self, limits: List[int]) -> List[int]:
+        """
+        Returns an estimation of the number of recorded values lower than or equal to each of the given limits.
+
+        A bucket is counted below a limit if its middle is lower than or equal to the limit (as for the percentiles),
+        and the counts are exact below the minimal value and above the maximal value.
+
+        Parameters
+        ----------
+            limits: list of int
+                The limits in increasing order.
+
+        Returns
+        -------
+            counts: list of int
+                The number of values lower than or equal to each limit.
+        """
+        counts = []
+        indices = sorted(self._buckets.keys())
+        position, cumulated = 0, 0
+        for limit in limits:
+            if self._count == 0 or limit < self._min:
+                counts.append(0)
+                continue
+            if limit >= self._max:
+                counts.append(self._count)
+                continue
+            while position < len(indices):
+                low, high = self._bounds(indices[position])
+                if (low + high) // 2 > limit:
+                    break
+                cumulated += self._buckets[indices[position]]
+                position += 1
+            counts.append(cumulated)
+        return counts
+
+    def merge(self, other: "Histogram") -> None:
+        """
+        Adds the values of another histogram to this histogram.
+
+        Parameters
+        ----------
+            other: Histogram
+                The histogram to add.
+
+        Raises
+        ------
+            TypeError: If other is not a Histogram.
+            ValueError: If the histograms do not have the same precision.
+        """
+        if not isinstance(other, Histogram):
+            raise TypeError("Parameter other is not a Histogram.")
+        if other._bits != self._bits:
+            raise ValueError("The histograms do not have the same precision.")
+        for index, count in other._buckets.copy().items():
+            self._buckets[index] = self._buckets.get(index, 0) + count
+        self._count += other._count
+        self._total += other._total
+        self._total_squares += other._total_squares
+        if other._min is not None and (self._min is None or other._min < self._min):
+            self._min = other._min
+        if other._max is not None and (self._max is None or other._max > self._max):
+            self._max = other._max
+
+    def copy(self) -> "Histogram":
+        """
+        Returns an independent copy of the histogram.
+        """
+        histogram = Histogram(self._bits)
+        histogram.merge(self)
+        return histogram
+
+    def __add__(self, other: "Histogram") -> "Histogram":
+        histogram = self.copy()
+        histogram.merge(other)
+        return histogram
+
+    def __repr__(self) -> str:
+        return f"Histogram(count={self._count}, min={self._min}, max={self._max}, mean={self.mean:.1f})"
@@ -0,0 +1,150 @@
+import datetime
+from collections.abc import Sequence
+from typing import Iterator, List, Optional, Union
+from .call_log import CallLog
+
+class LogView(Sequence):
+    """
+    Read-only view on the records of a `TimerCounterLogger`, returned by its `logger` property.
+
+    The view reads the columns of the log when it is accessed, so creating, slicing or filtering a view copies no record.
+    Each record is returned as a list ``[date, function name, runtime in seconds]``.
+
+    The view is a window on the log : sorting the log reorders the view, and a record dropped from the log since the creation
+    of the view (``max_records``, ``max_age`` or a reset) can no longer be read. Use `materialize` to keep an independent copy.
+
+    Parameters
+    ----------
+        log: CallLog
+            The log to read.
+
+        numbers: range or list of int, optional
+            The record numbers of the records of the view. Default is None (the retained records of the log).
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        logger = TimerCounterLogger()
+        ...
+        view = logger.logger
+        print(len(view), view[-1])
+        slow = [record for record in view.filter("func_name", start=start_date) if record[2] > 0.1]
+        records = view[:100].materialize()
+    """
+
+    def __init__(self, log: CallLog, numbers: Optional[Union[range, List[int]]] = None):
+        if not isinstance(log, CallLog):
+            raise TypeError("Parameter log is not a CallLog.")
+        self._log = log
+        self._numbers = log.numbers() if numbers is None else numbers
+
+    def __len__(self) -> int:
+        """
+        Returns the number of records of the view.
+        """
+        return len(self._numbers)
+
+    def _record(self, number: int) -> list:
+        """
+        Returns the record of the given record number.
+        """
+        if not self._log.is_retained(number):
+            raise IndexError("The record was dropped from the log.")
+        return self._log.record(number)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[list, "LogView"]:
+        """
+        Returns the record of the given index, or a view on the records of the given slice.
+        """
+        if isinstance(index, slice):
+            return LogView(self._log, self._numbers[index])
+        return self._record(self._numbers[index])
+
+    def __iter__(self) -> Iterator[list]:
+        """
+        Yields the records of the view.
+        """
+        for number in self._numbers:
+            yield self._record(number)
+
+    def filter(self, func_name: Optional[str] = None, start: Optional[datetime.datetime] = None, end: Optional[datetime.datetime] = None) -> "LogView":
+        """
+        Returns a view on the records of a function and/or started in a time range, in the order of the view.
+
+        Parameters
+        ----------
+            func_name: str, optional
+                The name of the function. Default is None (every function).
+
+            start: datetime, optional
+                The records started before this date are excluded. Default is None (no limit).
+
+            end: datetime, optional
+                The records started at or after this date are excluded. Default is None (no limit).
+
+        Returns
+        -------
+            view: LogView
+                The view on the selected records.
+
+        Raises
+        ------
+            TypeError: If func_name is not a string or start or end is not a datetime.
+        """
+        if func_name is not None and not isinstance(func_name, str):
+            raise TypeError("Parameter func_name is not a string.")
+        for date, name in ((start, "start"), (end, "end")):
+            if date is not None and not isinstance(date, datetime.datetime):
+                raise TypeError(f"Parameter {name} is not a datetime.")
+        log = self._log
+        numbers = self._numbers
+        if func_name is not None:
+            func_id = log.function_id(func_name)
+            if func_id is None:
+                return LogView(log, [])
+            if isinstance(numbers, range) and numbers.step == 1:
+                # The record numbers of the function are sorted.
+                numbers = [number for number in log.indices(func_id) if numbers.start <= number < numbers.stop]
+            else:
+                numbers = [number for number in numbers if log.record_function(number) == func_id]
+        if start is not None or end is not None:
+            low = None if start is None else self._timestamp(start)
+            high = None if end is None else self._timestamp(end)
+            if isinstance(numbers, range) and numbers.step == 1 and log.is_sorted:
+                numbers = numbers[(0 if low is None else self._bisect(numbers, low)):(len(numbers) if high is None else self._bisect(numbers, high))]
+            else:
+                timestamp = log.timestamp
+                numbers = [number for number in numbers if (low is None or timestamp(number) >= low) and (high is None or timestamp(number) < high)]
+        return LogView(log, numbers)
+
+    def _timestamp(self, date: datetime.datetime) -> int:
+        """
+        Returns the first timestamp of the log whose date (rounded to the microsecond like the dates of the records) is the given date.
+        """
+        second = date.replace(microsecond=0)
+        return round(second.timestamp()) * 1000000000 + date.microsecond * 1000 - 500 - self._log.epoch
+
+    def _bisect(self, numbers: range, limit: int) -> int:
+        """
+        Returns the index of the first record started at or after the given timestamp in a range of records in date order.
+        """
+        timestamp = self._log.timestamp
+        low, high = 0, len(numbers)
+        while low < high:
+            middle = (low + high) // 2
+            if timestamp(numbers[middle]) < limit:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def materialize(self) -> List[list]:
+        """
+        Returns an independent copy of the records of the view as a list of ``[date, function name, runtime in seconds]`` records.
+        """
+        return list(self)
+
+    def __repr__(self) -> str:
+        return f"LogView({len(self._numbers)} records)"
@@ -0,0 +1,521 @@
+import time
+import inspect
+import weakref
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from .decorator import Decorator
+
+_MISSING = object() # marks a key absent from a cache
+
+_KWARGS_MARK = object() # separates the positional and the keyword arguments in a key
+
+_FAST_TYPES = {int, str} # types of the single arguments used directly as keys
+
+class _HashedKey(list):
+    """
+    Sequence of arguments computing its hash once, as the key is hashed several times by the cache operations.
+    """
+
+    __slots__ = ("_hash",)
+
+    def __init__(self, items: tuple):
+        self[:] = items
+        self._hash = hash(items)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+def _make_key(args: tuple, kwargs: dict, typed: bool) -> object:
+    """
+    Returns the cache key of the given arguments.
+
+    Raises
+    ------
+        TypeError: If an argument is not hashable.
+    """
+    key = args
+    if kwargs:
+        key += (_KWARGS_MARK,)
+        for item in kwargs.items():
+            key += item
+    if typed:
+        key += tuple(type(arg) for arg in args)
+        if kwargs:
+            key += tuple(type(value) for value in kwargs.values())
+    elif len(key) == 1 and type(key[0]) in _FAST_TYPES:
+        return key[0]
+    return _HashedKey(key)
+
+def _is_instance_method(func) -> bool:
+    """
+    Returns True if the first parameter of the function is named ``self``.
+    """
+    try:
+        parameters = list(inspect.signature(inspect.unwrap(func)).parameters.values())
+    except (TypeError, ValueError):
+        return False
+    return len(parameters) > 0 and parameters[0].name == "self" and parameters[0].kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+
+class Memoize(Decorator):
+    """
+    Cache the results of various functions, with a bounded LRU eviction and an optional time to live.
+
+    .. note::
+        Each decorated function is reported under its '__name__' attribute. If another decorated function already uses this name, the Memoize reports it under its '__qualname__' (then its module and '__qualname__').
+
+    The arguments of the calls must be hashable : a call with an unhashable argument runs the function and is counted as a miss.
+    The methods whose first parameter is ``self`` have one cache per instance, held with a weak reference to the instance,
+    so the cache does not keep the instance alive and is removed with it. The coroutine functions are cached by their awaited results,
+    the generator functions are not cached (a generator can only be consumed once).
+
+    HELP Memoize
+    ============
+
+    Create a cache with :
+
+    .. code-block:: python
+
+        memoize = Memoize(maxsize=128, ttl=60.0)
+
+    Then decorate functions with the cache.
+
+    .. code-block:: python
+
+        @memoize
+        def func_name(x):
+            return x ** 2
+
+    Initialize and clear the caches and the statistics with :
+
+    .. code-block:: python
+
+        memoize.initialize()
+
+    To bypass the cache (the function is called directly) and use it again, use :
+
+    .. code-block:: python
+
+        memoize.set_deactivated()
+        memoize.set_activated()
+
+    Print the statistics with :
+
+    .. code-block:: python
+
+        print(memoize.name_repr) # equivalent of print(memoize)
+
+    The result will be :
+
+    .. code-block:: console
+
+        Memoize(
+        [{func_name}] hits : {hits} - misses : {misses} - evictions : {evictions} - size : {size}
+        [{func_name}] hits : {hits} - misses : {misses} - evictions : {evictions} - size : {size}
+        -----------
+        total number of calls : {total_runcall}
+        hit ratio : {hit_ratio}%
+        )
+    """
+
+    __help__ = """
+HELP Memoize
+============
+
+Create a cache with :
+
+.. code-block:: python
+
+    memoize = Memoize(maxsize=128, ttl=60.0)
+
+Then decorate functions with the cache.
+
+.. code-block:: python
+
+    @memoize
+    def func_name(x):
+        return x ** 2
+
+Initialize and clear the caches and the statistics with :
+
+.. code-block:: python
+
+    memoize.initialize()
+
+To bypass the cache (the function is called directly) and use it again, use :
+
+.. code-block:: python
+
+    memoize.set_deactivated()
+    memoize.set_activated()
+
+Print the statistics with :
+
+.. code-block:: python
+
+    print(memoize.name_repr) # equivalent of print(memoize)
+
+The result will be :
+
+.. code-block:: console
+
+    Memoize(
+    [{func_name}] hits : {hits} - misses : {misses} - evictions : {evictions} - size : {size}
+    [{func_name}] hits : {hits} - misses : {misses} - evictions : {evictions} - size : {size}
+    -----------
+    total number of calls : {total_runcall}
+    hit ratio : {hit_ratio}%
+    )
+"""
+
+    _supports_sampling = False
+    _measures_runtime = False
+
+    def __init__(self, maxsize: Optional[int] = 128, ttl: Optional[float] = None, typed: bool = False, **kwargs):
+        """
+        Parameters
+        ----------
+            maxsize: int, optional
+                The maximal number of results of each cache (each function, or each instance for the methods).
+                The least recently used result is evicted first. Default is 128, None for an unbounded cache.
+
+            ttl: float, optional
+                The time to live of a result in seconds. Default is None (no expiration).
+
+            typed: bool, optional
+                If True, the arguments of different types are cached separately (``1`` and ``1.0``). Default is False.
+
+            kwargs:
+                The options of `Decorator` (hotswap). The caches are always protected by a lock, whatever the threadsafe option,
+                and the lock is not held while the function runs. The sampling and call tree modes are not supported.
+
+        Raises
+        ------
+            TypeError: If maxsize is not an integer, ttl is not a number or typed is not a booleen.
+            ValueError: If maxsize or ttl is not strictly positive, or the sampling or call tree mode is requested.
+        """
+        if maxsize is not None:
+            if not isinstance(maxsize, int) or isinstance(maxsize, bool):
+                raise TypeError("Parameter maxsize is not an integer.")
+            if maxsize <= 0:
+                raise ValueError("Parameter maxsize must be strictly positive.")
+        if ttl is not None:
+            if not isinstance(ttl, (int, float)) or isinstance(ttl, bool):
+                raise TypeError("Parameter ttl is not a number.")
+            if ttl <= 0:
+                raise ValueError("Parameter ttl must be strictly positive.")
+        if not isinstance(typed, bool):
+            raise TypeError("Parameter typed is not a booleen.")
+        super().__init__(**kwargs)
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._typed = typed
+        self._lock = threading.RLock() # the caches are shared by the threads, whatever the threadsafe option
+        self._instance_methods = [] # index: int = slot // value: bool = the function is a method with per-instance caches
+        self.initialize()
+
+    def initialize(self) -> None:
+        """
+        Clears the caches and sets the statistics to 0 for each functions.
+        """
+        # index: int = slot // value: OrderedDict = cache, or dict = per-instance caches of a method
+        self._caches = [{} if method else OrderedDict() for method in self._instance_methods]
+        self._hits = [0] * len(self._names) # index: int = slot // value: int = number of calls answered by the cache
+        self._misses = [0] * len(self._names) # index: int = slot // value: int = number of calls running the function
+        self._evictions = [0] * len(self._names) # index: int = slot // value: int = number of results evicted or expired
+        self._reset_shards()
+
+    def _add_slot(self) -> None:
+        """
+        Adds an empty cache and statistics for a new decorated function.
+        """
+        self._caches.append(OrderedDict())
+        self._instance_methods.append(False)
+        self._hits.append(0)
+        self._misses.append(0)
+        self._evictions.append(0)
+
+    def _instance_cache(self, slot: int, instance: object) -> OrderedDict:
+        """
+        Returns the cache of the given instance for a method, creating it on the first call.
+        The cache is removed when the instance is garbage collected.
+
+        Raises
+        ------
+            TypeError: If the instance does not support weak references.
+        """
+        caches = self._caches[slot]
+        key = id(instance)
+        entry = caches.get(key)
+        if entry is not None and entry[0]() is instance:
+            return entry[1]
+        def remove(reference, caches=caches, key=key):
+            with self._lock:
+                if caches.get(key, (None,))[0] is reference:
+                    del caches[key]
+        entry = (weakref.ref(instance, remove), OrderedDict())
+        caches[key] = entry
+        return entry[1]
+
+    def _lookup(self, slot: int, args: tuple, kwargs: dict) -> Tuple[OrderedDict, object]:
+        """
+        Returns the cache and the key of a call (called with the lock held).
+
+        Raises
+        ------
+            TypeError: If an argument is not hashable or the instance does not support weak references.
+        """
+        if self._instance_methods[slot] and args:
+            return self._instance_cache(slot, args[0]), _make_key(args[1:], kwargs, self._typed)
+        return self._caches[slot], _make_key(args, kwargs, self._typed)
+
+    def _get(self, slot: int, args: tuple, kwargs: dict) -> tuple:
+        """
+        Returns the cached result of a call, or _MISSING with the cache and the key to store the result (None if the call cannot be cached).
+        """
+        with self._lock:
+            try:
+                cache, key = self._lookup(slot, args, kwargs)
+            except TypeError:
+                self._misses[slot] += 1
+                return _MISSING, None, None
+            entry = cache.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, expiry = entry
+                if expiry is None or expiry > time.monotonic():
+                    cache.move_to_end(key)
+                    self._hits[slot] += 1
+                    return value, None, None
+                del cache[key]
+                self._evictions[slot] += 1
+            self._misses[slot] += 1
+            return _MISSING, cache, key
+
+    def _put(self, slot: int, cache: OrderedDict, key: object, value: object) -> None:
+        """
+        Stores the result of a call and evicts the least recently used results above the maximal size.
+        """
+        expiry = None if self._ttl is None else time.monotonic() + self._ttl
+        with self._lock:
+            cache[key] = (value, expiry)
+            cache.move_to_end(key)
+            if self._maxsize is not None:
+                while len(cache) > self._maxsize:
+                    cache.popitem(last=False)
+                    self._evictions[slot] += 1
+
+    def __call__(self, func):
+        """
+        Decorates the given function with a cache.
+
+        Parameters
+        ----------
+            func: callable
+                The function to decorate.
+
+        Returns
+        -------
+            wrapped: callable
+                The decorated function.
+        """
+        slot = self._register(func)
+        original = inspect.unwrap(func)
+        if _is_instance_method(func):
+            with self._lock:
+                self._instance_methods[slot] = True
+                self._caches[slot] = {} # key: int = id of the instance // value: (weak reference to the instance, OrderedDict)
+        if inspect.isgeneratorfunction(original) or inspect.isasyncgenfunction(original):
+            def wrapped(*args, **kwargs):
+                if self._activated:
+                    with self._lock:
+                        self._misses[slot] += 1
+                return func(*args, **kwargs)
+        elif inspect.iscoroutinefunction(original):
+            async def wrapped(*args, **kwargs):
+                if not self._activated:
+                    return await func(*args, **kwargs)
+                value, cache, key = self._get(slot, args, kwargs)
+                if value is _MISSING:
+                    value = await func(*args, **kwargs)
+                    if cache is not None:
+                        self._put(slot, cache, key, value)
+                return value
+        else:
+            def wrapped(*args, **kwargs):
+                if not self._activated:
+                    return func(*args, **kwargs)
+                value, cache, key = self._get(slot, args, kwargs)
+                if value is _MISSING:
+                    value = func(*args, **kwargs)
+                    if cache is not None:
+                        self._put(slot, cache, key, value)
+                return value
+        return self._install(wrapped, func)
+
+    def cache_clear(self, func_name: Optional[str] = None) -> None:
+        """
+        Removes the cached results of the given function (all the functions by default), keeping the statistics.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        slots = range(len(self._names)) if func_name is None else [self._slot(func_name)]
+        with self._lock:
+            for slot in slots:
+                if slot is not None:
+                    self._caches[slot].clear()
+
+    def _size(self, slot: int) -> int:
+        """
+        Returns the number of cached results of the given slot (of all the instances for a method).
+        """
+        cache = self._caches[slot]
+        if self._instance_methods[slot]:
+            return sum(len(entry[1]) for entry in list(cache.values()))
+        return len(cache)
+
+    def _statistics(self) -> Dict[str, Tuple[int, int, int, int]]:
+        """
+        Returns the hits, misses, evictions and size of each called function.
+        """
+        with self._lock:
+            return {func_name: (self._hits[slot], self._misses[slot], self._evictions[slot], self._size(slot)) for slot, func_name in enumerate(list(self._names)) if self._hits[slot] or self._misses[slot]}
+
+    def hits(self, func_name: str) -> int:
+        """
+        Returns the number of calls of the given function answered by the cache.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        return self._slot_value(self._hits, func_name)
+
+    def misses(self, func_name: str) -> int:
+        """
+        Returns the number of calls of the given function running the function.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        return self._slot_value(self._misses, func_name)
+
+    def evictions(self, func_name: str) -> int:
+        """
+        Returns the number of results of the given function evicted by the maximal size or expired.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        return self._slot_value(self._evictions, func_name)
+
+    def cache_size(self, func_name: str) -> int:
+        """
+        Returns the number of cached results of the given function.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        slot = self._slot(func_name)
+        if slot is None:
+            return 0
+        with self._lock:
+            return self._size(slot)
+
+    def number_calls(self, func_name: str) -> int:
+        """
+        Returns the number of calls of the given function while the cache was activated.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        return self.hits(func_name) + self.misses(func_name)
+
+    @property
+    def total_runcall(self) -> int:
+        """
+        Returns the total runcall while the cache was activated.
+        """
+        with self._lock:
+            return sum(self._hits) + sum(self._misses)
+
+    @property
+    def hit_ratio(self) -> float:
+        """
+        Returns the ratio of the calls answered by the cache (0 if there was no call).
+        """
+        with self._lock:
+            hits, calls = sum(self._hits), sum(self._hits) + sum(self._misses)
+        return hits / calls if calls else 0.0
+
+    def _snapshot_data(self) -> dict:
+        """
+        Returns the hits, misses and evictions of each called function (the cached results are not copied).
+        """
+        return {func_name: statistics[:3] for func_name, statistics in self._statistics().items()}
+
+    def _merge_data(self, data: dict) -> None:
+        """
+        Adds the hits, misses and evictions of each function of a snapshot.
+        """
+        slots = {func_name: self._named_slot(func_name) for func_name in data.keys()}
+        with self._lock:
+            for func_name, (hits, misses, evictions) in data.items():
+                self._hits[slots[func_name]] += hits
+                self._misses[slots[func_name]] += misses
+                self._evictions[slots[func_name]] += evictions
+
+    def _snapshot_totals(self) -> Tuple[list, list]:
+        """
+        Returns the number of calls of each slot, without runtime.
+        """
+        with self._lock:
+            return [hits + misses for hits, misses in zip(self._hits, self._misses)], [0] * len(self._hits)
+
+    def _reset_data(self) -> None:
+        """
+        Sets the statistics of each slot to 0, keeping the cached results.
+        """
+        with self._lock:
+            for counts in (self._hits, self._misses, self._evictions):
+                for slot in range(len(counts)):
+                    counts[slot] = 0
+
+    def __repr__(self) -> str:
+        """
+        Returns the string representation.
+        Default = self.name_repr
+        """
+        return self.name_repr
+
+    def get_help(self) -> str:
+        """
+        Returns the documentation 'How to Use' of the decorator
+        """
+        return self.__help__
+
+    @property
+    def name_repr(self) -> str:
+        """
+        Returns the string representation in the following format:
+
+        .. code-block:: console
+
+            Memoize(
+            [{func_name}] hits : {hits} - misses : {misses} - evictions : {evictions} - size : {size}
+            [{func_name}] hits : {hits} - misses : {misses} - evictions : {evictions} - size : {size}
+            -----------
+            total number of calls : {total_runcall}
+            hit ratio : {hit_ratio}%
+            )
+        """
+        string = "Memoize(\n"
+        for func_name, (hits, misses, evictions, size) in self._statistics().items():
+            string += f"[{func_name}] hits : {hits} - misses : {misses} - evictions : {evictions} - size : {size}\n"
+        string += f"-----------\ntotal number of calls : {self.total_runcall}\nhit ratio : {100 * self.hit_ratio:.1f}%\n)"
+        return string
@@ -0,0 +1,498 @@
+import asyncio
+import inspect
+import threading
+from typing import Dict, Tuple, Union
+from .decorator import Decorator
+from .report import _format_runtime
+
+class _Batch(object):
+    """
+    Items waiting for a single call of the batch implementation.
+    """
+
+    __slots__ = ("items", "enqueued", "trigger", "done", "results", "error")
+
+    def __init__(self, done):
+        self.items = []
+        self.enqueued = [] # timestamps in ns of the calls
+        self.trigger = None # threading.Event set when the batch is full, or handle of the asyncio flush
+        self.done = done # threading.Event, or asyncio.Future of the results
+        self.results = None
+        self.error = None
+
+class MicroBatch(Decorator):
+    """
+    Group the concurrent calls of various functions into batches.
+
+    .. note::
+        Each decorated function is reported under its '__name__' attribute. If another decorated function already uses this name, the MicroBatch reports it under its '__qualname__' (then its module and '__qualname__').
+
+    The decorated function is the batch implementation : it takes the list of the items and returns the list of the results, in the same order.
+    The callers call it with a single item and get their own result. The items of the concurrent calls are collected until the batch
+    has max_size items or its first item has waited max_delay seconds, then the batch implementation is called once.
+    If it raises an exception, every caller of the batch gets the exception.
+
+    The calls from threads are grouped with a synchronous batch implementation, the calls from asyncio tasks (of the same event loop)
+    with a coroutine batch implementation.
+
+    HELP MicroBatch
+    ===============
+
+    Create a micro batch decorator with :
+
+    .. code-block:: python
+
+        microbatch = MicroBatch(max_size=64, max_delay=0.005)
+
+    Then decorate batch implementations with the micro batch decorator.
+
+    .. code-block:: python
+
+        @microbatch
+        def square(values):
+            return list(numpy.square(values))
+
+        square(3) # 9, computed with the items of the concurrent calls
+
+    Initialize the statistics with :
+
+    .. code-block:: python
+
+        microbatch.initialize()
+
+    To call the batch implementation with each item alone and group the calls again, use :
+
+    .. code-block:: python
+
+        microbatch.set_deactivated()
+        microbatch.set_activated()
+
+    Print the statistics with :
+
+    .. code-block:: python
+
+        print(microbatch.name_repr) # equivalent of print(microbatch)
+
+    The result will be :
+
+    .. code-block:: console
+
+        MicroBatch(
+        [{func_name}] number of calls : {Ncalls} - batches : {Nbatches} - mean batch size : {mean_size} - largest batch : {max_size} - mean queue latency : {hours}h {minutes}m {seconds}s - cumulative runtime : {hours}h {minutes}m {seconds}s
+        [{func_name}] number of calls : {Ncalls} - batches : {Nbatches} - mean batch size : {mean_size} - largest batch : {max_size} - mean queue latency : {hours}h {minutes}m {seconds}s - cumulative runtime : {hours}h {minutes}m {seconds}s
+        -----------
+        total number of calls : {total_runcall}
+        total number of batches : {total_batches}
+        total runtime : {total_runtime_hours}h {total_runtime_minutes}m {total_runtime_seconds}s
+        )
+    """
+
+    __help__ = """
+HELP MicroBatch
+===============
+
+Create a micro batch decorator with :
+
+.. code-block:: python
+
+    microbatch = MicroBatch(max_size=64, max_delay=0.005)
+
+Then decorate batch implementations with the micro batch decorator.
+
+.. code-block:: python
+
+    @microbatch
+    def square(values):
+        return list(numpy.square(values))
+
+    square(3) # 9, computed with the items of the concurrent calls
+
+Initialize the statistics with :
+
+.. code-block:: python
+
+    microbatch.initialize()
+
+To call the batch implementation with each item alone and group the calls again, use :
+
+.. code-block:: python
+
+    microbatch.set_deactivated()
+    microbatch.set_activated()
+
+Print the statistics with :
+
+.. code-block:: python
+
+    print(microbatch.name_repr) # equivalent of print(microbatch)
+
+The result will be :
+
+.. code-block:: console
+
+    MicroBatch(
+    [{func_name}] number of calls : {Ncalls} - batches : {Nbatches} - mean batch size : {mean_size} - largest batch : {max_size} - mean queue latency : {hours}h {minutes}m {seconds}s - cumulative runtime : {hours}h {minutes}m {seconds}s
+    [{func_name}] number of calls : {Ncalls} - batches : {Nbatches} - mean batch size : {mean_size} - largest batch : {max_size} - mean queue latency : {hours}h {minutes}m {seconds}s - cumulative runtime : {hours}h {minutes}m {seconds}s
+    -----------
+    total number of calls : {total_runcall}
+    total number of batches : {total_batches}
+    total runtime : {total_runtime_hours}h {total_runtime_minutes}m {total_runtime_seconds}s
+    )
+"""
+
+    _supports_sampling = False
+
+    def __init__(self, max_size: int = 64, max_delay: Union[int, float] = 0.005, **kwargs):
+        """
+        Parameters
+        ----------
+            max_size: int, optional
+                The maximum number of items of a batch.
+                Default value is 64.
+            max_delay: int or float, optional
+                The maximum time in seconds the first item of a batch waits for other items.
+                Default value is 0.005.
+            kwargs:
+                The options of `Decorator` (hotswap, clock). The calls are always grouped under a lock, whatever the threadsafe option.
+                The sampling and call tree modes are not supported.
+
+        Raises
+        ------
+            TypeError: If max_size is not an integer or max_delay is not a number.
+            ValueError: If max_size is not strictly positive, max_delay is negative, or the sampling or call tree mode is requested.
+        """
+        if not isinstance(max_size, int) or isinstance(max_size, bool):
+            raise TypeError("Parameter max_size is not an integer.")
+        if max_size <= 0:
+            raise ValueError("Parameter max_size must be strictly positive.")
+        if not isinstance(max_delay, (int, float)) or isinstance(max_delay, bool):
+            raise TypeError("Parameter max_delay is not a number.")
+        if max_delay < 0:
+            raise ValueError("Parameter max_delay must be positive.")
+        super().__init__(**kwargs)
+        self._max_size = max_size
+        self._max_delay = max_delay
+        self._lock = threading.Lock()
+        self._pending = {} # key: int = slot // value: _Batch = batch collecting the items of the threads
+        self._tasks = {} # key: (event loop, int) = (loop, slot) // value: _Batch = batch collecting the items of the asyncio tasks
+        self.initialize()
+
+    def initialize(self) -> None:
+        """
+        Sets the statistics to 0 for each functions.
+        """
+        self._items = [0] * len(self._names) # index: int = slot // value: int = number of calls (items) of the function
+        self._batches = [0] * len(self._names) # index: int = slot // value: int = number of calls of the batch implementation
+        self._largest = [0] * len(self._names) # index: int = slot // value: int = largest batch size
+        self._latencies = [0] * len(self._names) # index: int = slot // value: int = cumulative queue latency of the items in ns
+        self._runtimes = [0] * len(self._names) # index: int = slot // value: int = cumulative runtime of the batch implementation in ns
+        self._reset_shards()
+
+    def _add_slot(self) -> None:
+        """
+        Adds the statistics of a new decorated function.
+        """
+        for counts in (self._items, self._batches, self._largest, self._latencies, self._runtimes):
+            counts.append(0)
+
+    @staticmethod
+    def _check(results, size: int) -> list:
+        """
+        Returns the results of the batch implementation as a list.
+
+        Raises
+        ------
+            ValueError: If the number of results is not the number of items.
+        """
+        results = list(results)
+        if len(results) != size:
+            raise ValueError(f"The batch implementation returned {len(results)} results for {size} items.")
+        return results
+
+    def _record_batch(self, slot: int, batch: _Batch, tic: int, toc: int) -> None:
+        """
+        Adds the statistics of an executed batch.
+        """
+        size = len(batch.items)
+        latency = size * tic - sum(batch.enqueued)
+        with self._lock:
+            self._items[slot] += size
+            self._batches[slot] += 1
+            self._largest[slot] = max(self._largest[slot], size)
+            self._latencies[slot] += latency
+            self._runtimes[slot] += toc - tic
+
+    def _execute(self, slot: int, func, item):
+        """
+        Adds the item to the batch of the threads and returns its result.
+        The first caller of a batch waits for the other items and calls the batch implementation.
+        """
+        with self._lock:
+            batch = self._pending.get(slot)
+            leader = batch is None
+            if leader:
+                batch = self._pending[slot] = _Batch(threading.Event())
+                batch.trigger = threading.Event()
+            index = len(batch.items)
+            batch.items.append(item)
+            batch.enqueued.append(self._clock())
+            if len(batch.items) >= self._max_size:
+                del self._pending[slot]
+                batch.trigger.set()
+        if not leader:
+            batch.done.wait()
+        else:
+            batch.trigger.wait(self._max_delay)
+            with self._lock:
+                if self._pending.get(slot) is batch:
+                    del self._pending[slot]
+            tic = self._clock()
+            try:
+                batch.results = self._check(func(batch.items), len(batch.items))
+            except BaseException as error:
+                batch.error = error
+            toc = self._clock()
+            batch.done.set()
+            self._record_batch(slot, batch, tic, toc)
+        if batch.error is not None:
+            raise batch.error
+        return batch.results[index]
+
+    def _flush(self, slot: int, func, key: tuple, batch: _Batch) -> None:
+        """
+        Closes the batch of the asyncio tasks and schedules the call of the batch implementation.
+        """
+        with self._lock:
+            if self._tasks.get(key) is batch:
+                del self._tasks[key]
+        batch.trigger.cancel()
+        # The task is referenced by the batch until its end.
+        batch.trigger = asyncio.ensure_future(self._async_run(slot, func, batch))
+
+    async def _async_run(self, slot: int, func, batch: _Batch) -> None:
+        """
+        Awaits the batch implementation and sets the results of the batch.
+        """
+        tic = self._clock()
+        try:
+            batch.done.set_result(self._check(await func(batch.items), len(batch.items)))
+        except asyncio.CancelledError:
+            batch.done.cancel()
+            raise
+        except BaseException as error:
+            batch.done.set_exception(error)
+            batch.done.exception() # the exception is retrieved even if every caller is cancelled
+        finally:
+            self._record_batch(slot, batch, tic, self._clock())
+
+    async def _async_execute(self, slot: int, func, item):
+        """
+        Adds the item to the batch of the asyncio tasks of the running event loop and awaits its result.
+        """
+        loop = asyncio.get_running_loop()
+        key = (loop, slot)
+        with self._lock:
+            batch = self._tasks.get(key)
+            if batch is None:
+                batch = self._tasks[key] = _Batch(loop.create_future())
+                batch.trigger = loop.call_later(self._max_delay, self._flush, slot, func, key, batch)
+            index = len(batch.items)
+            batch.items.append(item)
+            batch.enqueued.append(self._clock())
+            full = len(batch.items) >= self._max_size
+        if full:
+            self._flush(slot, func, key, batch)
+        # A cancelled caller does not cancel the batch of the other callers.
+        results = await asyncio.shield(batch.done)
+        return results[index]
+
+    def __call__(self, func):
+        """
+        Decorates the given batch implementation to be called with a single item.
+
+        Parameters
+        ----------
+            func: callable
+                The batch implementation to decorate. It takes the list of the items and returns the list of their results.
+
+        Returns
+        -------
+            wrapped: callable
+                The decorated function, called with a single item.
+        """
+        slot = self._register(func)
+        if inspect.iscoroutinefunction(inspect.unwrap(func)):
+            async def wrapped(item):
+                if not self._activated:
+                    return self._check(await func([item]), 1)[0]
+                return await self._async_execute(slot, func, item)
+        else:
+            def wrapped(item):
+                if not self._activated:
+                    return self._check(func([item]), 1)[0]
+                return self._execute(slot, func, item)
+        return self._install(wrapped, func)
+
+    def number_calls(self, func_name: str) -> int:
+        """
+        Returns the number of calls (items) of the given function while the decorator was activated.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        return self._slot_value(self._items, func_name)
+
+    def number_batches(self, func_name: str) -> int:
+        """
+        Returns the number of calls of the batch implementation of the given function.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        return self._slot_value(self._batches, func_name)
+
+    def mean_batch_size(self, func_name: str) -> float:
+        """
+        Returns the mean number of items of the batches of the given function (0 if there was no batch).
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        batches = self.number_batches(func_name)
+        return self.number_calls(func_name) / batches if batches else 0.0
+
+    def largest_batch(self, func_name: str) -> int:
+        """
+        Returns the largest number of items of a batch of the given function.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        return self._slot_value(self._largest, func_name)
+
+    def mean_queue_latency(self, func_name: str) -> float:
+        """
+        Returns the mean time in seconds the items of the given function waited before the call of the batch implementation (0 if there was no call).
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        items = self.number_calls(func_name)
+        return self._slot_value(self._latencies, func_name) / items / 1e9 if items else 0.0
+
+    def cumul_runtime(self, func_name: str) -> float:
+        """
+        Returns the cumulative runtime in seconds of the batch implementation of the given function.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        return self._slot_value(self._runtimes, func_name) / 1e9
+
+    @property
+    def total_runcall(self) -> int:
+        """
+        Returns the total runcall (items) while the decorator was activated.
+        """
+        with self._lock:
+            return sum(self._items)
+
+    @property
+    def total_batches(self) -> int:
+        """
+        Returns the total number of calls of the batch implementations.
+        """
+        with self._lock:
+            return sum(self._batches)
+
+    @property
+    def total_runtime(self) -> float:
+        """
+        Returns the total runtime in seconds of the batch implementations.
+        """
+        with self._lock:
+            return sum(self._runtimes) / 1e9
+
+    def _statistics(self) -> Dict[str, Tuple[int, int, int, int, int]]:
+        """
+        Returns the items, batches, largest batch size, queue latency and runtime in ns of each called function.
+        """
+        with self._lock:
+            return {func_name: (self._items[slot], self._batches[slot], self._largest[slot], self._latencies[slot], self._runtimes[slot]) for slot, func_name in enumerate(list(self._names)) if self._batches[slot]}
+
+    def _snapshot_data(self) -> dict:
+        """
+        Returns the items, batches, largest batch size, queue latency and runtime in ns of each called function.
+        """
+        return self._statistics()
+
+    def _merge_data(self, data: dict) -> None:
+        """
+        Adds the statistics of each function of a snapshot.
+        """
+        slots = {func_name: self._named_slot(func_name) for func_name in data.keys()}
+        with self._lock:
+            for func_name, (items, batches, largest, latency, runtime) in data.items():
+                slot = slots[func_name]
+                self._items[slot] += items
+                self._batches[slot] += batches
+                self._largest[slot] = max(self._largest[slot], largest)
+                self._latencies[slot] += latency
+                self._runtimes[slot] += runtime
+
+    def _snapshot_totals(self) -> Tuple[list, list]:
+        """
+        Returns the number of calls and the runtime in ns of the batch implementation of each slot.
+        """
+        with self._lock:
+            return list(self._items), list(self._runtimes)
+
+    def _reset_data(self) -> None:
+        """
+        Sets the statistics of each slot to 0.
+        """
+        with self._lock:
+            for counts in (self._items, self._batches, self._largest, self._latencies, self._runtimes):
+                for slot in range(len(counts)):
+                    counts[slot] = 0
+
+    def __repr__(self) -> str:
+        """
+        Returns the string representation.
+        Default = self.name_repr
+        """
+        return self.name_repr
+
+    def get_help(self) -> str:
+        """
+        Returns the documentation 'How to Use' of the decorator
+        """
+        return self.__help__
+
+    @property
+    def name_repr(self) -> str:
+        """
+        Returns the string representation in the following format:
+
+        .. code-block:: console
+
+            MicroBatch(
+            [{func_name}] number of calls : {Ncalls} - batches : {Nbatches} - mean batch size : {mean_size} - largest batch : {max_size} - mean queue latency : {hours}h {minutes}m {seconds}s - cumulative runtime : {hours}h {minutes}m {seconds}s
+            [{func_name}] number of calls : {Ncalls} - batches : {Nbatches} - mean batch size : {mean_size} - largest batch : {max_size} - mean queue latency : {hours}h {minutes}m {seconds}s - cumulative runtime : {hours}h {minutes}m {seconds}s
+            -----------
+            total number of calls : {total_runcall}
+            total number of batches : {total_batches}
+            total runtime : {total_runtime_hours}h {total_runtime_minutes}m {total_runtime_seconds}s
+            )
+        """
+        string = "MicroBatch(\n"
+        for func_name, (items, batches, largest, latency, runtime) in self._statistics().items():
+            string += f"[{func_name}] number of calls : {items} - batches : {batches} - mean batch size : {items / batches:.1f} - largest batch : {largest} - mean queue latency : {_format_runtime(latency / items / 1e9)} - cumulative runtime : {_format_runtime(runtime / 1e9)}\n"
+        string += f"-----------\ntotal number of calls : {self.total_runcall}\ntotal number of batches : {self.total_batches}\ntotal runtime : {_format_runtime(self.total_runtime)}\n)"
+        return string
@@ -0,0 +1,286 @@
+from .decorator import Decorator
+from .class_propagate import class_propagate, _is_method
+from typing import Optional, List, Union
+import importlib.abc
+import fnmatch
+import types
+import sys
+
+_MISSING = object() # marks an attribute added by the instrumentation
+
+_pending = {} # key: str = module name // value: list of Instrumentation = instrumentations waiting for the first attribute access
+
+class _LazyModule(types.ModuleType):
+    """
+    Module class instrumenting the module on the first access to one of its attributes (except the special attributes).
+    """
+
+    def __getattribute__(self, name: str):
+        if not (name.startswith("__") and name.endswith("__")):
+            module_name = types.ModuleType.__getattribute__(self, "__name__")
+            instrumentations = _pending.pop(module_name, [])
+            if types.ModuleType.__getattribute__(self, "__class__") is _LazyModule:
+                self.__class__ = types.ModuleType
+            for instrumentation in instrumentations:
+                instrumentation._instrument(self)
+        return types.ModuleType.__getattribute__(self, name)
+
+class _InstrumentingLoader(importlib.abc.Loader):
+    """
+    Loader executing a module with the original loader, then instrumenting it.
+    """
+
+    def __init__(self, loader, instrumentation: "Instrumentation"):
+        self._loader = loader
+        self._instrumentation = instrumentation
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: types.ModuleType) -> None:
+        self._loader.exec_module(module)
+        if self._instrumentation.is_installed():
+            self._instrumentation._add(module)
+
+    def __getattr__(self, name: str):
+        # Resources, source code, ... of the original loader.
+        return getattr(self._loader, name)
+
+class _InstrumentingFinder(importlib.abc.MetaPathFinder):
+    """
+    Import hook wrapping the loaders of the modules of a package tree.
+    """
+
+    def __init__(self, instrumentation: "Instrumentation"):
+        self._instrumentation = instrumentation
+
+    def find_spec(self, fullname: str, path=None, target=None):
+        if not self._instrumentation._in_tree(fullname):
+            return None
+        for finder in sys.meta_path:
+            if finder is self or isinstance(finder, _InstrumentingFinder) or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _InstrumentingLoader(spec.loader, self._instrumentation)
+                return spec
+        return None
+
+class Instrumentation(object):
+    """
+    Instrumentation of the functions and classes of a module or a package tree by a decorator, created by `module_propagate`.
+
+    The instrumentation keeps the original functions and class members to restore them with `uninstall`.
+
+    Parameters
+    ----------
+        decorator: Decorator
+            The decorator to apply.
+
+        root: str
+            The name of the module or package.
+
+        include: list of str, optional
+            The glob patterns of the qualified names (``"package.module.function"``, ``"package.module.Class.method"``) to decorate.
+            Default is None (every function and method of the tree).
+
+        exclude: list of str, optional
+            The glob patterns of the qualified names not to decorate, applied after ``include``.
+            Default is None.
+
+        lazy: bool, optional
+            If True, a module is instrumented on the first access to one of its attributes. Default is False.
+    """
+
+    def __init__(self, decorator: Decorator, root: str, include: Optional[List[str]] = None, exclude: Optional[List[str]] = None, lazy: bool = False):
+        self._decorator = decorator
+        self._root = root
+        self._include = include
+        self._exclude = exclude
+        self._lazy = lazy
+        self._installed = True
+        self._finder = None
+        self._modules = [] # names of the instrumented modules
+        self._replaced = [] # (owner, name, original object or _MISSING, installed object)
+
+    @property
+    def modules(self) -> List[str]:
+        """
+        Returns the names of the instrumented modules.
+        """
+        return list(self._modules)
+
+    def is_installed(self) -> bool:
+        """
+        Returns True until the instrumentation is uninstalled.
+        """
+        return self._installed
+
+    def _in_tree(self, module_name: str) -> bool:
+        """
+        Returns True if the module belongs to the instrumented module or package tree.
+        """
+        return module_name == self._root or module_name.startswith(self._root + ".")
+
+    def _selected(self, qualname: str) -> bool:
+        """
+        Returns True if the qualified name matches the include patterns and none of the exclude patterns.
+        """
+        if self._include is not None and not any(fnmatch.fnmatchcase(qualname, pattern) for pattern in self._include):
+            return False
+        return self._exclude is None or not any(fnmatch.fnmatchcase(qualname, pattern) for pattern in self._exclude)
+
+    def _add(self, module: types.ModuleType) -> None:
+        """
+        Instruments the module now, or on the first access to its attributes in lazy mode.
+        """
+        if not self._lazy or type(module) not in (types.ModuleType, _LazyModule):
+            self._instrument(module)
+            return
+        _pending.setdefault(module.__name__, []).append(self)
+        module.__class__ = _LazyModule
+
+    def _instrument(self, module: types.ModuleType) -> None:
+        """
+        Decorates the functions and the methods of the classes defined in the module.
+        """
+        if not self._installed or module.__name__ in self._modules:
+            return
+        self._modules.append(module.__name__)
+        decorator = self._decorator
+        for attr_name, attr_value in list(vars(module).items()):
+            qualname = f"{module.__name__}.{attr_name}"
+            if getattr(attr_value, "__module__", None) != module.__name__:
+                continue # imported from another module
+            if isinstance(attr_value, types.FunctionType):
+                if decorator._is_wrapper(attr_value) or not self._selected(qualname):
+                    continue
+                decorated = decorator(attr_value)
+                setattr(module, attr_name, decorated)
+                self._replaced.append((module, attr_name, attr_value, decorated))
+            elif isinstance(attr_value, type):
+                names = [name for name, member in vars(attr_value).items() if _is_method(member) and self._selected(f"{qualname}.{name}")]
+                if not names:
+                    continue
+                before = dict(vars(attr_value))
+                class_propagate(decorator, names=names)(attr_value)
+                for name in names:
+                    installed = vars(attr_value).get(name)
+                    if installed is not before.get(name, _MISSING):
+                        self._replaced.append((attr_value, name, before.get(name, _MISSING), installed))
+
+    def uninstall(self) -> None:
+        """
+        Removes the import hook and restores the original functions and class members.
+        The modules waiting for their first attribute access in lazy mode are not instrumented anymore.
+        """
+        if not self._installed:
+            return
+        self._installed = False
+        if self._finder is not None and self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        for module_name, instrumentations in list(_pending.items()):
+            if self in instrumentations:
+                instrumentations.remove(self)
+            if not instrumentations:
+                del _pending[module_name]
+                module = sys.modules.get(module_name)
+                if module is not None and type(module) is _LazyModule:
+                    module.__class__ = types.ModuleType
+        for owner, name, original, installed in reversed(self._replaced):
+            if vars(owner).get(name) is not installed:
+                continue # replaced since the instrumentation
+            if original is _MISSING:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+        self._replaced = []
+
+    def __enter__(self) -> "Instrumentation":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.uninstall()
+
+    def __repr__(self) -> str:
+        return f"Instrumentation({self._root}, modules={len(self._modules)}, installed={self._installed})"
+
+def module_propagate(decorator: Decorator, module: Union[str, types.ModuleType], include: Optional[List[str]] = None, exclude: Optional[List[str]] = None, lazy: bool = False, hook: bool = True) -> Instrumentation:
+    """
+    Applies a given decorator to the functions and the methods of the classes of a module or a package tree.
+
+    The module and its already imported submodules are instrumented immediately (or lazily).
+    With the import hook, the submodules imported later are instrumented when they are imported,
+    so a package can be instrumented before its import without importing the whole tree.
+    Only the functions and classes defined in a module are instrumented, not the ones it imports.
+    The classes are instrumented with `class_propagate`.
+
+    Parameters
+    ----------
+        decorator: Decorator
+            An instance of the `Decorator` class to apply.
+
+        module: str or module
+            The module or package, or its name (the module does not need to be imported yet).
+
+        include: list of str, optional
+            The glob patterns of the qualified names (``"package.module.function"``, ``"package.module.Class.method"``) to decorate.
+            Default is None (every function and method).
+
+        exclude: list of str, optional
+            The glob patterns of the qualified names not to decorate (``"*._*"`` for the private names, ...).
+            Default is None.
+
+        lazy: bool, optional
+            If True, each module is instrumented on the first access to one of its attributes, so the unused modules cost nothing.
+            The modules using a custom module class are instrumented immediately.
+            Default is False.
+
+        hook: bool, optional
+            If True, an import hook instruments the modules of the tree imported later.
+            Default is True.
+
+    Returns
+    -------
+        instrumentation: Instrumentation
+            The instrumentation, whose `uninstall` method restores the original functions.
+
+    Raises
+    ------
+        TypeError: If a parameter has a wrong type.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        timer = Timer()
+        instrumentation = module_propagate(timer, "mypackage.io", exclude=["*._*"])
+        run()
+        print(timer)
+        instrumentation.uninstall()
+    """
+    if not isinstance(decorator, Decorator):
+        raise TypeError("The parameter `decorator` must be an instance of the `Decorator` class.")
+    if isinstance(module, types.ModuleType):
+        root = module.__name__
+    elif isinstance(module, str):
+        root = module
+    else:
+        raise TypeError("Parameter module is not a module or a string.")
+    for patterns, name in ((include, "include"), (exclude, "exclude")):
+        if patterns is not None and (not isinstance(patterns, list) or not all(isinstance(pattern, str) for pattern in patterns)):
+            raise TypeError(f"The `{name}` parameter must be a list of strings or `None`.")
+    if not isinstance(lazy, bool):
+        raise TypeError("Parameter lazy is not a booleen.")
+    if not isinstance(hook, bool):
+        raise TypeError("Parameter hook is not a booleen.")
+    instrumentation = Instrumentation(decorator, root, include, exclude, lazy)
+    if hook:
+        instrumentation._finder = _InstrumentingFinder(instrumentation)
+        sys.meta_path.insert(0, instrumentation._finder)
+    for module_name, loaded in sorted(list(sys.modules.items()), key=lambda item: item[0]):
+        if instrumentation._in_tree(module_name) and isinstance(loaded, types.ModuleType):
+            instrumentation._add(loaded)
+    return instrumentation
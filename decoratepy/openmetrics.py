@@ -0,0 +1,237 @@
+import threading
+import http.server
+from typing import Dict, Iterator, List, Optional
+from .decorator import Decorator
+from .timer_counter import TimerCounter
+
+_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+_DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0) # upper bounds of the histogram buckets in seconds
+
+def _escape(value: str) -> str:
+    """
+    Escapes a label value of the OpenMetrics text format.
+    """
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+class OpenMetricsExporter(object):
+    """
+    Renders the statistics of decorators in the OpenMetrics text format, read by Prometheus and compatible monitoring systems.
+
+    The exporter renders the following metric families, labelled by decorator and function name :
+
+    - ``{prefix}_calls`` (counter): the number of calls of each function.
+    - ``{prefix}_runtime_seconds`` (counter): the cumulative runtime of each function (not for the decorators measuring no runtime,
+      such as `Counter`, `Memoize` and `SingleFlight`).
+    - ``{prefix}_call_duration_seconds`` (histogram): the distribution of the runtimes of a `TimerCounter`.
+
+    The totals are read with ``snapshot(measurements=False)`` (see `Decorator.snapshot`), so a scrape copies no record
+    and costs a time proportional to the number of functions. The histograms of a `TimerCounter` are read in the same snapshot
+    as its totals, so the series of a scrape agree. The lines are generated one by one by `iter_lines`.
+    In sampling mode, the numbers of calls and the runtimes are estimated and the histograms only contain the measured calls.
+
+    Parameters
+    ----------
+        decorators: dict
+            key: str = name of the decorator (label ``decorator``) // value: Decorator = the decorator to export.
+
+        prefix: str, optional
+            The prefix of the metric names. Default is "decoratepy".
+
+        buckets: list of float, optional
+            The upper bounds in seconds of the buckets of the histograms, in increasing order.
+            Default is None (from 100 µs to 10 s).
+
+    Raises
+    ------
+        TypeError: If a parameter has a wrong type, or a decorator has no totals to export.
+        ValueError: If buckets is not in increasing order.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        timercounter = TimerCounter(threadsafe=True)
+        exporter = OpenMetricsExporter({"api": timercounter})
+        server = exporter.serve(port=9100) # http://127.0.0.1:9100/metrics
+        ...
+        server.stop()
+    """
+
+    def __init__(self, decorators: Dict[str, Decorator], prefix: str = "decoratepy", buckets: Optional[List[float]] = None):
+        if not isinstance(decorators, dict):
+            raise TypeError("Parameter decorators is not a dictionary.")
+        for name, decorator in decorators.items():
+            if not isinstance(name, str):
+                raise TypeError("The names of the decorators must be strings.")
+            if not isinstance(decorator, Decorator):
+                raise TypeError("The decorators must be instances of the `Decorator` class.")
+            if type(decorator)._snapshot_totals is Decorator._snapshot_totals:
+                raise TypeError(f"The decorator `{name}` has no totals to export (export the components of a Composite).")
+        if not isinstance(prefix, str):
+            raise TypeError("Parameter prefix is not a string.")
+        if buckets is None:
+            buckets = _DEFAULT_BUCKETS
+        if not isinstance(buckets, (list, tuple)) or not all(isinstance(bound, (int, float)) and not isinstance(bound, bool) for bound in buckets):
+            raise TypeError("Parameter buckets is not a list of numbers.")
+        if any(low >= high for low, high in zip(buckets, buckets[1:])):
+            raise ValueError("Parameter buckets must be in increasing order.")
+        self._decorators = dict(decorators)
+        self._prefix = prefix
+        self._buckets = [float(bound) for bound in buckets]
+        self._limits = [int(bound * 1e9) for bound in self._buckets] # in ns
+        self._labels = [f"le=\"{bound!r}\"" for bound in self._buckets] + ["le=\"+Inf\""]
+
+    def iter_lines(self) -> Iterator[str]:
+        """
+        Yields the lines of the OpenMetrics exposition, ended by ``# EOF``.
+        """
+        prefix = self._prefix
+        # The snapshots are taken first, so a failing decorator raises before the first line.
+        snapshots = [(f"decorator=\"{_escape(name)}\"", decorator, decorator.snapshot(measurements=isinstance(decorator, TimerCounter))) for name, decorator in self._decorators.items()]
+        totals = [(label, decorator, snapshot.totals) for label, decorator, snapshot in snapshots]
+        yield f"# TYPE {prefix}_calls counter\n# HELP {prefix}_calls Number of calls of the decorated functions.\n"
+        for label, _, functions in totals:
+            for func_name, (calls, _) in functions.items():
+                yield f"{prefix}_calls_total{{{label},function=\"{_escape(func_name)}\"}} {calls}\n"
+        yield f"# TYPE {prefix}_runtime_seconds counter\n# HELP {prefix}_runtime_seconds Cumulative runtime of the decorated functions.\n"
+        for label, decorator, functions in totals:
+            if not decorator._measures_runtime:
+                continue
+            for func_name, (_, runtime) in functions.items():
+                yield f"{prefix}_runtime_seconds_total{{{label},function=\"{_escape(func_name)}\"}} {float(runtime)!r}\n"
+        yield f"# TYPE {prefix}_call_duration_seconds histogram\n# HELP {prefix}_call_duration_seconds Distribution of the runtimes of the decorated functions.\n"
+        for label, decorator, snapshot in snapshots:
+            if not isinstance(decorator, TimerCounter):
+                continue
+            for func_name, histogram in snapshot.data.items():
+                labels = f"{label},function=\"{_escape(func_name)}\""
+                counts = histogram.cumulative_counts(self._limits) + [histogram.count]
+                for bound, count in zip(self._labels, counts):
+                    yield f"{prefix}_call_duration_seconds_bucket{{{labels},{bound}}} {count}\n"
+                yield f"{prefix}_call_duration_seconds_count{{{labels}}} {histogram.count}\n"
+                yield f"{prefix}_call_duration_seconds_sum{{{labels}}} {histogram.total / 1e9!r}\n"
+        yield "# EOF\n"
+
+    def render(self) -> str:
+        """
+        Returns the OpenMetrics exposition.
+        """
+        return "".join(self.iter_lines())
+
+    def serve(self, port: int = 0, host: str = "127.0.0.1") -> "MetricsServer":
+        """
+        Starts a background HTTP server serving the exposition at ``/metrics``.
+
+        Parameters
+        ----------
+            port: int, optional
+                The port of the server. Default is 0 (a free port, see `MetricsServer.port`).
+
+            host: str, optional
+                The address of the server. Default is "127.0.0.1" (local connections only).
+
+        Returns
+        -------
+            server: MetricsServer
+                The running server.
+        """
+        return MetricsServer(self, port, host)
+
+class MetricsServer(object):
+    """
+    Background HTTP server thread serving the exposition of an `OpenMetricsExporter` at ``/metrics``, created by `OpenMetricsExporter.serve`.
+
+    Each scrape is rendered when it is requested, in a thread of the server, then sent with its length.
+    If the rendering fails, the server answers with the status 500.
+
+    Parameters
+    ----------
+        exporter: OpenMetricsExporter
+            The exporter rendering the exposition.
+
+        port: int, optional
+            The port of the server. Default is 0 (a free port).
+
+        host: str, optional
+            The address of the server. Default is "127.0.0.1".
+
+    Raises
+    ------
+        TypeError: If a parameter has a wrong type.
+        OSError: If the port is not available.
+    """
+
+    def __init__(self, exporter: OpenMetricsExporter, port: int = 0, host: str = "127.0.0.1"):
+        if not isinstance(exporter, OpenMetricsExporter):
+            raise TypeError("Parameter exporter is not an OpenMetricsExporter.")
+        if not isinstance(port, int) or isinstance(port, bool):
+            raise TypeError("Parameter port is not an integer.")
+        if not isinstance(host, str):
+            raise TypeError("Parameter host is not a string.")
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                # The exposition is rendered before the status, so a failing scrape is an error 500 and not a truncated exposition.
+                try:
+                    body = exporter.render().encode("utf-8")
+                except Exception:
+                    self.send_error(500)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", _CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass # no output on the standard error for each scrape
+
+        self._server = http.server.ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="decoratepy-metrics", daemon=True)
+        self._thread.start()
+
+    @property
+    def port(self) -> int:
+        """
+        Returns the port of the server.
+        """
+        return self._server.server_address[1]
+
+    @property
+    def url(self) -> str:
+        """
+        Returns the URL of the exposition.
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def is_running(self) -> bool:
+        """
+        Returns True until the server is stopped.
+        """
+        return self._thread.is_alive()
+
+    def stop(self) -> None:
+        """
+        Stops the server and closes its socket.
+        """
+        if not self._thread.is_alive():
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> "MetricsServer":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def __repr__(self) -> str:
+        return f"MetricsServer({self.url}, running={self.is_running()})"
@@ -0,0 +1,62 @@
+import datetime
+from typing import Iterable, Iterator
+
+def _local_date(nanoseconds: int) -> datetime.datetime:
+    """
+    Converts a time since the epoch in nanoseconds into a local date, rounded to the microsecond with integer arithmetic
+    so that the conversion of a record date back into a timestamp (`LogView.filter`) is exact.
+    """
+    second, microsecond = divmod((nanoseconds + 500) // 1000, 1000000)
+    return datetime.datetime.fromtimestamp(second).replace(microsecond=microsecond)
+
+def _format_runtime(seconds: float) -> str:
+    """
+    Returns the runtime in the format ``{hours}h {minutes}m {seconds}s``.
+    """
+    if seconds < 60:
+        # Same result as the conversion below, without the divisions.
+        return f"0h 0m {seconds:.4f}s"
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{int(hours)}h {int(minutes)}m {seconds:.4f}s"
+
+class _DateFormatter(object):
+    """
+    Converts timestamps in nanoseconds into the string of the corresponding local dates (``str(datetime)``).
+
+    The dates of consecutive records usually share the same second, so the conversion of the second is reused
+    and only the microseconds are formatted for each record.
+
+    Parameters
+    ----------
+        epoch: int
+            The offset in nanoseconds from the timestamps to the time since the epoch.
+    """
+
+    def __init__(self, epoch: int):
+        self._epoch = epoch
+        self._second = None
+        self._prefix = None
+
+    def __call__(self, timestamp: int) -> str:
+        # Same rounding as _local_date.
+        second, microsecond = divmod((timestamp + self._epoch + 500) // 1000, 1000000)
+        if second != self._second:
+            self._second = second
+            self._prefix = str(datetime.datetime.fromtimestamp(second))
+        if microsecond == 0:
+            return self._prefix
+        return f"{self._prefix}.{microsecond:06d}"
+
+def _chunks(lines: Iterable[str], chunk_size: int) -> Iterator[str]:
+    """
+    Groups the lines into strings of ``chunk_size`` lines.
+    """
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
@@ -0,0 +1,409 @@
+import asyncio
+import inspect
+import threading
+from typing import Dict, Tuple
+from .decorator import Decorator
+from .memoize import _make_key
+
+class _Flight(object):
+    """
+    Execution of a call shared by the concurrent calls with the same arguments in threads.
+    """
+
+    __slots__ = ("leader", "done", "value", "error")
+
+    def __init__(self):
+        self.leader = threading.get_ident() # thread running the call
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+class SingleFlight(Decorator):
+    """
+    Coalesce the concurrent calls of various functions with the same arguments into a single execution.
+
+    .. note::
+        Each decorated function is reported under its '__name__' attribute. If another decorated function already uses this name, the SingleFlight reports it under its '__qualname__' (then its module and '__qualname__').
+
+    While a call is running, the calls of the same function with the same arguments from other threads (or other asyncio tasks
+    of the same event loop) wait for it and get its result, or raise its exception, instead of running the function again.
+    Nothing is cached : a call starting after the end of the execution runs the function again (see `Memoize` to cache the results).
+    The calls with unhashable arguments, the calls of generator functions and the recursive calls with the same arguments
+    (in the thread or the task running the call) are not coalesced.
+    If the task running a coroutine is cancelled, the waiting tasks are cancelled too.
+
+    HELP SingleFlight
+    =================
+
+    Create a single flight decorator with :
+
+    .. code-block:: python
+
+        singleflight = SingleFlight()
+
+    Then decorate functions with the single flight decorator.
+
+    .. code-block:: python
+
+        @singleflight
+        def fetch(key):
+            return backend.get(key)
+
+    Initialize the statistics with :
+
+    .. code-block:: python
+
+        singleflight.initialize()
+
+    To run every call (no coalescing) and coalesce the calls again, use :
+
+    .. code-block:: python
+
+        singleflight.set_deactivated()
+        singleflight.set_activated()
+
+    Print the statistics with :
+
+    .. code-block:: python
+
+        print(singleflight.name_repr) # equivalent of print(singleflight)
+
+    The result will be :
+
+    .. code-block:: console
+
+        SingleFlight(
+        [{func_name}] number of calls : {Ncalls} - executions : {executions} - coalesced : {coalesced}
+        [{func_name}] number of calls : {Ncalls} - executions : {executions} - coalesced : {coalesced}
+        -----------
+        total number of calls : {total_runcall}
+        coalescing ratio : {coalescing_ratio}%
+        )
+    """
+
+    __help__ = """
+HELP SingleFlight
+=================
+
+Create a single flight decorator with :
+
+.. code-block:: python
+
+    singleflight = SingleFlight()
+
+Then decorate functions with the single flight decorator.
+
+.. code-block:: python
+
+    @singleflight
+    def fetch(key):
+        return backend.get(key)
+
+Initialize the statistics with :
+
+.. code-block:: python
+
+    singleflight.initialize()
+
+To run every call (no coalescing) and coalesce the calls again, use :
+
+.. code-block:: python
+
+    singleflight.set_deactivated()
+    singleflight.set_activated()
+
+Print the statistics with :
+
+.. code-block:: python
+
+    print(singleflight.name_repr) # equivalent of print(singleflight)
+
+The result will be :
+
+.. code-block:: console
+
+    SingleFlight(
+    [{func_name}] number of calls : {Ncalls} - executions : {executions} - coalesced : {coalesced}
+    [{func_name}] number of calls : {Ncalls} - executions : {executions} - coalesced : {coalesced}
+    -----------
+    total number of calls : {total_runcall}
+    coalescing ratio : {coalescing_ratio}%
+    )
+"""
+
+    _supports_sampling = False
+    _measures_runtime = False
+
+    def __init__(self, **kwargs):
+        """
+        Parameters
+        ----------
+            kwargs:
+                The options of `Decorator` (hotswap). The calls are always coalesced under a lock, whatever the threadsafe option.
+                The sampling and call tree modes are not supported.
+
+        Raises
+        ------
+            ValueError: If the sampling or call tree mode is requested.
+        """
+        super().__init__(**kwargs)
+        self._lock = threading.Lock()
+        self._flights = {} # key: (int, object) = (slot, key of the arguments) // value: _Flight = running call
+        self._tasks = {} # key: (event loop, int, object) = (loop, slot, key of the arguments) // value: (asyncio.Future, asyncio.Task) = running coroutine and its task
+        self.initialize()
+
+    def initialize(self) -> None:
+        """
+        Sets the statistics to 0 for each functions.
+        """
+        self._executions = [0] * len(self._names) # index: int = slot // value: int = number of executions of the function
+        self._coalesced = [0] * len(self._names) # index: int = slot // value: int = number of calls waiting for another execution
+        self._reset_shards()
+
+    def _add_slot(self) -> None:
+        """
+        Adds the statistics of a new decorated function.
+        """
+        self._executions.append(0)
+        self._coalesced.append(0)
+
+    def _execute(self, slot: int, func, args: tuple, kwargs: dict):
+        """
+        Runs the call, or waits for the running call with the same arguments.
+        """
+        try:
+            key = (slot, _make_key(args, kwargs, True))
+        except TypeError:
+            with self._lock:
+                self._executions[slot] += 1
+            return func(*args, **kwargs)
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None and flight.leader == threading.get_ident():
+                # A recursive call with the same arguments would wait for itself.
+                self._executions[slot] += 1
+                leader = None
+            elif flight is None:
+                flight = self._flights[key] = _Flight()
+                self._executions[slot] += 1
+                leader = True
+            else:
+                self._coalesced[slot] += 1
+                leader = False
+        if leader is None:
+            return func(*args, **kwargs)
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            flight.value = func(*args, **kwargs)
+            return flight.value
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def _async_execute(self, slot: int, func, args: tuple, kwargs: dict):
+        """
+        Awaits the coroutine, or the running coroutine with the same arguments in the same event loop.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            key = (loop, slot, _make_key(args, kwargs, True))
+        except TypeError:
+            with self._lock:
+                self._executions[slot] += 1
+            return await func(*args, **kwargs)
+        task = asyncio.current_task()
+        with self._lock:
+            future, owner = self._tasks.get(key, (None, None))
+            if future is not None and owner is task:
+                # A recursive call with the same arguments would wait for itself.
+                self._executions[slot] += 1
+                leader = None
+            elif future is None:
+                future = loop.create_future()
+                self._tasks[key] = (future, task)
+                self._executions[slot] += 1
+                leader = True
+            else:
+                self._coalesced[slot] += 1
+                leader = False
+        if leader is None:
+            return await func(*args, **kwargs)
+        if not leader:
+            # A cancelled waiter does not cancel the shared execution.
+            return await asyncio.shield(future)
+        try:
+            value = await func(*args, **kwargs)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            future.exception() # the exception is retrieved even without waiter
+            raise
+        finally:
+            with self._lock:
+                del self._tasks[key]
+
+    def __call__(self, func):
+        """
+        Decorates the given function with the coalescing of the concurrent calls.
+
+        Parameters
+        ----------
+            func: callable
+                The function to decorate.
+
+        Returns
+        -------
+            wrapped: callable
+                The decorated function.
+        """
+        slot = self._register(func)
+        original = inspect.unwrap(func)
+        if inspect.isgeneratorfunction(original) or inspect.isasyncgenfunction(original):
+            def wrapped(*args, **kwargs):
+                if self._activated:
+                    with self._lock:
+                        self._executions[slot] += 1
+                return func(*args, **kwargs)
+        elif inspect.iscoroutinefunction(original):
+            async def wrapped(*args, **kwargs):
+                if not self._activated:
+                    return await func(*args, **kwargs)
+                return await self._async_execute(slot, func, args, kwargs)
+        else:
+            def wrapped(*args, **kwargs):
+                if not self._activated:
+                    return func(*args, **kwargs)
+                return self._execute(slot, func, args, kwargs)
+        return self._install(wrapped, func)
+
+    def executions(self, func_name: str) -> int:
+        """
+        Returns the number of executions of the given function.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        return self._slot_value(self._executions, func_name)
+
+    def coalesced(self, func_name: str) -> int:
+        """
+        Returns the number of calls of the given function which got the result of another execution.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        return self._slot_value(self._coalesced, func_name)
+
+    def number_calls(self, func_name: str) -> int:
+        """
+        Returns the number of calls of the given function while the decorator was activated.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        return self.executions(func_name) + self.coalesced(func_name)
+
+    @property
+    def total_runcall(self) -> int:
+        """
+        Returns the total runcall while the decorator was activated.
+        """
+        with self._lock:
+            return sum(self._executions) + sum(self._coalesced)
+
+    @property
+    def coalescing_ratio(self) -> float:
+        """
+        Returns the ratio of the calls which got the result of another execution (0 if there was no call).
+        """
+        with self._lock:
+            coalesced, calls = sum(self._coalesced), sum(self._executions) + sum(self._coalesced)
+        return coalesced / calls if calls else 0.0
+
+    def _statistics(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Returns the executions and the coalesced calls of each called function.
+        """
+        with self._lock:
+            return {func_name: (self._executions[slot], self._coalesced[slot]) for slot, func_name in enumerate(list(self._names)) if self._executions[slot] or self._coalesced[slot]}
+
+    def _snapshot_data(self) -> dict:
+        """
+        Returns the executions and the coalesced calls of each called function.
+        """
+        return self._statistics()
+
+    def _merge_data(self, data: dict) -> None:
+        """
+        Adds the executions and the coalesced calls of each function of a snapshot.
+        """
+        slots = {func_name: self._named_slot(func_name) for func_name in data.keys()}
+        with self._lock:
+            for func_name, (executions, coalesced) in data.items():
+                self._executions[slots[func_name]] += executions
+                self._coalesced[slots[func_name]] += coalesced
+
+    def _snapshot_totals(self) -> Tuple[list, list]:
+        """
+        Returns the number of calls of each slot, without runtime.
+        """
+        with self._lock:
+            return [executions + coalesced for executions, coalesced in zip(self._executions, self._coalesced)], [0] * len(self._executions)
+
+    def _reset_data(self) -> None:
+        """
+        Sets the statistics of each slot to 0.
+        """
+        with self._lock:
+            for counts in (self._executions, self._coalesced):
+                for slot in range(len(counts)):
+                    counts[slot] = 0
+
+    def __repr__(self) -> str:
+        """
+        Returns the string representation.
+        Default = self.name_repr
+        """
+        return self.name_repr
+
+    def get_help(self) -> str:
+        """
+        Returns the documentation 'How to Use' of the decorator
+        """
+        return self.__help__
+
+    @property
+    def name_repr(self) -> str:
+        """
+        Returns the string representation in the following format:
+
+        .. code-block:: console
+
+            SingleFlight(
+            [{func_name}] number of calls : {Ncalls} - executions : {executions} - coalesced : {coalesced}
+            [{func_name}] number of calls : {Ncalls} - executions : {executions} - coalesced : {coalesced}
+            -----------
+            total number of calls : {total_runcall}
+            coalescing ratio : {coalescing_ratio}%
+            )
+        """
+        string = "SingleFlight(\n"
+        for func_name, (executions, coalesced) in self._statistics().items():
+            string += f"[{func_name}] number of calls : {executions + coalesced} - executions : {executions} - coalesced : {coalesced}\n"
+        string += f"-----------\ntotal number of calls : {self.total_runcall}\ncoalescing ratio : {100 * self.coalescing_ratio:.1f}%\n)"
+        return string
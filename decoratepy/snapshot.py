@@ -0,0 +1,149 @@
+import os
+from typing import Dict, Optional, Tuple
+
+class Snapshot(object):
+    """
+    Picklable copy of the measurements of a decorator.
+
+    A snapshot is taken with `Decorator.snapshot` and added to another decorator of the same type with `Decorator.merge`.
+    It can be sent between processes, so the measurements of worker processes can be gathered into the decorator of the parent process
+    without any communication during the calls.
+
+    The snapshot also holds the number of calls and the runtime of each function, and `delta` returns their changes since a previous snapshot.
+
+    Parameters
+    ----------
+        kind: str
+            The name of the class of the decorator.
+
+        data: object
+            The measurements, in the format of the decorator, or None if the snapshot only holds the totals.
+
+        skipped: dict
+            The number of calls not measured in sampling mode of each function.
+
+        totals: dict, optional
+            The number of calls and the runtime in seconds of each function (estimated in sampling mode).
+            Default is None (no function).
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        timercounter = TimerCounter()
+
+        @timercounter
+        def func_name():
+            pass
+
+        def task(n):
+            for _ in range(n):
+                func_name()
+            snapshot = timercounter.snapshot()
+            timercounter.initialize() # the next snapshot of the worker only contains the new calls
+            return snapshot
+
+        with ProcessPoolExecutor() as executor:
+            for snapshot in executor.map(task, [1000] * 8):
+                timercounter.merge(snapshot)
+
+    Scraping the call rates periodically:
+
+    .. code-block:: python
+
+        previous = timercounter.snapshot(measurements=False)
+        while True:
+            time.sleep(5)
+            current = timercounter.snapshot(measurements=False)
+            for func_name, (calls, runtime) in current.delta(previous).items():
+                print(func_name, calls / 5, "calls/s", runtime / 5, "s/s")
+            previous = current
+    """
+
+    def __init__(self, kind: str, data: object, skipped: Dict[str, int], totals: Optional[Dict[str, Tuple[int, float]]] = None):
+        if not isinstance(kind, str):
+            raise TypeError("Parameter kind is not a string.")
+        if not isinstance(skipped, dict):
+            raise TypeError("Parameter skipped is not a dictionary.")
+        if totals is not None and not isinstance(totals, dict):
+            raise TypeError("Parameter totals is not a dictionary.")
+        self._kind = kind
+        self._data = data
+        self._skipped = skipped
+        self._totals = {} if totals is None else totals
+        self._pid = os.getpid()
+
+    @property
+    def kind(self) -> str:
+        """
+        Returns the name of the class of the decorator.
+        """
+        return self._kind
+
+    @property
+    def data(self) -> object:
+        """
+        Returns the measurements, in the format of the decorator.
+        """
+        return self._data
+
+    @property
+    def skipped(self) -> Dict[str, int]:
+        """
+        Returns the number of calls not measured in sampling mode of each function.
+        """
+        return self._skipped
+
+    @property
+    def totals(self) -> Dict[str, Tuple[int, float]]:
+        """
+        Returns the number of calls and the runtime in seconds of each function (the runtime is 0 for a `Counter`).
+        """
+        return self._totals
+
+    def delta(self, since: Optional["Snapshot"] = None) -> Dict[str, Tuple[int, float]]:
+        """
+        Returns the changes of the number of calls and of the runtime of each function since a previous snapshot.
+
+        The functions without new calls are omitted. The changes are negative if the decorator was reset between the snapshots
+        (use ``snapshot(reset=True)`` to read the changes directly).
+
+        Parameters
+        ----------
+            since: Snapshot, optional
+                A previous snapshot of the same decorator. Default is None (changes since the start).
+
+        Returns
+        -------
+            delta: dict
+                key: str = function name // value: tuple = (number of new calls, runtime of the new calls in seconds)
+
+        Raises
+        ------
+            TypeError: If since is not a Snapshot.
+            ValueError: If since was taken from a decorator of another type.
+        """
+        if since is None:
+            return {func_name: total for func_name, total in self._totals.items() if total[0]}
+        if not isinstance(since, Snapshot):
+            raise TypeError("Parameter since is not a Snapshot.")
+        if since.kind != self._kind:
+            raise ValueError(f"The snapshot was taken from a {since.kind}, not a {self._kind}.")
+        delta = {}
+        for func_name in list(self._totals) + [func_name for func_name in since.totals if func_name not in self._totals]:
+            calls, runtime = self._totals.get(func_name, (0, 0.0))
+            previous_calls, previous_runtime = since.totals.get(func_name, (0, 0.0))
+            if calls != previous_calls:
+                delta[func_name] = (calls - previous_calls, runtime - previous_runtime)
+        return delta
+
+    @property
+    def pid(self) -> int:
+        """
+        Returns the identifier of the process which took the snapshot.
+        """
+        return self._pid
+
+    def __repr__(self) -> str:
+        return f"Snapshot({self._kind}, pid={self._pid})"
@@ -1,12 +1,13 @@
-import time 
-from .decorator import Decorator
+import threading
+from typing import Tuple
+from .decorator import Decorator, _sum_lists
 
 class Timer(Decorator):
     """
     Compute the runtime of various functions. 
 
-    .. warning::
-        If 2 functions/methods have the same '__name__' attribute, the Timer will combined the two runtimes. 
+    .. note::
+        Each decorated function is reported under its '__name__' attribute. If another decorated function already uses this name, the Timer reports it under its '__qualname__' (then its module and '__qualname__').
 
     HELP Timer
     ============
@@ -113,22 +114,108 @@ The result will be :
     )
 """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **kwargs):
+        """
+        Parameters
+        ----------
+            kwargs:
+                The options of `Decorator` (threadsafe, hotswap, clock, sampling, calltree).
+        """
+        super().__init__(**kwargs)
         self.initialize()
 
     @property
     def total_runtime(self) -> float:
         """
         Returns the total runtime in seconds.
+        In call tree mode, the runtime of the nested calls is counted once.
         """
-        return sum(self._timer[func_name] for func_name in self._timer.keys())
+        if self._calltree:
+            return self._merged_tree().total_runtime() / 1e9
+        timer = self._merged_timer()
+        return sum(timer[func_name] for func_name in timer.keys()) / 1e9
 
     def initialize(self) -> None:
         """
         Sets the timer to 0 for each functions.
         """
-        self._timer = {} # key: str = function name // value: float = runtime
+        self._timer = [0] * len(self._names) # index: int = slot // value: int = runtime in ns
+        self._calls = [0] * len(self._names) # index: int = slot // value: int = number of call
+        self._reset_shards()
+
+    def _add_slot(self) -> None:
+        """
+        Adds a timer for a new decorated function.
+        """
+        self._timer.append(0)
+        self._calls.append(0)
+        for _, timer, calls in self._shards:
+            timer.append(0)
+            calls.append(0)
+
+    def _new_shard(self) -> tuple:
+        """
+        Returns a lock and an empty timer for a new thread.
+        """
+        return (threading.RLock(), [0] * len(self._names), [0] * len(self._names))
+
+    def _measured_timer(self) -> Tuple[list, list]:
+        """
+        Returns the runtime in ns and the number of measured calls of each slot, merging the per-thread shards in threadsafe mode.
+        """
+        if self._threadsafe:
+            with self._locked_shards() as shards:
+                size = len(self._names)
+                return _sum_lists([shard[1] for shard in shards], size), _sum_lists([shard[2] for shard in shards], size)
+        return list(self._timer), list(self._calls)
+
+    def _snapshot_totals(self) -> Tuple[list, list]:
+        """
+        Returns the number of measured calls and their runtime in ns of each slot.
+        """
+        timer, calls = self._measured_timer()
+        return calls, timer
+
+    def _reset_data(self) -> None:
+        """
+        Sets the timer of each slot to 0.
+        """
+        for _, timer, calls in [(None, self._timer, self._calls)] + self._shards:
+            for slot in range(len(timer)):
+                timer[slot] = 0
+                calls[slot] = 0
+
+    def _merged_timer(self) -> dict:
+        """
+        Returns the runtime of each called function, merging the per-thread shards in threadsafe mode.
+        In sampling mode, the runtimes are extrapolated to the calls not measured.
+        """
+        timer, calls = self._measured_timer()
+        skipped = self._sampling_counters()[1]
+        return {self._names[slot]: self._estimated(slot, count, runtime, skipped) for slot, (runtime, count) in enumerate(zip(timer, calls)) if count}
+
+    def _snapshot_data(self) -> dict:
+        """
+        Returns the runtime in ns and the number of measured calls of each called function.
+        """
+        timer, calls = self._measured_timer()
+        return {self._names[slot]: (runtime, count) for slot, (runtime, count) in enumerate(zip(timer, calls)) if count}
+
+    def _merge_data(self, data: dict) -> None:
+        """
+        Adds the runtime and the number of calls of each function of a snapshot.
+        """
+        slots = {func_name: self._named_slot(func_name) for func_name in data.keys()}
+        if self._threadsafe:
+            lock, timer, calls = self._local_shard()
+            with lock:
+                for func_name, (runtime, count) in data.items():
+                    timer[slots[func_name]] += runtime
+                    calls[slots[func_name]] += count
+        else:
+            for func_name, (runtime, count) in data.items():
+                self._timer[slots[func_name]] += runtime
+                self._calls[slots[func_name]] += count
 
     def __repr__(self) -> str:
         """
@@ -137,20 +224,18 @@ The result will be :
         """
         return self.name_repr
 
-    def _wrapper(self, func, *args, **kwargs):
+    def _record(self, slot: int, start: int, runtime: int) -> None:
         """
-        Runs the function with runtime measurement.
+        Adds the runtime of a call of the function of the given slot.
         """
-        # Adding the name into the dictionnary.
-        if func.__name__ not in self._timer.keys():
-            self._timer[func.__name__] = 0
-        # Runtime measurement.
-        tic = time.time()
-        outputs = func(*args, **kwargs)
-        toc = time.time()
-        self._timer[func.__name__] += toc - tic
-        # Return outputs of func.
-        return outputs
+        if self._threadsafe:
+            lock, timer, calls = self._local_shard()
+            with lock:
+                timer[slot] += runtime
+                calls[slot] += 1
+        else:
+            self._timer[slot] += runtime
+            self._calls[slot] += 1
 
     def get_help(self) -> str:
         """
@@ -174,10 +259,11 @@ The result will be :
             total runtime : {total_runtime_hours}h {total_runtime_minutes}m {total_runtime_seconds}s
             )
         """
+        timer = self._merged_timer()
         string = "Timer(\n"
-        for func_name in self._timer.keys():
+        for func_name in timer.keys():
             # Conversion in hours, minutes, seconds.
-            hours, remainder = divmod(self._timer[func_name], 3600)
+            hours, remainder = divmod(timer[func_name] / 1e9, 3600)
             minutes, seconds = divmod(remainder, 60)
             string += f"[{func_name}] cumulative runtime : {int(hours)}h {int(minutes)}m {seconds:.4f}s\n"
         # Adding total runtime.
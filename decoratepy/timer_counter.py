@@ -1,12 +1,15 @@
-import time 
+import math
+import threading
+from typing import Dict, Tuple
 from .decorator import Decorator
+from .histogram import Histogram
 
 class TimerCounter(Decorator):
     """
     Compute the number of call and runtime of various functions. 
 
-    .. warning::
-        If 2 functions/methods have the same '__name__' attribute, the TimerCounter will combined the two runtimes. 
+    .. note::
+        Each decorated function is reported under its '__name__' attribute. If another decorated function already uses this name, the TimerCounter reports it under its '__qualname__' (then its module and '__qualname__').
     
     HELP TimerCounter
     =================
@@ -40,6 +43,14 @@ class TimerCounter(Decorator):
         timercounter.set_activated()
         timercounter.set_deactivated()
 
+    Query the distribution of the runtimes of a function (in seconds) with :
+
+    .. code-block:: python
+
+        timercounter.percentile("func_name", 99)
+        timercounter.mean_runtime("func_name")
+        timercounter.std_runtime("func_name")
+
     Print the number of calls and runtimes with :
     
     .. code-block:: python
@@ -94,6 +105,14 @@ To deactivate and re-activate the timer-counter, use :
     timercounter.set_activated()
     timercounter.set_deactivated()
 
+Query the distribution of the runtimes of a function (in seconds) with :
+
+.. code-block:: python
+
+    timercounter.percentile("func_name", 99)
+    timercounter.mean_runtime("func_name")
+    timercounter.std_runtime("func_name")
+
 Print the number of calls and runtimes with :
 
 .. code-block:: python
@@ -115,30 +134,282 @@ The result will be :
     )
 """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **kwargs):
+        """
+        Parameters
+        ----------
+            kwargs:
+                The options of `Decorator` (threadsafe, hotswap, clock, sampling, calltree).
+        """
+        super().__init__(**kwargs)
         self.initialize()
 
     @property
     def total_runtime(self) -> float:
         """
         Returns the total runtime in seconds.
+        In call tree mode, the runtime of the nested calls is counted once.
         """
-        return sum(self._timer[func_name] for func_name in self._timer.keys())
+        if self._calltree:
+            return self._merged_tree().total_runtime() / 1e9
+        histograms = self._merged_histograms()
+        skipped = self._sampling_counters()[1]
+        return sum(self._estimated(self._labels[func_name], histogram.count, histogram.total, skipped) for func_name, histogram in histograms.items()) / 1e9
 
     @property
     def total_runcall(self) -> int:
         """
         Returns the total runcall.
         """
-        return sum(self._counter[func_name] for func_name in self._counter.keys())
+        histograms = self._merged_histograms()
+        return sum(histogram.count for histogram in histograms.values()) + sum(self._sampling_counters()[1])
 
     def initialize(self) -> None:
         """
         Sets the timer and the counter to 0 for each functions.
         """
-        self._timer = {} # key: str = function name // value: float = runtime
-        self._counter = {} # key: str = function name // value: int = number of call
+        self._histograms = [Histogram() for _ in self._names] # index: int = slot // value: Histogram = runtimes in ns
+        self._reset_shards()
+
+    def _add_slot(self) -> None:
+        """
+        Adds a histogram for a new decorated function.
+        """
+        self._histograms.append(Histogram())
+        for _, histograms in self._shards:
+            histograms.append(Histogram())
+
+    def _new_shard(self) -> tuple:
+        """
+        Returns a lock and empty histograms for a new thread.
+        """
+        return (threading.RLock(), [Histogram() for _ in self._names])
+
+    def _slot_histogram(self, slot: int) -> Histogram:
+        """
+        Returns the histogram of the given slot, merging the per-thread shards in threadsafe mode.
+        """
+        if not self._threadsafe:
+            return self._histograms[slot]
+        merged = Histogram()
+        with self._locked_shards() as shards:
+            for _, histograms in shards:
+                merged.merge(histograms[slot])
+        return merged
+
+    def _merged_histograms(self) -> Dict[str, Histogram]:
+        """
+        Returns the histogram of each called function, merging the per-thread shards in threadsafe mode.
+        In sampling mode, the histograms only contain the measured calls.
+        """
+        histograms = {}
+        with self._locked_shards():
+            skipped = self._sampling_counters()[1]
+            for slot, func_name in enumerate(list(self._names)):
+                histogram = self._slot_histogram(slot)
+                if histogram.count or skipped[slot]:
+                    histograms[func_name] = histogram
+        return histograms
+
+    def _histogram(self, func_name: str) -> Histogram:
+        """
+        Returns the histogram of the given function (empty if the function was never called).
+        """
+        slot = self._slot(func_name)
+        if slot is None:
+            return Histogram()
+        return self._slot_histogram(slot)
+
+    def get_histogram(self, func_name: str) -> Histogram:
+        """
+        Returns a copy of the histogram of the runtimes in nanoseconds of the given function.
+
+        The histograms can be merged, for example to combine the results of several processes.
+
+        Parameters
+        ----------
+            func_name: str 
+                The name of the function.
+
+        Returns
+        -------
+            histogram: Histogram
+                The histogram of the runtimes in nanoseconds.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        return self._histogram(func_name).copy()
+
+    def _skipped(self, func_name: str) -> int:
+        """
+        Returns the number of calls of the given function not measured by the sampling.
+        """
+        return self._skipped_calls(self._slot(func_name))
+
+    def number_calls(self, func_name: str) -> int:
+        """
+        Returns the number of calls of the given function (including the calls not measured in sampling mode).
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        return self._histogram(func_name).count + self._skipped(func_name)
+
+    def cumul_runtime(self, func_name: str) -> float:
+        """
+        Returns the cumulative runtime of the given function in seconds.
+        In sampling mode, the runtime is estimated from the measured calls (see `runtime_error`).
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        histogram = self._histogram(func_name)
+        skipped = self._skipped(func_name)
+        if histogram.count == 0:
+            return 0.0
+        return histogram.total * (histogram.count + skipped) / histogram.count / 1e9
+
+    def runtime_error(self, func_name: str) -> float:
+        """
+        Returns the error bound of the cumulative runtime of the given function estimated in sampling mode.
+
+        The bound is the half-width of the 95% confidence interval of the estimation, computed from the standard deviation
+        of the measured runtimes and the fraction of measured calls. It is 0 if every call was measured.
+
+        Parameters
+        ----------
+            func_name: str 
+                The name of the function.
+
+        Returns
+        -------
+            error: float
+                The error bound in seconds.
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        histogram = self._histogram(func_name)
+        measured = histogram.count
+        calls = measured + self._skipped(func_name)
+        if measured < 2 or calls == measured:
+            return 0.0
+        # Standard error of an estimated total, with the finite population correction.
+        deviation = histogram.stddev * math.sqrt(measured / (measured - 1))
+        return 1.96 * calls * deviation / math.sqrt(measured) * math.sqrt(1 - measured / calls) / 1e9
+
+    def min_runtime(self, func_name: str) -> float:
+        """
+        Returns the minimal runtime of the given function in seconds (0 if the function was never called).
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        return (self._histogram(func_name).min or 0) / 1e9
+
+    def max_runtime(self, func_name: str) -> float:
+        """
+        Returns the maximal runtime of the given function in seconds (0 if the function was never called).
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        return (self._histogram(func_name).max or 0) / 1e9
+
+    def mean_runtime(self, func_name: str) -> float:
+        """
+        Returns the mean runtime of the given function in seconds (0 if the function was never called).
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        return self._histogram(func_name).mean / 1e9
+
+    def std_runtime(self, func_name: str) -> float:
+        """
+        Returns the standard deviation of the runtimes of the given function in seconds (0 if the function was never called).
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        return self._histogram(func_name).stddev / 1e9
+
+    def percentile(self, func_name: str, q: float) -> float:
+        """
+        Returns an estimation of a percentile of the runtimes of the given function.
+
+        The estimation comes from a log-linear histogram (see `Histogram`), its relative error is lower than 1.6%.
+
+        Parameters
+        ----------
+            func_name: str 
+                The name of the function.
+
+            q: float
+                The percentile between 0 and 100 (50 for the median, 99 for the tail latency).
+
+        Returns
+        -------
+            runtime: float
+                The percentile of the runtimes in seconds (0 if the function was never called).
+
+        Raises
+        ------
+            TypeError: If the function name is not a string or q is not a number.
+            ValueError: If q is not between 0 and 100.
+        """
+        return self._histogram(func_name).percentile(q) / 1e9
+
+    def _snapshot_data(self) -> Dict[str, Histogram]:
+        """
+        Returns a copy of the histogram of each called function.
+        """
+        return {func_name: histogram.copy() for func_name, histogram in self._merged_histograms().items() if histogram.count}
+
+    def _merge_data(self, data: Dict[str, Histogram]) -> None:
+        """
+        Adds the histogram of each function of a snapshot.
+        """
+        slots = {func_name: self._named_slot(func_name) for func_name in data.keys()}
+        if self._threadsafe:
+            lock, histograms = self._local_shard()
+            with lock:
+                for func_name, histogram in data.items():
+                    histograms[slots[func_name]].merge(histogram)
+        else:
+            for func_name, histogram in data.items():
+                self._histograms[slots[func_name]].merge(histogram)
+
+    def _snapshot_totals(self) -> Tuple[list, list]:
+        """
+        Returns the number of measured calls and their runtime in ns of each slot, without merging the histograms.
+        """
+        with self._locked_shards() as shards:
+            all_histograms = [histograms for _, histograms in shards] if self._threadsafe else [self._histograms]
+            size = len(self._names)
+            calls, runtimes = [0] * size, [0] * size
+            for histograms in all_histograms:
+                for slot, histogram in enumerate(histograms[:size]):
+                    calls[slot] += histogram.count
+                    runtimes[slot] += histogram.total
+        return calls, runtimes
+
+    def _reset_data(self) -> None:
+        """
+        Clears the histogram of each slot.
+        """
+        for histograms in [self._histograms] + [histograms for _, histograms in self._shards]:
+            for histogram in histograms:
+                histogram.clear()
 
     def __repr__(self) -> str:
         """
@@ -147,22 +418,16 @@ The result will be :
         """
         return self.name_repr
 
-    def _wrapper(self, func, *args, **kwargs):
-        """
-        Runs the function with runtime measurement.
-        """
-        # Adding the name into the dictionnary.
-        if func.__name__ not in self._timer.keys():
-            self._timer[func.__name__] = 0
-            self._counter[func.__name__] = 0
-        # Runtime measurement.
-        tic = time.time()
-        outputs = func(*args, **kwargs)
-        toc = time.time()
-        self._timer[func.__name__] += toc - tic
-        self._counter[func.__name__] += 1 
-        # Return outputs of func.
-        return outputs
+    def _record(self, slot: int, start: int, runtime: int) -> None:
+        """
+        Adds the runtime of a call of the function of the given slot into its histogram.
+        """
+        if self._threadsafe:
+            lock, histograms = self._local_shard()
+            with lock:
+                histograms[slot].record(runtime)
+        else:
+            self._histograms[slot].record(runtime)
     
     def get_help(self) -> str:
         """
@@ -187,12 +452,15 @@ The result will be :
             total runtime : {total_runtime_hours}h {total_runtime_minutes}m {total_runtime_seconds}s
             )
         """
+        histograms = self._merged_histograms()
+        skipped = self._sampling_counters()[1]
         string = "TimerCounter(\n"
-        for func_name in self._timer.keys():
+        for func_name, histogram in histograms.items():
+            slot = self._labels[func_name]
             # Conversion in hours, minutes, seconds.
-            hours, remainder = divmod(self._timer[func_name], 3600)
+            hours, remainder = divmod(self._estimated(slot, histogram.count, histogram.total, skipped) / 1e9, 3600)
             minutes, seconds = divmod(remainder, 60)
-            string += f"[{func_name}] number of calls : {self._counter[func_name]} - cumulative runtime : {int(hours)}h {int(minutes)}m {seconds:.4f}s\n"
+            string += f"[{func_name}] number of calls : {histogram.count + skipped[slot]} - cumulative runtime : {int(hours)}h {int(minutes)}m {seconds:.4f}s\n"
         # Adding total runtime and total call number.
         hours, remainder = divmod(self.total_runtime, 3600)
         minutes, seconds = divmod(remainder, 60)
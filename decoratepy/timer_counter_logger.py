@@ -1,15 +1,19 @@
 import time 
 import datetime
-import copy
-from typing import List, Tuple
+import threading
+from typing import List, Tuple, Optional, Iterator, Union, TextIO
 from .decorator import Decorator
+from .call_log import CallLog
+from .log_view import LogView
+from .binary_log import BinaryLogSink
+from .report import _format_runtime, _DateFormatter, _chunks
 
 class TimerCounterLogger(Decorator):
     """
     Compute the number of call of various functions and the runtime each call. 
 
-    .. warning::
-        If 2 functions/methods have the same '__name__' attribute, the TimerCounterLogger will combined the two runtimes.
+    .. note::
+        Each decorated function is reported under its '__name__' attribute. If another decorated function already uses this name, the TimerCounterLogger reports it under its '__qualname__' (then its module and '__qualname__').
 
     HELP TimerCounterLogger
     =======================
@@ -43,6 +47,23 @@ class TimerCounterLogger(Decorator):
         timercounterlogger.set_activated()
         timercounterlogger.set_deactivated()
 
+    To bound the memory of the logger, keep only the last records or the recent records with :
+
+    .. code-block:: python
+
+        timercounterlogger = TimerCounterLogger(max_records=100000) # ring buffer of the last 100000 records
+        timercounterlogger = TimerCounterLogger(max_age=3600) # records of the last hour
+
+    The number of calls and the runtimes still cover every call.
+
+    To keep the records across process restarts, stream them to a binary file and query it with :
+
+    .. code-block:: python
+
+        timercounterlogger = TimerCounterLogger(sink=BinaryLogSink("calls.log"))
+        reader = BinaryLogReader("calls.log")
+        print(reader.number_calls("func_name"))
+
     Print the logs with 3 differents methods:
     
 
@@ -136,6 +157,23 @@ To deactivate and re-activate the timer-counter-logger, use :
     timercounterlogger.set_activated()
     timercounterlogger.set_deactivated()
 
+To bound the memory of the logger, keep only the last records or the recent records with :
+
+.. code-block:: python
+
+    timercounterlogger = TimerCounterLogger(max_records=100000) # ring buffer of the last 100000 records
+    timercounterlogger = TimerCounterLogger(max_age=3600) # records of the last hour
+
+The number of calls and the runtimes still cover every call.
+
+To keep the records across process restarts, stream them to a binary file and query it with :
+
+.. code-block:: python
+
+    timercounterlogger = TimerCounterLogger(sink=BinaryLogSink("calls.log"))
+    reader = BinaryLogReader("calls.log")
+    print(reader.number_calls("func_name"))
+
 Print the logs with 3 differents methods:
 
 
@@ -197,37 +235,103 @@ Method 3:
 """
 
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, max_records: Optional[int] = None, max_age: Optional[float] = None, sink: Optional[BinaryLogSink] = None, **kwargs):
+        """
+        Parameters
+        ----------
+            max_records: int, optional
+                The maximal number of retained records, stored in a preallocated ring buffer.
+                Default is None (no limit).
+
+            max_age: float, optional
+                The maximal age in seconds of the retained records.
+                Default is None (no limit).
+
+            sink: BinaryLogSink, optional
+                A binary file receiving a copy of every record, independently of the retention policy.
+                Default is None.
+
+            kwargs:
+                The options of `Decorator` (threadsafe, hotswap, clock, sampling, calltree).
+                In threadsafe mode, each thread logs its calls into its own log and the logs are merged by date when the results are read.
+                The retention policy applies to each thread and to the merged log.
+                In sampling mode, only the measured calls are logged, and the numbers of calls and runtimes include the calls not measured.
+
+        Raises
+        ------
+            TypeError: If ``max_records`` is not an integer, ``max_age`` is not a number or ``sink`` is not a `BinaryLogSink`.
+            ValueError: If ``max_records`` or ``max_age`` is not strictly positive.
+
+        .. note::
+            The aggregates (``total_runcall``, ``total_runtime``, ``number_calls``, ``cumul_runtime``, ...) cover every call,
+            including the calls whose records were dropped by the retention policy.
+        """
+        super().__init__(**kwargs)
+        self._max_records = max_records
+        self._max_age = max_age
+        self._log_epoch = time.time_ns() - self._log_clock()() # offset from the timestamps of every log to the epoch in ns
+        self.set_sink(sink)
         self.initialize()
 
+    def get_sink(self) -> Optional[BinaryLogSink]:
+        """
+        Returns the binary file receiving the records (None if no sink is set).
+        """
+        return self._sink
+
+    def set_sink(self, sink: Optional[BinaryLogSink]) -> None:
+        """
+        Sets the binary file receiving a copy of every record.
+
+        Parameters
+        ----------
+            sink: BinaryLogSink or None
+                The sink, or None to stop the streaming.
+
+        Raises
+        ------
+            TypeError: If sink is not a `BinaryLogSink` or None.
+        """
+        if sink is not None and not isinstance(sink, BinaryLogSink):
+            raise TypeError("Parameter sink is not a BinaryLogSink.")
+        self._sink = sink
+
     @property
-    def logger(self) -> List[Tuple[datetime, str, float]]:
+    def logger(self) -> LogView:
         """
-        Returns a copy of the copy
+        Returns a read-only view on the logger, whose items are ``[date, function name, runtime]`` records.
+        The view copies no record (see `LogView`), use ``logger.materialize()`` for an independent list of records.
         """
-        return copy.deepcopy(self._logger)
+        log = self._merged_log()
+        log.expire()
+        return LogView(log)
 
     @property
     def total_runtime(self) -> float:
         """
         Returns the total runtime in seconds.
-        """
-        return sum(logcall[2] for logcall in self._logger)
+        In call tree mode, the runtime of the nested calls is counted once.
+        """
+        if self._calltree:
+            return self._merged_tree().total_runtime() / 1e9
+        log = self._merged_log()
+        skipped = self._sampling_counters()[1]
+        total_runtime = 0
+        for func_id in log.function_ids():
+            slot = self._slot(log.function_name(func_id))
+            total_runtime += self._estimated(slot, log.count(func_id), log.runtime(func_id), skipped)
+        return total_runtime / 1e9
 
     @property
     def total_runcall(self) -> int:
         """
         Returns the total runcall.
         """
-        return len(self._logger)
+        return self._merged_log().total_count + sum(self._sampling_counters()[1])
 
     def number_calls(self, func_name: str) -> int:
         """
-        Computes the name of call of the given function.
-
-        .. warning::
-            If 2 functions/methods have the same '__name__' attribute, the TimerCounterLogger will combined the two.
+        Computes the name of call of the given function (including the calls not measured in sampling mode).
 
         Parameters
         ----------
@@ -245,14 +349,16 @@ Method 3:
         """
         if not isinstance(func_name, str):
             raise TypeError("Parameter func_name is not a string.")
-        return sum(1 for logcall in self._logger if logcall[1] == func_name)
+        log = self._merged_log()
+        func_id = log.function_id(func_name)
+        if func_id is None:
+            return 0
+        return log.count(func_id) + self._skipped_calls(self._slot(func_name))
 
     def cumul_runtime(self, func_name: str) -> int:
         """
         Computes the runtime of the given function.
-
-        .. warning::
-            If 2 functions/methods have the same '__name__' attribute, the TimerCounterLogger will combined the two.
+        In sampling mode, the runtime is estimated from the measured calls.
 
         Parameters
         ----------
@@ -270,7 +376,63 @@ Method 3:
         """
         if not isinstance(func_name, str):
             raise TypeError("Parameter func_name is not a string.")
-        return sum(logcall[2] for logcall in self._logger if logcall[1] == func_name)
+        log = self._merged_log()
+        func_id = log.function_id(func_name)
+        if func_id is None:
+            return 0
+        return self._estimated(self._slot(func_name), log.count(func_id), log.runtime(func_id)) / 1e9
+
+    def min_runtime(self, func_name: str) -> float:
+        """
+        Returns the minimal runtime of a call of the given function.
+
+        Parameters
+        ----------
+            func_name: str 
+                The name of the function.
+
+        Returns
+        -------
+            runtime: float
+                The minimal runtime of the function with the given name in seconds (0 if the function was never called).
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        if not isinstance(func_name, str):
+            raise TypeError("Parameter func_name is not a string.")
+        log = self._merged_log()
+        func_id = log.function_id(func_name)
+        if func_id is None:
+            return 0.0
+        return log.min_runtime(func_id) / 1e9
+
+    def max_runtime(self, func_name: str) -> float:
+        """
+        Returns the maximal runtime of a call of the given function.
+
+        Parameters
+        ----------
+            func_name: str 
+                The name of the function.
+
+        Returns
+        -------
+            runtime: float
+                The maximal runtime of the function with the given name in seconds (0 if the function was never called).
+
+        Raises
+        ------
+            TypeError: If the function name is not a string.
+        """
+        if not isinstance(func_name, str):
+            raise TypeError("Parameter func_name is not a string.")
+        log = self._merged_log()
+        func_id = log.function_id(func_name)
+        if func_id is None:
+            return 0.0
+        return log.max_runtime(func_id) / 1e9
 
     def get_functions(self) -> List[str]:
         """
@@ -283,7 +445,8 @@ Method 3:
             func_names: float
                 The names of the logged functions.
         """
-        func_names = list(set(logcall[1] for logcall in self._logger))
+        log = self._merged_log()
+        func_names = [log.function_name(func_id) for func_id in log.function_ids()]
         func_names.sort()
         return func_names
     
@@ -309,27 +472,127 @@ Method 3:
         """
         if not isinstance(func_name, str):
             raise TypeError("Parameter func_name is not a string.")
-        logcalls = [logcall for logcall in self._logger if logcall[1] == func_name]
-        logcalls.sort(key=lambda logcall: logcall[0])
-        return logcalls
+        log = self._merged_log()
+        func_id = log.function_id(func_name)
+        if func_id is None:
+            return []
+        log.expire()
+        log.sort_by_date()
+        return log.records(log.indices(func_id))
 
     def sort_by_date(self) -> None:
         """
         Sorts the logger list by date.
         """
-        self._logger.sort(key=lambda logcall: logcall[0])
+        self._merged_log().sort_by_date()
     
     def sort_by_name(self) -> None:
         """
         Sorts the logger list by function name.
         """
-        self._logger.sort(key=lambda logcall: logcall[1])
+        self._merged_log().sort_by_name()
 
     def initialize(self) -> None:
         """
         Initializes the logger.
         """
-        self._logger = [] # (date, function name, runtime)
+        self._log = self._new_log() # columns (function id, timestamp, runtime)
+        self._merged = None # (shards versions, merged log, next record number of each shard) cached in threadsafe mode
+        self._reset_shards()
+
+    def _new_log(self) -> CallLog:
+        """
+        Returns an empty log whose function ids are the slots of the decorated functions.
+        The logs share the epoch of the decorator, so the merges do not shift the timestamps.
+        """
+        log = CallLog(self._max_records, self._max_age, self._log_clock(), self._log_epoch)
+        for func_name in self._names:
+            log.intern(func_name)
+        return log
+
+    def _add_slot(self) -> None:
+        """
+        Registers a new decorated function in the logs.
+        """
+        self._log.intern(self._names[-1])
+        for lock, log in self._shards:
+            with lock:
+                log.intern(self._names[-1])
+
+    def _new_shard(self) -> tuple:
+        """
+        Returns a lock and an empty log for a new thread.
+        The lock is only contended while the shards are merged.
+        """
+        return (threading.RLock(), self._new_log())
+
+    def _merged_log(self) -> CallLog:
+        """
+        Returns the log of all the calls, merging the per-thread shards in threadsafe mode.
+        The merged log is cached and only the records added to the shards since the previous merge are merged into it,
+        then sorted incrementally by date.
+        """
+        if not self._threadsafe:
+            return self._log
+        shards = self._all_shards()
+        version = tuple(log.total_count for _, log in shards)
+        if self._merged is None or self._merged[0] != version:
+            if self._merged is None:
+                merged, starts = self._new_log(), []
+            else:
+                _, merged, starts = self._merged
+            with self._locked_shards() as shards:
+                starts = starts + [0] * (len(shards) - len(starts))
+                logs = [log for _, log in shards]
+                version = tuple(log.total_count for log in logs)
+                starts = merged.append_new(logs, starts)
+                merged.sum_aggregates(logs)
+            merged.sort_by_date()
+            self._merged = (version, merged, starts)
+        return self._merged[1]
+
+    def _snapshot_data(self) -> CallLog:
+        """
+        Returns a copy of the log.
+        """
+        log = self._merged_log()
+        return CallLog.merge([log], self._max_records, self._max_age, self._log_clock(), self._log_epoch)
+
+    def _merge_data(self, data: CallLog) -> None:
+        """
+        Appends the records and adds the aggregates of the log of a snapshot.
+        """
+        for func_name in data.function_names():
+            self._named_slot(func_name)
+        if self._threadsafe:
+            lock, log = self._local_shard()
+            with lock:
+                log.extend(data)
+        else:
+            self._log.extend(data)
+
+    def _snapshot_totals(self) -> Tuple[list, list]:
+        """
+        Returns the number of logged calls and their runtime in ns of each slot, from the aggregates of the logs (without merging the records).
+        """
+        with self._locked_shards() as shards:
+            logs = [log for _, log in shards] if self._threadsafe else [self._log]
+            size = len(self._names)
+            calls, runtimes = [0] * size, [0] * size
+            for log in logs:
+                for slot in range(min(size, len(log.function_names()))):
+                    calls[slot] += log.count(slot)
+                    runtimes[slot] += log.runtime(slot)
+        return calls, runtimes
+
+    def _reset_data(self) -> None:
+        """
+        Removes the records of the logs, keeping the decorated functions.
+        """
+        self._log.clear()
+        for _, log in self._shards:
+            log.clear()
+        self._merged = None
 
     def __repr__(self) -> str:
         """
@@ -338,18 +601,30 @@ Method 3:
         """
         return self.name_repr
 
-    def _wrapper(self, func, *args, **kwargs):
+    def _log_clock(self):
         """
-        Runs the function with runtime measurement.
+        Returns the clock of the timestamps of the logs.
+        The timestamps are the start of the calls measured with the clock of the decorator if it is absolute,
+        otherwise the end of the calls measured with ``time.monotonic_ns``.
+        """
+        if self._clock_source.absolute:
+            return self._clock
+        return time.monotonic_ns
+
+    def _record(self, slot: int, start: int, runtime: int) -> None:
         """
-        # Runtime measurement.
-        date = datetime.datetime.now()
-        tic = time.time()
-        outputs = func(*args, **kwargs)
-        toc = time.time()
-        self._logger.append([date, func.__name__, toc - tic])
-        # Return outputs of func.
-        return outputs
+        Logs a call of the function of the given slot.
+        """
+        timestamp = start if self._clock_source.absolute else time.monotonic_ns()
+        if self._threadsafe:
+            lock, log = self._local_shard()
+            with lock:
+                log.append(slot, timestamp, runtime)
+        else:
+            log = self._log
+            log.append(slot, timestamp, runtime)
+        if self._sink is not None:
+            self._sink.write(self._names[slot], timestamp + log.epoch, runtime)
     
     def get_help(self) -> str:
         """
@@ -376,19 +651,49 @@ Method 3:
             total runtime : {total_runtime_hours}h {total_runtime_minutes}m {total_runtime_seconds}s
             )
         """
-        string = "TimerCounterLogger(\n"
-        self.sort_by_date()
-        for logcall in self._logger:
-            # Conversion in hours, minutes, seconds.
-            hours, remainder = divmod(logcall[2], 3600)
-            minutes, seconds = divmod(remainder, 60)
-            string += f"[{logcall[0]}] function : {logcall[1]} - runtime : {int(hours)}h {int(minutes)}m {seconds:.4f}s\n"
+        return "".join(self.iter_repr("log"))
+
+    def _iter_log_lines(self) -> Iterator[str]:
+        """
+        Yields the lines of `log_repr`.
+        """
+        log = self._merged_log()
+        log.expire()
+        log.sort_by_date()
+        func_ids, timestamps, runtimes = log.columns()
+        names = log.function_names()
+        date = _DateFormatter(log.epoch)
+        yield "TimerCounterLogger(\n"
+        for index in range(len(timestamps)):
+            yield f"[{date(timestamps[index])}] function : {names[func_ids[index]]} - runtime : {_format_runtime(runtimes[index] / 1e9)}\n"
         # Adding total runtime and total call number.
-        hours, remainder = divmod(self.total_runtime, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        string += f"-----------\ntotal number of calls : {self.total_runcall}\ntotal runtime : {int(hours)}h {int(minutes)}m {seconds:.4f}s\n)"
-        return string
-    
+        yield f"-----------\ntotal number of calls : {self.total_runcall}\ntotal runtime : {_format_runtime(self.total_runtime)}\n)"
+
+    def _iter_name_lines(self, develop: bool = True) -> Iterator[str]:
+        """
+        Yields the lines of `name_repr` (develop is False) or `details_repr` (develop is True).
+        """
+        log = self._merged_log()
+        if develop:
+            log.expire()
+            log.sort_by_date()
+            func_ids, timestamps, runtimes = log.columns()
+            # Grouping the records of each function in date order.
+            groups = [[] for _ in log.function_names()]
+            for index in range(len(timestamps)):
+                groups[func_ids[index]].append(index)
+            date = _DateFormatter(log.epoch)
+        yield "TimerCounterLogger(\n"
+        for func_name in self.get_functions():
+            Ncalls = self.number_calls(func_name)
+            yield f"[{func_name}] number of calls : {Ncalls} - cumulative runtime : {_format_runtime(self.cumul_runtime(func_name))}\n"
+            if develop:
+                # Writting the call of the given function.
+                for index in groups[log.function_id(func_name)]:
+                    yield f"\t\t[{date(timestamps[index])}] {Ncalls} runtime : {_format_runtime(runtimes[index] / 1e9)}\n"
+        # Adding total runtime and total call number.
+        yield f"-----------\ntotal number of calls : {self.total_runcall} calls\ntotal runtime : {_format_runtime(self.total_runtime)}\n"
+
     def _name_representation(self, develop: bool = True) -> str:
         """
         Returns the string representation in the following format:
@@ -421,27 +726,74 @@ Method 3:
         """
         if not isinstance(develop, bool):
             raise TypeError("Parameter develop is not a booleen.")
-        string = "TimerCounterLogger(\n"
-        func_names = self.get_functions()
-        for func_name in func_names:
-            # Conversion in hours, minutes, seconds.
-            Ncalls = self.number_calls(func_name)
-            cumul_runtime = self.cumul_runtime(func_name)
-            hours, remainder = divmod(cumul_runtime, 3600)
-            minutes, seconds = divmod(remainder, 60)
-            string += f"[{func_name}] number of calls : {Ncalls} - cumulative runtime : {int(hours)}h {int(minutes)}m {seconds:.4f}s\n"
-            if develop:
-                logcalls = self.get_logcall(func_name)
-                # Writting the call of the given function.
-                for logcall in logcalls:
-                    hours, remainder = divmod(logcall[2], 3600)
-                    minutes, seconds = divmod(remainder, 60)
-                    string += f"\t\t[{logcall[0]}] {Ncalls} runtime : {int(hours)}h {int(minutes)}m {seconds:.4f}s\n"
-        # Adding total runtime and total call number.
-        hours, remainder = divmod(self.total_runtime, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        string += f"-----------\ntotal number of calls : {self.total_runcall} calls\ntotal runtime : {int(hours)}h {int(minutes)}m {seconds:.4f}s\n"
-        return string
+        return "".join(self._iter_name_lines(develop))
+
+    def iter_repr(self, kind: str = "name", chunk_size: int = 4096) -> Iterator[str]:
+        """
+        Yields a string representation by chunks, without building the whole string.
+
+        Parameters
+        ----------
+            kind: str, optional
+                The representation : ``"name"`` (`name_repr`), ``"details"`` (`details_repr`) or ``"log"`` (`log_repr`).
+                Default is ``"name"``.
+
+            chunk_size: int, optional
+                The number of lines of each chunk. Default is 4096.
+
+        Returns
+        -------
+            chunks: iterator of str
+                The chunks of the representation.
+
+        Raises
+        ------
+            TypeError: If kind is not a string or chunk_size is not an integer.
+            ValueError: If kind is not a known representation or chunk_size is not strictly positive.
+        """
+        if not isinstance(kind, str):
+            raise TypeError("Parameter kind is not a string.")
+        if kind not in ("name", "details", "log"):
+            raise ValueError(f"Unknown representation `{kind}`, available representations are ['name', 'details', 'log'].")
+        if not isinstance(chunk_size, int) or isinstance(chunk_size, bool):
+            raise TypeError("Parameter chunk_size is not an integer.")
+        if chunk_size <= 0:
+            raise ValueError("Parameter chunk_size must be strictly positive.")
+        if kind == "log":
+            lines = self._iter_log_lines()
+        else:
+            lines = self._iter_name_lines(develop=(kind == "details"))
+        return _chunks(lines, chunk_size)
+
+    def write_repr(self, file: Union[str, TextIO], kind: str = "name", chunk_size: int = 4096) -> None:
+        """
+        Writes a string representation into a file by chunks, without building the whole string.
+
+        Parameters
+        ----------
+            file: str or file
+                The path of the file, or a text file opened in writing mode.
+
+            kind: str, optional
+                The representation : ``"name"``, ``"details"`` or ``"log"`` (see `iter_repr`). Default is ``"name"``.
+
+            chunk_size: int, optional
+                The number of lines of each chunk. Default is 4096.
+
+        Raises
+        ------
+            TypeError: If file is not a path or a file, kind is not a string or chunk_size is not an integer.
+            ValueError: If kind is not a known representation or chunk_size is not strictly positive.
+        """
+        chunks = self.iter_repr(kind, chunk_size)
+        if isinstance(file, str):
+            with open(file, "w", encoding="utf-8") as stream:
+                stream.writelines(chunks)
+        elif hasattr(file, "write"):
+            for chunk in chunks:
+                file.write(chunk)
+        else:
+            raise TypeError("Parameter file is not a path or a file.")
 
     @property
     def name_repr(self) -> str:
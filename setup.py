@@ -33,6 +33,6 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires='>=3.6',  # Minimum Python version required
+    python_requires='>=3.7',  # Minimum Python version required
     install_requires=read_requirements(),
 )
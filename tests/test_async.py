@@ -0,0 +1,92 @@
+import unittest
+import asyncio
+import time
+from decoratepy import Counter, TimerCounter, TimerCounterLogger
+
+class TestAsync(unittest.TestCase):
+    def test_coroutine_runtime(self):
+        timercounter = TimerCounter()
+
+        @timercounter
+        async def handler(delay):
+            await asyncio.sleep(delay)
+            return delay
+
+        async def main():
+            return await asyncio.gather(handler(0.05), handler(0.05))
+
+        self.assertTrue(asyncio.iscoroutinefunction(handler))
+        self.assertEqual(asyncio.run(main()), [0.05, 0.05])
+        self.assertEqual(timercounter.total_runcall, 2)
+        # Both tasks run concurrently but each one is measured on its own.
+        self.assertGreaterEqual(timercounter.total_runtime, 0.09)
+
+    def test_async_generator(self):
+        logger = TimerCounterLogger()
+
+        @logger
+        async def numbers(n):
+            for i in range(n):
+                await asyncio.sleep(0.01)
+                yield i
+
+        async def main():
+            return [i async for i in numbers(3)]
+
+        self.assertEqual(asyncio.run(main()), [0, 1, 2])
+        self.assertEqual(logger.number_calls("numbers"), 1)
+        self.assertGreaterEqual(logger.cumul_runtime("numbers"), 0.025)
+
+    def test_generator(self):
+        timercounter = TimerCounter()
+
+        @timercounter
+        def numbers(n):
+            for i in range(n):
+                time.sleep(0.01)
+                yield i
+            return "done"
+
+        def consumer():
+            result = yield from numbers(3)
+            return result
+
+        generator = consumer()
+        self.assertEqual(list(generator), [0, 1, 2])
+        self.assertEqual(timercounter.total_runcall, 1)
+        self.assertGreaterEqual(timercounter.total_runtime, 0.025)
+
+        # Closing the generator early still records the call.
+        generator = numbers(3)
+        next(generator)
+        generator.close()
+        self.assertEqual(timercounter.total_runcall, 2)
+
+    def test_generator_send(self):
+        counter = Counter()
+
+        @counter
+        def echo():
+            received = None
+            while True:
+                received = yield received
+
+        generator = echo()
+        next(generator)
+        self.assertEqual(generator.send(5), 5)
+        with self.assertRaises(ValueError):
+            generator.throw(ValueError("stop"))
+
+    def test_deactivated(self):
+        counter = Counter()
+
+        @counter
+        async def handler():
+            return 1
+
+        counter.set_deactivated()
+        self.assertEqual(asyncio.run(handler()), 1)
+        self.assertEqual(counter.total_runcall, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import io
+import os
+import json
+import tempfile
+import contextlib
+import importlib.util
+import unittest
+
+_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "benchmark.py")
+_SPEC = importlib.util.spec_from_file_location("benchmark", _PATH)
+benchmark = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(benchmark)
+
+class TestBenchmark(unittest.TestCase):
+    def test_compare(self):
+        baseline = {
+            "overhead/Timer": {"value": 100.0, "unit": "ns/call"},
+            "overhead/Counter": {"value": 100.0, "unit": "ns/call"},
+            "overhead/Decorator": {"value": 0.0, "unit": "ns/call"},
+        }
+        results = {
+            "overhead/Timer": {"value": 126.0, "unit": "ns/call"},
+            "overhead/Counter": {"value": 125.0, "unit": "ns/call"},
+            "overhead/Decorator": {"value": 50.0, "unit": "ns/call"},
+            "overhead/TimerCounter": {"value": 1000.0, "unit": "ns/call"},
+        }
+        regressions = benchmark.compare(results, baseline, 0.25)
+        # Only the Timer exceeds its baseline value by more than 25% : the Counter is at the limit,
+        # the baseline of the Decorator is not positive and the TimerCounter is not in the baseline.
+        self.assertEqual(regressions, ["overhead/Timer : 126 ns/call > 100 ns/call (+25%)"])
+        self.assertEqual(benchmark.compare(results, baseline, 0.3), [])
+        self.assertEqual(benchmark.compare({}, baseline, 0.0), [])
+
+    def test_main(self):
+        arguments = ["--number", "10", "--repeat", "1", "--threads", "1", "--sizes", "1"]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            self.assertEqual(benchmark.main(arguments + ["--output", path]), 0)
+            with open(path, encoding="utf-8") as stream:
+                output = json.load(stream)
+            self.assertIn("overhead/Timer/activated/1-thread", output["results"])
+            # A baseline with tiny positive values makes every run a regression.
+            for result in output["results"].values():
+                result["value"] = 1e-12
+            with open(path, "w", encoding="utf-8") as stream:
+                json.dump(output, stream)
+            with contextlib.redirect_stderr(io.StringIO()) as errors:
+                self.assertEqual(benchmark.main(arguments + ["--output", os.devnull, "--baseline", path]), 1)
+            self.assertIn("regression : ", errors.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+from decoratepy import TimerCounterLogger, BinaryLogSink, BinaryLogReader
+
+class TestBinaryLog(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "calls.log")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_roundtrip(self):
+        sink = BinaryLogSink(self.path, batch_size=3)
+        logger = TimerCounterLogger(max_records=2, sink=sink)
+
+        @logger
+        def first():
+            pass
+
+        @logger
+        def second():
+            pass
+
+        for _ in range(5):
+            first()
+        second()
+        sink.close()
+
+        with BinaryLogReader(self.path) as reader:
+            self.assertEqual(len(reader), 6)
+            self.assertEqual(reader.get_functions(), ["first", "second"])
+            self.assertEqual(reader.number_calls("first"), 5)
+            self.assertEqual(reader.number_calls("unknown"), 0)
+            self.assertAlmostEqual(reader.cumul_runtime("first"), logger.cumul_runtime("first"))
+            self.assertAlmostEqual(reader.total_runtime, logger.total_runtime)
+            logcalls = reader.get_logcall("first")
+            self.assertEqual([logcall[1] for logcall in logcalls], ["first"] * 5)
+            self.assertEqual(logcalls[0][0].date(), logger.logger[0][0].date())
+
+    def test_restart(self):
+        for _ in range(2):
+            with BinaryLogSink(self.path) as sink:
+                logger = TimerCounterLogger(sink=sink)
+
+                @logger
+                def func():
+                    pass
+
+                func()
+                sink.flush()
+        with BinaryLogReader(self.path) as reader:
+            self.assertEqual(reader.number_calls("func"), 2)
+            self.assertEqual(reader.get_functions(), ["func"])
+
+    def test_closed_sink(self):
+        sink = BinaryLogSink(self.path)
+        logger = TimerCounterLogger(sink=sink)
+
+        @logger
+        def func():
+            return 1
+
+        func()
+        sink.close()
+        # The records after the closure are dropped, the calls still succeed.
+        self.assertEqual(func(), 1)
+        self.assertEqual(logger.total_runcall, 2)
+        with BinaryLogReader(self.path) as reader:
+            self.assertEqual(len(reader), 1)
+
+    def test_empty_file(self):
+        with BinaryLogSink(self.path, flush_interval=60) as sink:
+            with BinaryLogReader(self.path) as reader:
+                self.assertEqual(len(reader), 0)
+                self.assertEqual(list(reader), [])
+            sink.write("func", 0, 1)
+        open(self.path, "wb").close()
+        with BinaryLogReader(self.path) as reader:
+            self.assertEqual(list(reader), [])
+            self.assertEqual(reader.number_calls("func"), 0)
+
+    def test_invalid_file(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not a log")
+        with self.assertRaises(ValueError):
+            BinaryLogReader(self.path)
+        with self.assertRaises(ValueError):
+            BinaryLogSink(self.path)
+
+if __name__ == "__main__":
+    unittest.main()
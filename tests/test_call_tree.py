@@ -0,0 +1,119 @@
+import time
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from decoratepy import Counter, Timer, TimerCounter
+
+class TestCallTree(unittest.TestCase):
+    def test_nested(self):
+        timercounter = TimerCounter(calltree=True)
+
+        @timercounter
+        def child():
+            time.sleep(0.01)
+
+        @timercounter
+        def parent():
+            time.sleep(0.01)
+            child()
+            child()
+
+        parent()
+        tree = timercounter.call_tree()
+        self.assertEqual(list(tree.keys()), ["parent"])
+        self.assertEqual(tree["parent"]["number_calls"], 1)
+        self.assertEqual(tree["parent"]["children"]["child"]["number_calls"], 2)
+        self.assertGreaterEqual(timercounter.exclusive_runtime("parent"), 0.01)
+        self.assertLess(timercounter.exclusive_runtime("parent"), 0.02)
+        self.assertGreaterEqual(timercounter.inclusive_runtime("parent"), 0.03)
+        self.assertAlmostEqual(timercounter.total_runtime, timercounter.inclusive_runtime("parent"))
+        self.assertAlmostEqual(timercounter.total_runtime, timercounter.exclusive_runtime("parent") + timercounter.exclusive_runtime("child"))
+        self.assertIn("    [child] number of calls : 2", timercounter.tree_repr)
+
+    def test_recursion(self):
+        timer = Timer(calltree=True)
+
+        @timer
+        def factorial(n):
+            return 1 if n <= 1 else n * factorial(n - 1)
+
+        factorial(5)
+        self.assertAlmostEqual(timer.inclusive_runtime("factorial"), timer.total_runtime)
+        self.assertAlmostEqual(timer.exclusive_runtime("factorial"), timer.total_runtime, delta=1e-6)
+
+    def test_interleaved_decorators(self):
+        outer_counter = Counter(calltree=True)
+        inner_counter = Counter(calltree=True)
+
+        @outer_counter
+        def leaf():
+            pass
+
+        @inner_counter
+        def middle():
+            leaf()
+
+        @outer_counter
+        def root():
+            middle()
+
+        root()
+        # Each decorator follows its own calls through the calls of the other one.
+        self.assertEqual(outer_counter.call_tree()["root"]["children"]["leaf"]["number_calls"], 1)
+        self.assertEqual(list(inner_counter.call_tree().keys()), ["middle"])
+        self.assertEqual(inner_counter.call_tree()["middle"]["children"], {})
+
+    def test_exception(self):
+        counter = Counter(calltree=True)
+
+        @counter
+        def failing():
+            raise ValueError()
+
+        @counter
+        def func():
+            pass
+
+        with self.assertRaises(ValueError):
+            failing()
+        func()
+        self.assertEqual(list(counter.call_tree().keys()), ["func"])
+
+    def test_threads_and_tasks(self):
+        timer = Timer(calltree=True, threadsafe=True)
+
+        @timer
+        def leaf():
+            pass
+
+        @timer
+        def root():
+            leaf()
+
+        @timer
+        async def async_leaf():
+            await asyncio.sleep(0.001)
+
+        @timer
+        async def async_root():
+            await asyncio.gather(async_leaf(), async_leaf())
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for future in [executor.submit(root) for _ in range(20)]:
+                future.result()
+        asyncio.run(async_root())
+        tree = timer.call_tree()
+        self.assertEqual(tree["root"]["number_calls"], 20)
+        self.assertEqual(tree["root"]["children"]["leaf"]["number_calls"], 20)
+        self.assertEqual(tree["async_root"]["children"]["async_leaf"]["number_calls"], 2)
+        self.assertNotIn("leaf", tree)
+
+    def test_disabled(self):
+        timer = Timer()
+        with self.assertRaises(ValueError):
+            timer.call_tree()
+        with self.assertRaises(TypeError):
+            Timer(calltree=1)
+
+if __name__ == '__main__':
+    unittest.main()
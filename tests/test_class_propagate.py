@@ -0,0 +1,137 @@
+import re
+import asyncio
+import unittest
+from decoratepy import Counter, class_propagate
+
+class TestClassPropagate(unittest.TestCase):
+    def test_descriptors(self):
+        counter = Counter()
+
+        @class_propagate(counter)
+        class Data:
+            def __init__(self):
+                self._value = 0
+
+            @staticmethod
+            def static(x):
+                return x + 1
+
+            @classmethod
+            def create(cls):
+                return cls()
+
+            @property
+            def value(self):
+                return self._value
+
+            @value.setter
+            def value(self, value):
+                self._value = value
+
+            async def fetch(self):
+                return 42
+
+        data = Data.create()
+        self.assertIsInstance(data, Data)
+        self.assertEqual(Data.static(1), 2)
+        self.assertEqual(data.static(1), 2)
+        data.value = 3
+        self.assertEqual(data.value, 3)
+        self.assertIsInstance(Data.__dict__["value"], property)
+        self.assertEqual(asyncio.run(data.fetch()), 42)
+        self.assertEqual(counter.total_runcall, 7) # __init__, create, static (x2), setter, getter, fetch
+        self.assertIn("[static] number of calls : 2", counter.name_repr)
+        self.assertIn("[fetch] number of calls : 1", counter.name_repr)
+        # The getter and the setter of the property are reported under different names.
+        self.assertIn("[value.fget] number of calls : 1", counter.name_repr)
+        self.assertIn("[value.fset] number of calls : 1", counter.name_repr)
+        self.assertEqual(Data.__dict__["value"].fget.__name__, "value.fget")
+
+    def test_selection(self):
+        counter = Counter()
+
+        @class_propagate(counter, names=["get_*"], pattern=re.compile(r"load_\d"))
+        class Data:
+            def get_a(self):
+                pass
+
+            def get_b(self):
+                pass
+
+            def load_1(self):
+                pass
+
+            def load_all(self):
+                pass
+
+        data = Data()
+        for method in (data.get_a, data.get_b, data.load_1, data.load_all):
+            method()
+        self.assertEqual(counter.total_runcall, 3)
+        self.assertNotIn("load_all", counter.name_repr)
+
+    def test_inherited(self):
+        counter = Counter()
+
+        class Base:
+            def base_method(self):
+                return "base"
+
+            def overridden(self):
+                return "base"
+
+        @class_propagate(counter, inherited=True)
+        class Child(Base):
+            def overridden(self):
+                return "child"
+
+        self.assertEqual(Child().base_method(), "base")
+        self.assertEqual(Child().overridden(), "child")
+        self.assertEqual(Base().base_method(), "base")
+        self.assertIn("[base_method] number of calls : 1", counter.name_repr)
+        self.assertIn("[overridden] number of calls : 1", counter.name_repr)
+
+        @class_propagate(counter, inherited=True)
+        class GrandChild(Child):
+            pass
+
+        GrandChild().base_method()
+        self.assertIn("[base_method] number of calls : 2", counter.name_repr)
+
+    def test_hotswap_descriptors(self):
+        counter = Counter(hotswap=True)
+
+        @class_propagate(counter)
+        class Data:
+            @staticmethod
+            def static():
+                pass
+
+            @property
+            def value(self):
+                return 1
+
+        installed = Data.__dict__["static"]
+        counter.set_deactivated()
+        self.assertIsNot(Data.__dict__["static"], installed)
+        Data.static()
+        self.assertEqual(Data().value, 1)
+        self.assertEqual(counter.total_runcall, 0)
+        counter.set_activated()
+        self.assertIs(Data.__dict__["static"], installed)
+        Data.static()
+        self.assertEqual(counter.total_runcall, 1)
+
+    def test_errors(self):
+        counter = Counter()
+        with self.assertRaises(TypeError):
+            class_propagate(counter, pattern=1)
+        with self.assertRaises(TypeError):
+            class_propagate(counter, inherited=None)
+        with self.assertRaises(TypeError):
+            @class_propagate(counter, names=["attribute"])
+            class Data:
+                attribute = 1
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import time
+from decoratepy import Clock, Timer, TimerCounterLogger
+
+class TestClock(unittest.TestCase):
+    def test_get(self):
+        self.assertIn("perf_counter", Clock.available())
+        clock = Clock.get("monotonic")
+        self.assertIs(Clock.get(clock), clock)
+        self.assertIsInstance(clock.read(), int)
+        with self.assertRaises(ValueError):
+            Clock.get("sundial")
+        with self.assertRaises(TypeError):
+            Clock.get(1)
+
+    def test_timer_clocks(self):
+        for name in Clock.available():
+            timer = Timer(clock=name)
+            self.assertEqual(timer.get_clock().name, name)
+
+            @timer
+            def func():
+                time.sleep(0.01)
+
+            func()
+            if timer.get_clock().absolute:
+                self.assertGreaterEqual(timer.total_runtime, 0.009)
+            else:
+                self.assertGreaterEqual(timer.total_runtime, 0.0)
+
+    def test_calibrate(self):
+        timer = Timer()
+        overhead = timer.calibrate(n=1000)
+        self.assertGreaterEqual(overhead, 0)
+
+        @timer
+        def func():
+            pass
+
+        for _ in range(100):
+            func()
+        self.assertGreaterEqual(timer.total_runtime, 0.0)
+
+    def test_logger_dates(self):
+        for name in ("perf_counter", "process_time"):
+            logger = TimerCounterLogger(clock=name)
+
+            @logger
+            def func():
+                pass
+
+            before = time.time()
+            func()
+            date = logger.logger[0][0].timestamp()
+            self.assertAlmostEqual(date, before, delta=1.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import asyncio
+import unittest
+from decoratepy import Composite, Counter, Timer, TimerCounter, TimerCounterLogger, Memoize, class_propagate
+
+class TestComposite(unittest.TestCase):
+    def setUp(self):
+        self.counter = Counter()
+        self.timer = Timer()
+        self.logger = TimerCounterLogger()
+        self.composite = Composite(self.counter, self.timer, self.logger)
+
+    def test_single_measurement(self):
+        @self.composite
+        def func(x):
+            return x + 1
+
+        self.assertEqual(func(1), 2)
+        self.assertEqual(func(2), 3)
+        self.assertEqual(func.__name__, "func")
+        self.assertEqual(self.counter.total_runcall, 2)
+        self.assertEqual(self.logger.total_runcall, 2)
+        # Every component records the same measurement.
+        self.assertAlmostEqual(self.timer.total_runtime, self.logger.total_runtime, places=12)
+        self.assertIn("[func] number of calls : 2", self.composite.name_repr)
+        self.assertTrue(self.composite.name_repr.startswith("Composite(\nCounter("))
+
+    def test_component_activation(self):
+        @self.composite
+        def func():
+            pass
+
+        self.timer.set_deactivated()
+        func()
+        self.assertEqual(self.counter.total_runcall, 1)
+        self.assertEqual(self.logger.total_runcall, 1)
+        self.assertEqual(self.timer.total_runtime, 0)
+        self.timer.set_activated()
+        self.composite.set_deactivated()
+        func()
+        self.assertEqual(self.counter.total_runcall, 1)
+        self.composite.set_activated()
+        func()
+        self.assertEqual(self.counter.total_runcall, 2)
+        self.composite.initialize()
+        self.assertEqual(self.counter.total_runcall, 0)
+        self.assertEqual(self.logger.total_runcall, 0)
+
+    def test_sampling(self):
+        sampled = TimerCounter(sampling=2)
+        counter = Counter()
+        composite = Composite(sampled, counter)
+
+        @composite
+        def func():
+            pass
+
+        for _ in range(4):
+            func()
+        self.assertEqual(counter.total_runcall, 4)
+        self.assertEqual(sampled.total_runcall, 4)
+        self.assertEqual(sampled.snapshot().skipped["func"], 2)
+
+    def test_snapshot(self):
+        @self.composite
+        def func():
+            pass
+
+        func()
+        func()
+        snapshots = self.composite.snapshot(reset=True)
+        self.assertEqual([snapshot.kind for snapshot in snapshots], ["Counter", "Timer", "TimerCounterLogger"])
+        self.assertEqual([snapshot.totals["func"][0] for snapshot in snapshots], [2, 2, 2])
+        self.assertEqual(self.counter.total_runcall, 0)
+        self.composite.merge(snapshots)
+        self.composite.merge(list(snapshots))
+        self.assertEqual(self.counter.total_runcall, 4)
+        self.assertEqual(self.logger.number_calls("func"), 4)
+        self.assertEqual(len(self.logger.logger), 4)
+        with self.assertRaises(TypeError):
+            self.composite.merge(snapshots[0])
+        with self.assertRaises(ValueError):
+            self.composite.merge(snapshots[:2])
+        with self.assertRaises(ValueError):
+            self.composite.merge(snapshots[::-1])
+        with self.assertRaises(ValueError):
+            self.composite.merge(self.composite.snapshot(measurements=False))
+        self.assertEqual(self.counter.total_runcall, 4)
+        with self.assertRaises(ValueError):
+            self.composite.set_sampling(2)
+
+    def test_coroutine_and_generator(self):
+        @self.composite
+        async def coroutine():
+            await asyncio.sleep(0)
+            return 1
+
+        @self.composite
+        def generator():
+            yield 1
+            yield 2
+
+        self.assertEqual(asyncio.run(coroutine()), 1)
+        self.assertEqual(list(generator()), [1, 2])
+        self.assertEqual(self.counter.total_runcall, 2)
+        self.assertEqual(self.logger.total_runcall, 2)
+
+    def test_class_propagate(self):
+        @class_propagate(self.composite)
+        class MyClass:
+            def method(self):
+                return 1
+
+        self.assertEqual(MyClass().method(), 1)
+        self.assertEqual(self.counter.total_runcall, 1)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            Composite()
+        with self.assertRaises(TypeError):
+            Composite(self.counter, 1)
+        with self.assertRaises(TypeError):
+            Composite(Memoize())
+        with self.assertRaises(ValueError):
+            Composite(self.counter, self.counter)
+        with self.assertRaises(ValueError):
+            Composite(Counter(hotswap=True))
+        with self.assertRaises(ValueError):
+            Composite(Counter(), Timer(clock="monotonic"))
+
+if __name__ == "__main__":
+    unittest.main()
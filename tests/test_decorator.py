@@ -0,0 +1,50 @@
+import time
+import asyncio
+import unittest
+from decoratepy import Decorator
+
+class LegacyTimer(Decorator):
+    """
+    Subclass written against the first versions of the hook, overriding ``_wrapper(self, func, *args, **kwargs)``.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.initialize()
+
+    def initialize(self) -> None:
+        self._timer = {}
+
+    def _wrapper(self, func, *args, **kwargs):
+        if func.__name__ not in self._timer.keys():
+            self._timer[func.__name__] = 0
+        tic = time.time()
+        outputs = func(*args, **kwargs)
+        toc = time.time()
+        self._timer[func.__name__] += toc - tic
+        return outputs
+
+class TestDecorator(unittest.TestCase):
+    def test_legacy_wrapper(self):
+        timer = LegacyTimer()
+
+        @timer
+        def add(x, y):
+            return x + y
+
+        @timer
+        async def coroutine():
+            return 1
+
+        self.assertEqual(add(1, y=2), 3)
+        self.assertEqual(list(timer._timer.keys()), ["add"])
+        # The coroutine is passed to the hook as in the first versions.
+        self.assertEqual(asyncio.run(coroutine()), 1)
+        self.assertIn("coroutine", timer._timer)
+        timer.set_deactivated()
+        del timer._timer["add"]
+        self.assertEqual(add(1, 2), 3)
+        self.assertNotIn("add", timer._timer)
+
+if __name__ == "__main__":
+    unittest.main()
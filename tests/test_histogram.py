@@ -0,0 +1,84 @@
+import random
+import statistics
+import unittest
+from decoratepy import Histogram, TimerCounter
+
+class TestHistogram(unittest.TestCase):
+    def test_statistics(self):
+        values = [random.randint(0, 10 ** 9) for _ in range(10000)]
+        histogram = Histogram()
+        for value in values:
+            histogram.record(value)
+        self.assertEqual(histogram.count, len(values))
+        self.assertEqual(histogram.total, sum(values))
+        self.assertEqual(histogram.min, min(values))
+        self.assertEqual(histogram.max, max(values))
+        self.assertAlmostEqual(histogram.mean, statistics.mean(values), delta=1)
+        self.assertAlmostEqual(histogram.stddev, statistics.pstdev(values), delta=1)
+        values.sort()
+        for q in (1, 50, 90, 99, 99.9):
+            exact = values[max(int(q / 100 * len(values) + 0.5) - 1, 0)]
+            self.assertAlmostEqual(histogram.percentile(q), exact, delta=exact * 0.02 + 1)
+        self.assertEqual(histogram.percentile(100), max(values))
+        self.assertEqual(histogram.percentile(0), min(values))
+
+    def test_small_values_are_exact(self):
+        histogram = Histogram()
+        for value in range(100):
+            histogram.record(value)
+        self.assertEqual(histogram.percentile(50), 49)
+
+    def test_bounded_buckets(self):
+        histogram = Histogram(significant_bits=4)
+        for value in range(0, 10 ** 7, 7):
+            histogram.record(value)
+        self.assertLessEqual(len(histogram._buckets), 8 * 24 + 16)
+
+    def test_merge(self):
+        first, second = Histogram(), Histogram()
+        for value in range(1000):
+            (first if value % 2 else second).record(value)
+        merged = first + second
+        self.assertEqual(merged.count, 1000)
+        self.assertEqual(merged.min, 0)
+        self.assertEqual(merged.max, 999)
+        self.assertEqual(first.count, 500)
+        with self.assertRaises(ValueError):
+            first.merge(Histogram(significant_bits=5))
+        with self.assertRaises(ValueError):
+            first.percentile(101)
+
+    def test_cumulative_counts(self):
+        histogram = Histogram()
+        for value in range(10000):
+            histogram.record(value)
+        counts = histogram.cumulative_counts([-1, 99, 5000, 9999])
+        self.assertEqual(counts[0], 0)
+        self.assertEqual(counts[1], 100)
+        self.assertLess(abs(counts[2] - 5001), 5001 * 0.02)
+        self.assertEqual(counts[3], 10000)
+        self.assertEqual(Histogram().cumulative_counts([1, 2]), [0, 0])
+
+class TestTimerCounterPercentile(unittest.TestCase):
+    def test_queries(self):
+        timercounter = TimerCounter()
+
+        @timercounter
+        def func():
+            pass
+
+        for _ in range(100):
+            func()
+        self.assertEqual(timercounter.number_calls("func"), 100)
+        self.assertEqual(timercounter.number_calls("unknown"), 0)
+        self.assertLessEqual(timercounter.min_runtime("func"), timercounter.percentile("func", 50))
+        self.assertLessEqual(timercounter.percentile("func", 50), timercounter.max_runtime("func"))
+        self.assertAlmostEqual(timercounter.mean_runtime("func") * 100, timercounter.cumul_runtime("func"))
+        self.assertGreaterEqual(timercounter.std_runtime("func"), 0.0)
+        self.assertEqual(timercounter.get_histogram("func").count, 100)
+        self.assertEqual(timercounter.percentile("unknown", 99), 0.0)
+        with self.assertRaises(TypeError):
+            timercounter.percentile(func, 99)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from decoratepy import Counter, class_propagate
+
+counter = Counter(hotswap=True)
+
+@counter
+def module_function():
+    return "called"
+
+class Tools:
+    @staticmethod
+    @counter
+    def static():
+        return "static"
+
+    @classmethod
+    @counter
+    def create(cls):
+        return cls
+
+class TestHotswap(unittest.TestCase):
+    def tearDown(self):
+        counter.set_activated()
+        counter.initialize()
+
+    def test_module_function(self):
+        decorated = module_function
+        counter.set_deactivated()
+        # The module attribute is the original function.
+        self.assertIs(globals()["module_function"], decorated.__wrapped__)
+        self.assertEqual(module_function(), "called")
+        self.assertEqual(counter.total_runcall, 0)
+        # A reference kept before the deactivation still checks the status.
+        self.assertEqual(decorated(), "called")
+        self.assertEqual(counter.total_runcall, 0)
+
+        counter.set_activated()
+        self.assertIs(globals()["module_function"], decorated)
+        self.assertEqual(module_function(), "called")
+        self.assertEqual(counter.total_runcall, 1)
+
+    def test_descriptors(self):
+        installed = {name: vars(Tools)[name] for name in ("static", "create")}
+        counter.set_deactivated()
+        # The original functions are restored in the same descriptor types.
+        self.assertIsInstance(vars(Tools)["static"], staticmethod)
+        self.assertIsInstance(vars(Tools)["create"], classmethod)
+        self.assertIs(vars(Tools)["static"].__func__, installed["static"].__func__.__wrapped__)
+        self.assertEqual(Tools.static(), "static")
+        self.assertIs(Tools.create(), Tools)
+        self.assertEqual(counter.total_runcall, 0)
+
+        counter.set_activated()
+        self.assertIs(vars(Tools)["static"], installed["static"])
+        self.assertIs(vars(Tools)["create"], installed["create"])
+        self.assertEqual(Tools.static(), "static")
+        self.assertIs(Tools().create(), Tools)
+        self.assertEqual(counter.total_runcall, 2)
+
+    def test_class_propagate(self):
+        decorator = Counter(hotswap=True)
+
+        @class_propagate(decorator)
+        class TestClass:
+            def method(self):
+                return "method"
+
+        decorated = TestClass.__dict__["method"]
+        decorator.set_deactivated()
+        self.assertIs(TestClass.__dict__["method"], decorated.__wrapped__)
+        self.assertEqual(TestClass().method(), "method")
+        self.assertEqual(decorator.total_runcall, 0)
+        decorator.set_activated()
+        self.assertIs(TestClass.__dict__["method"], decorated)
+        self.assertEqual(TestClass().method(), "method")
+        self.assertEqual(decorator.total_runcall, 1)
+
+if __name__ == "__main__":
+    unittest.main()
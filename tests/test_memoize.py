@@ -0,0 +1,224 @@
+import gc
+import time
+import random
+import asyncio
+import threading
+import unittest
+from decoratepy import Memoize, class_propagate
+
+class TestMemoize(unittest.TestCase):
+    def test_cache(self):
+        memoize = Memoize()
+        calls = []
+
+        @memoize
+        def square(x, power=2):
+            calls.append(x)
+            return x ** power
+
+        self.assertEqual(square(3), 9)
+        self.assertEqual(square(3), 9)
+        self.assertEqual(square(3, power=3), 27)
+        self.assertEqual(square(x=3), 9)
+        self.assertEqual(calls, [3, 3, 3])
+        self.assertEqual(memoize.hits("square"), 1)
+        self.assertEqual(memoize.misses("square"), 3)
+        self.assertEqual(memoize.cache_size("square"), 3)
+        self.assertEqual(memoize.number_calls("square"), 4)
+        self.assertEqual(memoize.total_runcall, 4)
+        self.assertIn("[square] hits : 1 - misses : 3 - evictions : 0 - size : 3", memoize.name_repr)
+        self.assertIn("hit ratio : 25.0%", memoize.name_repr)
+        self.assertEqual(memoize.hits("unknown"), 0)
+        with self.assertRaises(TypeError):
+            memoize.hits(square)
+
+    def test_unhashable(self):
+        memoize = Memoize()
+
+        @memoize
+        def length(values):
+            return len(values)
+
+        self.assertEqual(length([1, 2]), 2)
+        self.assertEqual(length([1, 2]), 2)
+        self.assertEqual(memoize.misses("length"), 2)
+        self.assertEqual(memoize.cache_size("length"), 0)
+
+    def test_lru(self):
+        memoize = Memoize(maxsize=2)
+
+        @memoize
+        def identity(x):
+            return x
+
+        identity(1)
+        identity(2)
+        identity(1)
+        identity(3) # evicts 2, the least recently used
+        self.assertEqual(memoize.evictions("identity"), 1)
+        identity(1)
+        self.assertEqual(memoize.hits("identity"), 2)
+        identity(2)
+        self.assertEqual(memoize.misses("identity"), 4)
+        self.assertEqual(memoize.cache_size("identity"), 2)
+
+    def test_ttl(self):
+        memoize = Memoize(ttl=0.05)
+
+        @memoize
+        def identity(x):
+            return x
+
+        identity(1)
+        identity(1)
+        time.sleep(0.1)
+        identity(1)
+        self.assertEqual(memoize.hits("identity"), 1)
+        self.assertEqual(memoize.misses("identity"), 2)
+        self.assertEqual(memoize.evictions("identity"), 1)
+
+    def test_typed(self):
+        memoize = Memoize(typed=True)
+
+        @memoize
+        def identity(x):
+            return x
+
+        self.assertIsInstance(identity(1), int)
+        self.assertIsInstance(identity(1.0), float)
+        self.assertEqual(memoize.misses("identity"), 2)
+
+    def test_deactivated(self):
+        memoize = Memoize()
+        calls = []
+
+        @memoize
+        def func(x):
+            calls.append(x)
+            return x
+
+        func(1)
+        memoize.set_deactivated()
+        func(1)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(memoize.total_runcall, 1)
+        memoize.set_activated()
+        func(1)
+        self.assertEqual(len(calls), 2)
+        memoize.initialize()
+        func(1)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(memoize.total_runcall, 1)
+
+    def test_instance_caches(self):
+        memoize = Memoize()
+
+        @class_propagate(memoize, names=["area"])
+        class Square:
+            def __init__(self, side):
+                self.side = side
+
+            def area(self, scale=1):
+                return self.side ** 2 * scale
+
+        first, second = Square(2), Square(3)
+        self.assertEqual(first.area(), 4)
+        self.assertEqual(second.area(), 9)
+        self.assertEqual(first.area(), 4)
+        self.assertEqual(memoize.hits("area"), 1)
+        self.assertEqual(memoize.cache_size("area"), 2)
+        del first
+        gc.collect()
+        self.assertEqual(memoize.cache_size("area"), 1)
+
+    def test_coroutine(self):
+        memoize = Memoize()
+
+        @memoize
+        async def double(x):
+            await asyncio.sleep(0)
+            return 2 * x
+
+        async def main():
+            return [await double(1), await double(1)]
+
+        self.assertEqual(asyncio.run(main()), [2, 2])
+        self.assertEqual(memoize.hits("double"), 1)
+
+    def test_threadsafe(self):
+        memoize = Memoize(maxsize=10, threadsafe=True)
+
+        @memoize
+        def identity(x):
+            return x
+
+        def worker():
+            for x in range(1000):
+                identity(x % 20)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(memoize.total_runcall, 4000)
+        self.assertLessEqual(memoize.cache_size("identity"), 10)
+        snapshot = memoize.snapshot(reset=True)
+        self.assertEqual(snapshot.totals["identity"][0], 4000)
+        self.assertEqual(memoize.total_runcall, 0)
+
+    def test_threads_without_threadsafe(self):
+        # The caches are shared by the threads even without the threadsafe option.
+        memoize = Memoize(maxsize=2)
+
+        class Key(object):
+            def __init__(self, value):
+                self.value = value
+
+            def __hash__(self):
+                return hash(self.value)
+
+            def __eq__(self, other):
+                time.sleep(0) # switches the threads inside the cache operations
+                return self.value == other.value
+
+        @memoize
+        def identity(key):
+            return key.value
+
+        errors = []
+
+        def worker(seed):
+            generator = random.Random(seed)
+            try:
+                for _ in range(500):
+                    value = generator.randrange(3)
+                    self.assertEqual(identity(Key(value)), value)
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(memoize.total_runcall, 4000)
+        self.assertLessEqual(memoize.cache_size("identity"), 2)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            Memoize(maxsize=0)
+        with self.assertRaises(TypeError):
+            Memoize(ttl="1s")
+        with self.assertRaises(ValueError):
+            Memoize(sampling=2)
+        with self.assertRaises(ValueError):
+            Memoize().set_sampling(2)
+        with self.assertRaises(ValueError):
+            Memoize(calltree=True)
+        with self.assertRaises(ValueError):
+            Memoize().adapt_sampling(100)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import unittest
+from decoratepy import MicroBatch
+
+class TestMicroBatch(unittest.TestCase):
+    def test_threads(self):
+        microbatch = MicroBatch(max_size=4, max_delay=5)
+        batches = []
+
+        @microbatch
+        def square(values):
+            batches.append(list(values))
+            return [value ** 2 for value in values]
+
+        barrier = threading.Barrier(8)
+        results = {}
+
+        def worker(value):
+            barrier.wait()
+            results[value] = square(value)
+
+        threads = [threading.Thread(target=worker, args=(value,)) for value in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, {value: value ** 2 for value in range(8)})
+        self.assertEqual(sorted(len(batch) for batch in batches), [4, 4])
+        self.assertEqual(microbatch.number_calls("square"), 8)
+        self.assertEqual(microbatch.number_batches("square"), 2)
+        self.assertEqual(microbatch.mean_batch_size("square"), 4.0)
+        self.assertEqual(microbatch.largest_batch("square"), 4)
+        self.assertGreaterEqual(microbatch.mean_queue_latency("square"), 0.0)
+        self.assertIn("[square] number of calls : 8 - batches : 2 - mean batch size : 4.0 - largest batch : 4", microbatch.name_repr)
+        self.assertIn("total number of batches : 2", microbatch.name_repr)
+        with self.assertRaises(TypeError):
+            microbatch.number_calls(square)
+
+    def test_max_delay(self):
+        microbatch = MicroBatch(max_size=100, max_delay=0.01)
+
+        @microbatch
+        def double(values):
+            return [2 * value for value in values]
+
+        self.assertEqual(double(2), 4)
+        self.assertEqual(microbatch.number_batches("double"), 1)
+        self.assertGreaterEqual(microbatch.mean_queue_latency("double"), 0.005)
+
+    def test_exception(self):
+        microbatch = MicroBatch(max_size=2, max_delay=5)
+
+        @microbatch
+        def fail(values):
+            raise KeyError("fail")
+
+        errors = []
+
+        def worker():
+            try:
+                fail(1)
+            except KeyError as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(errors), 2)
+        self.assertIs(errors[0], errors[1])
+
+        @MicroBatch(max_size=1)
+        def wrong(values):
+            return []
+
+        with self.assertRaises(ValueError):
+            wrong(1)
+
+    def test_coroutine(self):
+        microbatch = MicroBatch(max_size=3, max_delay=0.01)
+        batches = []
+
+        @microbatch
+        async def square(values):
+            batches.append(list(values))
+            await asyncio.sleep(0)
+            return [value ** 2 for value in values]
+
+        async def main():
+            return await asyncio.gather(*(square(value) for value in range(5)))
+
+        self.assertEqual(asyncio.run(main()), [0, 1, 4, 9, 16])
+        self.assertEqual(batches, [[0, 1, 2], [3, 4]])
+        self.assertEqual(microbatch.number_batches("square"), 2)
+        self.assertEqual(microbatch.largest_batch("square"), 3)
+
+    def test_deactivated_and_snapshot(self):
+        microbatch = MicroBatch(max_size=1)
+
+        @microbatch
+        def double(values):
+            return [2 * value for value in values]
+
+        self.assertEqual(double(1), 2)
+        microbatch.set_deactivated()
+        self.assertEqual(double(2), 4)
+        self.assertEqual(microbatch.total_runcall, 1)
+        snapshot = microbatch.snapshot(reset=True)
+        self.assertEqual(snapshot.totals["double"][0], 1)
+        self.assertEqual(microbatch.total_batches, 0)
+        microbatch.merge(snapshot)
+        self.assertEqual(microbatch.number_batches("double"), 1)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(TypeError):
+            MicroBatch(max_size=1.5)
+        with self.assertRaises(ValueError):
+            MicroBatch(max_size=0)
+        with self.assertRaises(TypeError):
+            MicroBatch(max_delay="1ms")
+        with self.assertRaises(ValueError):
+            MicroBatch(max_delay=-1)
+        with self.assertRaises(ValueError):
+            MicroBatch(sampling=2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import sys
+import shutil
+import tempfile
+import importlib
+import textwrap
+import unittest
+from decoratepy import Counter, module_propagate
+
+MODULE = textwrap.dedent("""
+    from os.path import join
+
+    def helper(x):
+        return x + 1
+
+    def _private():
+        return 0
+
+    def compute(x):
+        return helper(x) * 2
+
+    class Service:
+        value = 1
+
+        def run(self):
+            return compute(self.value)
+
+        @staticmethod
+        def version():
+            return "1.0"
+""")
+
+class TestModulePropagate(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        package = os.path.join(self.directory, "instrumented_pkg")
+        os.makedirs(os.path.join(package, "sub"))
+        for path in ("__init__.py", "core.py", os.path.join("sub", "__init__.py"), os.path.join("sub", "extra.py")):
+            with open(os.path.join(package, path), "w") as file:
+                file.write("" if path.endswith("__init__.py") else MODULE)
+        sys.path.insert(0, self.directory)
+
+    def tearDown(self):
+        sys.path.remove(self.directory)
+        for name in list(sys.modules):
+            if name == "instrumented_pkg" or name.startswith("instrumented_pkg."):
+                del sys.modules[name]
+        shutil.rmtree(self.directory)
+
+    def test_import_hook(self):
+        counter = Counter()
+        instrumentation = module_propagate(counter, "instrumented_pkg", exclude=["*._*"])
+        core = importlib.import_module("instrumented_pkg.core")
+        original_join = core.join
+        self.assertEqual(core.Service().run(), 4)
+        self.assertEqual(core.Service.version(), "1.0")
+        self.assertEqual(core._private(), 0)
+        self.assertIn("[run] number of calls : 1", counter.name_repr)
+        self.assertIn("[compute] number of calls : 1", counter.name_repr)
+        self.assertIn("[helper] number of calls : 1", counter.name_repr)
+        self.assertNotIn("_private", counter.name_repr)
+        self.assertIs(core.join, original_join)
+        self.assertIn("instrumented_pkg.core", instrumentation.modules)
+        instrumentation.uninstall()
+        core.Service().run()
+        self.assertEqual(counter.total_runcall, 4)
+        # Modules imported after the uninstallation are not instrumented.
+        extra = importlib.import_module("instrumented_pkg.sub.extra")
+        extra.compute(1)
+        self.assertEqual(counter.total_runcall, 4)
+
+    def test_imported_module(self):
+        core = importlib.import_module("instrumented_pkg.core")
+        original = core.compute
+        counter = Counter()
+        with module_propagate(counter, core, include=["*.compute", "*.Service.*"], hook=False):
+            self.assertIsNot(core.compute, original)
+            core.Service().run()
+            core.helper(1)
+            self.assertEqual(counter.total_runcall, 2)
+        self.assertIs(core.compute, original)
+        self.assertEqual(counter.total_runcall, 2)
+
+    def test_lazy(self):
+        counter = Counter()
+        instrumentation = module_propagate(counter, "instrumented_pkg.sub", lazy=True)
+        extra = importlib.import_module("instrumented_pkg.sub.extra")
+        self.assertNotIn("instrumented_pkg.sub.extra", instrumentation.modules)
+        extra.compute(1)
+        self.assertIn("instrumented_pkg.sub.extra", instrumentation.modules)
+        self.assertEqual(counter.total_runcall, 2)
+        instrumentation.uninstall()
+
+    def test_errors(self):
+        with self.assertRaises(TypeError):
+            module_propagate(None, "instrumented_pkg")
+        with self.assertRaises(TypeError):
+            module_propagate(Counter(), 1)
+        with self.assertRaises(TypeError):
+            module_propagate(Counter(), "instrumented_pkg", include="*")
+
+if __name__ == "__main__":
+    unittest.main()
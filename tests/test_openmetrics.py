@@ -0,0 +1,125 @@
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from decoratepy import Counter, Timer, TimerCounter, Composite, Memoize, SingleFlight, OpenMetricsExporter, MetricsServer
+
+class TestOpenMetrics(unittest.TestCase):
+    def setUp(self):
+        self.counter = Counter()
+        self.timercounter = TimerCounter(threadsafe=True)
+
+        @self.counter
+        def counted():
+            pass
+
+        @self.timercounter
+        def timed():
+            pass
+
+        for _ in range(3):
+            counted()
+            timed()
+        self.exporter = OpenMetricsExporter({"counter": self.counter, "api": self.timercounter}, buckets=[0.5, 10.0])
+
+    def test_render(self):
+        lines = self.exporter.render().splitlines()
+        self.assertIn("decoratepy_calls_total{decorator=\"counter\",function=\"counted\"} 3", lines)
+        self.assertIn("decoratepy_calls_total{decorator=\"api\",function=\"timed\"} 3", lines)
+        self.assertFalse(any(line.startswith("decoratepy_runtime_seconds_total{decorator=\"counter\"") for line in lines))
+        self.assertTrue(any(line.startswith("decoratepy_runtime_seconds_total{decorator=\"api\",function=\"timed\"} ") for line in lines))
+        self.assertIn("decoratepy_call_duration_seconds_bucket{decorator=\"api\",function=\"timed\",le=\"10.0\"} 3", lines)
+        self.assertIn("decoratepy_call_duration_seconds_bucket{decorator=\"api\",function=\"timed\",le=\"+Inf\"} 3", lines)
+        self.assertIn("decoratepy_call_duration_seconds_count{decorator=\"api\",function=\"timed\"} 3", lines)
+        self.assertEqual(lines[-1], "# EOF")
+
+    def test_without_runtime(self):
+        memoize = Memoize()
+        singleflight = SingleFlight()
+
+        @memoize
+        def cached(x):
+            return x
+
+        @singleflight
+        def fetched(x):
+            return x
+
+        for x in (1, 1, 2):
+            cached(x)
+            fetched(x)
+        lines = OpenMetricsExporter({"cache": memoize, "flight": singleflight}).render().splitlines()
+        self.assertIn("decoratepy_calls_total{decorator=\"cache\",function=\"cached\"} 3", lines)
+        self.assertIn("decoratepy_calls_total{decorator=\"flight\",function=\"fetched\"} 3", lines)
+        # The decorators measuring no runtime have no runtime series.
+        self.assertFalse(any(line.startswith("decoratepy_runtime_seconds_total") for line in lines))
+
+    def test_escape(self):
+        timer = Timer()
+
+        def func():
+            pass
+
+        func.__name__ = "a\"b"
+        timer(func)()
+        text = OpenMetricsExporter({"timer": timer}, prefix="app").render()
+        self.assertIn("app_calls_total{decorator=\"timer\",function=\"a\\\"b\"} 1", text)
+
+    def test_server(self):
+        with self.exporter.serve() as server:
+            self.assertIsInstance(server, MetricsServer)
+            self.assertTrue(server.is_running())
+            with urllib.request.urlopen(server.url, timeout=5) as response:
+                self.assertTrue(response.headers["Content-Type"].startswith("application/openmetrics-text"))
+                self.assertEqual(response.read().decode("utf-8"), self.exporter.render())
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"http://127.0.0.1:{server.port}/other", timeout=5)
+        self.assertFalse(server.is_running())
+
+    def test_consistent_scrape(self):
+        timercounter = TimerCounter(threadsafe=True)
+        exporter = OpenMetricsExporter({"api": timercounter})
+        stop = threading.Event()
+
+        @timercounter
+        def func():
+            pass
+
+        def worker():
+            while not stop.is_set():
+                func()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        try:
+            for _ in range(20):
+                values = dict(line.rsplit(" ", 1) for line in exporter.render().splitlines() if not line.startswith("#"))
+                self.assertEqual(values["decoratepy_calls_total{decorator=\"api\",function=\"func\"}"], values["decoratepy_call_duration_seconds_count{decorator=\"api\",function=\"func\"}"])
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    def test_server_error(self):
+        def fail(**kwargs):
+            raise RuntimeError("snapshot")
+
+        self.timercounter.snapshot = fail
+        with self.exporter.serve() as server:
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                urllib.request.urlopen(server.url, timeout=5)
+            self.assertEqual(context.exception.code, 500)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(TypeError):
+            OpenMetricsExporter([self.counter])
+        with self.assertRaises(TypeError):
+            OpenMetricsExporter({"counter": 1})
+        with self.assertRaises(TypeError):
+            OpenMetricsExporter({"composite": Composite(Counter())})
+        with self.assertRaises(ValueError):
+            OpenMetricsExporter({"counter": self.counter}, buckets=[1.0, 0.5])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import time
+import unittest
+from decoratepy import Counter, Timer, TimerCounter, TimerCounterLogger
+
+class TestSampling(unittest.TestCase):
+    def test_period(self):
+        timercounter = TimerCounter(sampling=10)
+
+        @timercounter
+        def func():
+            pass
+
+        for _ in range(1000):
+            func()
+        self.assertEqual(timercounter.number_calls("func"), 1000)
+        self.assertEqual(timercounter.total_runcall, 1000)
+        self.assertEqual(timercounter.get_histogram("func").count, 100)
+        self.assertIn("[func] number of calls : 1000", timercounter.name_repr)
+        self.assertAlmostEqual(timercounter.cumul_runtime("func"), timercounter.get_histogram("func").total * 10 / 1e9)
+        self.assertGreaterEqual(timercounter.runtime_error("func"), 0.0)
+
+    def test_fraction(self):
+        timercounter = TimerCounter(sampling=0.1)
+
+        @timercounter
+        def func():
+            time.sleep(0)
+
+        for _ in range(5000):
+            func()
+        measured = timercounter.get_histogram("func").count
+        self.assertEqual(timercounter.number_calls("func"), 5000)
+        self.assertGreater(measured, 300)
+        self.assertLess(measured, 700)
+        self.assertGreater(timercounter.runtime_error("func"), 0.0)
+
+    def test_exact_counts(self):
+        for decorator in (Counter(sampling=7), TimerCounterLogger(sampling=7), Counter(sampling=7, threadsafe=True)):
+            @decorator
+            def func():
+                pass
+
+            for _ in range(100):
+                func()
+            self.assertEqual(decorator.total_runcall, 100)
+
+    def test_logger(self):
+        logger = TimerCounterLogger(sampling=4)
+
+        @logger
+        def func():
+            pass
+
+        for _ in range(100):
+            func()
+        self.assertEqual(len(logger.logger), 25)
+        self.assertEqual(logger.number_calls("func"), 100)
+
+    def test_function_queries(self):
+        for decorator in (TimerCounter(sampling=4), TimerCounterLogger(sampling=4), TimerCounterLogger(sampling=4, threadsafe=True)):
+            @decorator
+            def func():
+                pass
+
+            @decorator
+            def other():
+                pass
+
+            for _ in range(100):
+                func()
+            other()
+            decorator.snapshot(reset=True)
+            for _ in range(100):
+                func()
+            # The calls not measured are kept when the sampling is disabled.
+            decorator.set_sampling(None)
+            func()
+            self.assertEqual(decorator.number_calls("func"), 101)
+            self.assertEqual(decorator.number_calls("other"), 0)
+            self.assertEqual(decorator.number_calls("unknown"), 0)
+            self.assertEqual(decorator.total_runcall, 101)
+            # The queries of one function do not merge the counters of every function.
+            decorator._sampling_counters = None
+            self.assertEqual(decorator.number_calls("func"), 101)
+            self.assertGreater(decorator.cumul_runtime("func"), 0)
+
+    def test_set_sampling(self):
+        timer = Timer()
+        self.assertIsNone(timer.get_sampling())
+        timer.set_sampling(5)
+        self.assertEqual(timer.get_sampling(), 5)
+        timer.set_sampling(None)
+        self.assertIsNone(timer.get_sampling())
+        with self.assertRaises(ValueError):
+            timer.set_sampling(0)
+        with self.assertRaises(ValueError):
+            timer.set_sampling(1.5)
+        with self.assertRaises(TypeError):
+            timer.set_sampling("10")
+
+    def test_adapt_sampling(self):
+        timercounter = TimerCounter()
+
+        @timercounter
+        def hot():
+            pass
+
+        @timercounter
+        def cold():
+            pass
+
+        timercounter.adapt_sampling(100)
+        self.assertEqual(timercounter.get_sampling(), 1)
+        start = time.monotonic()
+        while time.monotonic() - start < 0.1:
+            hot()
+        cold()
+        timercounter.adapt_sampling(100)
+        self.assertGreater(timercounter.get_sampling("hot"), 1)
+        self.assertEqual(timercounter.get_sampling("cold"), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+import time
+import asyncio
+import threading
+import unittest
+from decoratepy import SingleFlight
+
+class TestSingleFlight(unittest.TestCase):
+    def test_threads(self):
+        singleflight = SingleFlight()
+        barrier = threading.Barrier(8)
+        release = threading.Event()
+        calls = []
+
+        @singleflight
+        def fetch(key):
+            calls.append(key)
+            release.wait(5)
+            return key * 2
+
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(fetch(21))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        while singleflight.total_runcall < 8:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [42] * 8)
+        self.assertEqual(calls, [21])
+        self.assertEqual(singleflight.executions("fetch"), 1)
+        self.assertEqual(singleflight.coalesced("fetch"), 7)
+        self.assertEqual(singleflight.number_calls("fetch"), 8)
+        self.assertIn("[fetch] number of calls : 8 - executions : 1 - coalesced : 7", singleflight.name_repr)
+        self.assertIn("coalescing ratio : 87.5%", singleflight.name_repr)
+        self.assertEqual(fetch(21), 42) # nothing is cached
+        self.assertEqual(len(calls), 2)
+        with self.assertRaises(TypeError):
+            singleflight.executions(fetch)
+
+    def test_exception(self):
+        singleflight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        @singleflight
+        def fail(key):
+            started.set()
+            release.wait(5)
+            raise KeyError(key)
+
+        errors = []
+
+        def worker():
+            try:
+                fail("a")
+            except KeyError as error:
+                errors.append(error)
+
+        leader = threading.Thread(target=worker)
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=worker)
+        follower.start()
+        while singleflight.total_runcall < 2:
+            time.sleep(0.001)
+        release.set()
+        leader.join()
+        follower.join()
+        self.assertEqual(len(errors), 2)
+        self.assertIs(errors[0], errors[1])
+        self.assertEqual(singleflight.coalesced("fail"), 1)
+
+    def test_recursion(self):
+        singleflight = SingleFlight()
+        depth = []
+
+        @singleflight
+        def walk(key):
+            depth.append(key)
+            return walk(key) if len(depth) < 3 else len(depth)
+
+        @singleflight
+        async def async_walk(key):
+            depth.append(key)
+            return await async_walk(key) if len(depth) < 3 else len(depth)
+
+        # A recursive call with the same arguments runs the function instead of waiting for itself.
+        self.assertEqual(walk("a"), 3)
+        self.assertEqual(singleflight.executions("walk"), 3)
+        self.assertEqual(singleflight.coalesced("walk"), 0)
+        depth.clear()
+        self.assertEqual(asyncio.run(asyncio.wait_for(async_walk("a"), 5)), 3)
+        self.assertEqual(singleflight.executions("async_walk"), 3)
+        self.assertEqual(singleflight.coalesced("async_walk"), 0)
+
+    def test_coroutine(self):
+        singleflight = SingleFlight()
+        calls = []
+
+        @singleflight
+        async def fetch(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key * 2
+
+        async def main():
+            return await asyncio.gather(fetch(1), fetch(1), fetch(2))
+
+        self.assertEqual(asyncio.run(main()), [2, 2, 4])
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual(singleflight.executions("fetch"), 2)
+        self.assertEqual(singleflight.coalesced("fetch"), 1)
+
+    def test_coroutine_exception(self):
+        singleflight = SingleFlight()
+
+        @singleflight
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("fail")
+
+        async def main():
+            return await asyncio.gather(fail(), fail(), return_exceptions=True)
+
+        errors = asyncio.run(main())
+        self.assertIsInstance(errors[0], ValueError)
+        self.assertIs(errors[0], errors[1])
+        self.assertEqual(singleflight.coalesced("fail"), 1)
+
+    def test_deactivated_and_unhashable(self):
+        singleflight = SingleFlight()
+
+        @singleflight
+        def length(values):
+            return len(values)
+
+        self.assertEqual(length([1, 2]), 2)
+        self.assertEqual(singleflight.executions("length"), 1)
+        singleflight.set_deactivated()
+        length([1])
+        self.assertEqual(singleflight.total_runcall, 1)
+        snapshot = singleflight.snapshot(reset=True)
+        self.assertEqual(snapshot.data, {"length": (1, 0)})
+        self.assertEqual(snapshot.totals["length"][0], 1)
+        self.assertEqual(singleflight.total_runcall, 0)
+        singleflight.merge(snapshot)
+        self.assertEqual(singleflight.executions("length"), 1)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            SingleFlight(sampling=2)
+        with self.assertRaises(ValueError):
+            SingleFlight(calltree=True)
+        with self.assertRaises(ValueError):
+            SingleFlight().set_sampling(2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from decoratepy import Counter, Timer, TimerCounter, TimerCounterLogger
+
+class TestSlots(unittest.TestCase):
+    def test_same_name(self):
+        for decorator in (Counter(), Timer(), TimerCounter(), TimerCounterLogger()):
+            class A:
+                @decorator
+                def func(self):
+                    pass
+
+            class B:
+                @decorator
+                def func(self):
+                    pass
+
+            A().func()
+            B().func()
+            B().func()
+            if hasattr(decorator, "total_runcall"):
+                self.assertEqual(decorator.total_runcall, 3)
+            self.assertIn("[func] ", decorator.name_repr)
+            self.assertIn(f"[{B.func.__qualname__}] ", decorator.name_repr)
+            if hasattr(decorator, "number_calls"):
+                self.assertEqual(decorator.number_calls("func"), 1)
+                self.assertEqual(decorator.number_calls(B.func.__qualname__), 2)
+
+    def test_redecorated_function(self):
+        counter = Counter()
+
+        def func():
+            pass
+
+        first = counter(func)
+        second = counter(func)
+        first()
+        second()
+        self.assertEqual(counter.total_runcall, 2)
+        self.assertIn("[func] number of calls : 2", counter.name_repr)
+
+    def test_threadsafe_logger(self):
+        logger = TimerCounterLogger(threadsafe=True)
+
+        @logger
+        def func():
+            pass
+
+        func()
+
+        @logger
+        def other():
+            pass
+
+        other()
+        func()
+        self.assertEqual(logger.number_calls("func"), 2)
+        self.assertEqual(logger.number_calls("other"), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import pickle
+import threading
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from decoratepy import Counter, Timer, TimerCounter, TimerCounterLogger, Snapshot
+
+timercounter = TimerCounter()
+
+@timercounter
+def work():
+    return sum(range(100))
+
+def task(n):
+    for _ in range(n):
+        work()
+    snapshot = timercounter.snapshot()
+    timercounter.initialize()
+    return snapshot
+
+class TestSnapshot(unittest.TestCase):
+    def test_process_pool(self):
+        parent = TimerCounter()
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            for snapshot in executor.map(task, [100] * 4):
+                self.assertIsInstance(snapshot, Snapshot)
+                parent.merge(snapshot)
+        self.assertEqual(parent.number_calls("work"), 400)
+        self.assertGreater(parent.cumul_runtime("work"), 0.0)
+
+    def test_merge(self):
+        for threadsafe in (False, True):
+            for kind in (Counter, Timer, TimerCounter, TimerCounterLogger):
+                worker, parent = kind(threadsafe=threadsafe), kind(threadsafe=threadsafe)
+
+                @worker
+                def func():
+                    pass
+
+                @parent
+                def other():
+                    pass
+
+                for _ in range(10):
+                    func()
+                other()
+                snapshot = pickle.loads(pickle.dumps(worker.snapshot()))
+                parent.merge(snapshot)
+                parent.merge(snapshot)
+                self.assertIn("[func] ", parent.name_repr)
+                self.assertIn("[other] ", parent.name_repr)
+                if hasattr(parent, "total_runcall"):
+                    self.assertEqual(parent.total_runcall, 21)
+                if hasattr(parent, "number_calls"):
+                    self.assertEqual(parent.number_calls("func"), 20)
+
+    def test_logger_records(self):
+        worker, parent = TimerCounterLogger(max_records=5), TimerCounterLogger()
+
+        @worker
+        def func():
+            pass
+
+        for _ in range(10):
+            func()
+        parent.merge(worker.snapshot())
+        self.assertEqual(len(parent.logger), 5)
+        self.assertEqual(parent.number_calls("func"), 10)
+        self.assertAlmostEqual(parent.cumul_runtime("func"), worker.cumul_runtime("func"))
+
+    def test_sampling(self):
+        worker, parent = Counter(sampling=4), Counter()
+
+        @worker
+        def func():
+            pass
+
+        for _ in range(10):
+            func()
+        parent.merge(worker.snapshot())
+        self.assertEqual(parent.total_runcall, 10)
+
+    def test_delta(self):
+        for kind in (Counter, Timer, TimerCounter, TimerCounterLogger):
+            decorator = kind()
+
+            @decorator
+            def func():
+                pass
+
+            @decorator
+            def other():
+                pass
+
+            func()
+            previous = decorator.snapshot(measurements=False)
+            self.assertIsNone(previous.data)
+            for _ in range(3):
+                func()
+            other()
+            delta = decorator.snapshot(measurements=False).delta(previous)
+            self.assertEqual(sorted(delta), ["func", "other"])
+            self.assertEqual(delta["func"][0], 3)
+            self.assertEqual(delta["other"][0], 1)
+            self.assertEqual(previous.delta(), {"func": previous.totals["func"]})
+            if kind is not Counter:
+                self.assertGreater(delta["func"][1], 0.0)
+
+    def test_read_and_reset(self):
+        for threadsafe in (False, True):
+            for kind in (Counter, Timer, TimerCounter, TimerCounterLogger):
+                decorator = kind(threadsafe=threadsafe)
+
+                @decorator
+                def func():
+                    pass
+
+                for _ in range(5):
+                    func()
+                snapshot = decorator.snapshot(reset=True)
+                self.assertEqual(snapshot.totals["func"][0], 5)
+                self.assertNotIn("func", decorator.snapshot().totals)
+                func()
+                self.assertEqual(decorator.snapshot(measurements=False).totals["func"][0], 1)
+                if hasattr(decorator, "number_calls"):
+                    self.assertEqual(decorator.number_calls("func"), 1)
+                parent = kind()
+                parent.merge(snapshot)
+                self.assertIn("[func] ", parent.name_repr)
+
+    def test_concurrent_reset(self):
+        for kind in (Counter, Timer, TimerCounter, TimerCounterLogger):
+            decorator = kind(threadsafe=True, sampling=3)
+
+            @decorator
+            def func():
+                pass
+
+            def worker():
+                for _ in range(3000):
+                    func()
+
+            threads = [threading.Thread(target=worker) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            calls = 0
+            while any(thread.is_alive() for thread in threads):
+                calls += decorator.snapshot(measurements=False, reset=True).totals.get("func", (0, 0.0))[0]
+            for thread in threads:
+                thread.join()
+            calls += decorator.snapshot(measurements=False, reset=True).totals.get("func", (0, 0.0))[0]
+            self.assertEqual(calls, 12000)
+
+    def test_wrong_snapshot(self):
+        with self.assertRaises(TypeError):
+            Counter().merge({})
+        with self.assertRaises(ValueError):
+            Counter().merge(Timer().snapshot())
+        with self.assertRaises(ValueError):
+            Counter().merge(Counter().snapshot(measurements=False))
+        with self.assertRaises(TypeError):
+            Counter().snapshot(reset=1)
+        with self.assertRaises(ValueError):
+            Counter().snapshot().delta(Timer().snapshot())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from decoratepy import Counter, Timer, TimerCounter, TimerCounterLogger
+
+N_THREADS = 8
+N_CALLS = 2000
+
+def run_in_threads(func):
+    def worker():
+        for _ in range(N_CALLS):
+            func()
+    with ThreadPoolExecutor(max_workers=N_THREADS) as executor:
+        for future in [executor.submit(worker) for _ in range(N_THREADS)]:
+            future.result()
+
+class TestThreadsafe(unittest.TestCase):
+    def test_counter(self):
+        counter = Counter(threadsafe=True)
+
+        @counter
+        def func():
+            pass
+
+        run_in_threads(func)
+        self.assertEqual(counter.total_runcall, N_THREADS * N_CALLS)
+        self.assertIn(f"[func] number of calls : {N_THREADS * N_CALLS}", counter.name_repr)
+
+    def test_timer(self):
+        timer = Timer(threadsafe=True)
+
+        @timer
+        def func():
+            pass
+
+        run_in_threads(func)
+        self.assertGreater(timer.total_runtime, 0.0)
+
+    def test_timer_counter(self):
+        timercounter = TimerCounter(threadsafe=True)
+
+        @timercounter
+        def func():
+            pass
+
+        run_in_threads(func)
+        self.assertEqual(timercounter.total_runcall, N_THREADS * N_CALLS)
+        timercounter.initialize()
+        self.assertEqual(timercounter.total_runcall, 0)
+
+    def test_timer_counter_logger(self):
+        logger = TimerCounterLogger(max_records=1000, threadsafe=True)
+
+        @logger
+        def func():
+            pass
+
+        run_in_threads(func)
+        self.assertEqual(logger.total_runcall, N_THREADS * N_CALLS)
+        self.assertEqual(logger.number_calls("func"), N_THREADS * N_CALLS)
+        self.assertEqual(len(logger.logger), 1000)
+        dates = [logcall[0] for logcall in logger.logger]
+        self.assertEqual(dates, sorted(dates))
+
+    def test_invalid_parameter(self):
+        with self.assertRaises(TypeError):
+            Counter(threadsafe="yes")
+
+if __name__ == "__main__":
+    unittest.main()
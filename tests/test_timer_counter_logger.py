@@ -0,0 +1,253 @@
+import io
+import os
+import tempfile
+import unittest
+import datetime
+import time
+import threading
+from decoratepy import TimerCounterLogger, LogView
+from decoratepy.call_log import CallLog
+
+class TestTimerCounterLogger(unittest.TestCase):
+    def setUp(self):
+        self.logger = TimerCounterLogger()
+
+        @self.logger
+        def first(x):
+            return x + 1
+
+        @self.logger
+        def second():
+            return "second"
+
+        self.first = first
+        self.second = second
+
+    def test_records(self):
+        self.assertEqual(self.first(1), 2)
+        self.assertEqual(self.second(), "second")
+        self.assertEqual(self.first(2), 3)
+
+        self.assertEqual(self.logger.total_runcall, 3)
+        self.assertEqual(self.logger.get_functions(), ["first", "second"])
+        self.assertEqual(self.logger.number_calls("first"), 2)
+        self.assertEqual(self.logger.number_calls("unknown"), 0)
+        self.assertEqual(self.logger.cumul_runtime("unknown"), 0)
+
+        logger = self.logger.logger
+        self.assertEqual(len(logger), 3)
+        self.assertEqual([logcall[1] for logcall in logger], ["first", "second", "first"])
+        self.assertTrue(all(isinstance(logcall[0], datetime.datetime) for logcall in logger))
+        self.assertAlmostEqual(sum(logcall[2] for logcall in logger), self.logger.total_runtime)
+
+        logcalls = self.logger.get_logcall("first")
+        self.assertEqual(len(logcalls), 2)
+        self.assertLessEqual(logcalls[0][0], logcalls[1][0])
+
+    def test_aggregates(self):
+        for x in range(5):
+            self.first(x)
+        logcalls = self.logger.get_logcall("first")
+        runtimes = [logcall[2] for logcall in logcalls]
+        self.assertEqual(self.logger.number_calls("first"), 5)
+        self.assertAlmostEqual(self.logger.cumul_runtime("first"), sum(runtimes))
+        self.assertEqual(self.logger.min_runtime("first"), min(runtimes))
+        self.assertEqual(self.logger.max_runtime("first"), max(runtimes))
+        self.assertEqual(self.logger.min_runtime("second"), 0.0)
+
+        # The per-function index must survive a reordering of the records.
+        self.second()
+        self.logger.sort_by_name()
+        self.assertEqual([logcall[1] for logcall in self.logger.get_logcall("second")], ["second"])
+        self.assertEqual(len(self.logger.get_logcall("first")), 5)
+
+    def test_max_records(self):
+        logger = TimerCounterLogger(max_records=3)
+
+        @logger
+        def func(x):
+            return x
+
+        for x in range(10):
+            func(x)
+        self.assertEqual(len(logger.logger), 3)
+        self.assertEqual(len(logger.get_logcall("func")), 3)
+        self.assertEqual(logger.total_runcall, 10)
+        self.assertEqual(logger.number_calls("func"), 10)
+
+    def test_max_age(self):
+        logger = TimerCounterLogger(max_age=0.05)
+
+        @logger
+        def func():
+            pass
+
+        func()
+        time.sleep(0.1)
+        func()
+        self.assertEqual(len(logger.logger), 1)
+        self.assertEqual(logger.total_runcall, 2)
+
+    def test_invalid_retention(self):
+        with self.assertRaises(ValueError):
+            TimerCounterLogger(max_records=0)
+        with self.assertRaises(TypeError):
+            TimerCounterLogger(max_age="1h")
+
+    def test_representations(self):
+        self.first(1)
+        self.second()
+        self.assertIn("[first] number of calls : 1", self.logger.name_repr)
+        self.assertIn("function : second", self.logger.log_repr)
+        self.assertIn("total number of calls : 2", self.logger.details_repr)
+
+    def test_streamed_representations(self):
+        for _ in range(10):
+            self.first(1)
+            self.second()
+        for kind, string in (("name", self.logger.name_repr), ("details", self.logger.details_repr), ("log", self.logger.log_repr)):
+            chunks = list(self.logger.iter_repr(kind, chunk_size=3))
+            self.assertGreater(len(chunks), 1)
+            self.assertEqual("".join(chunks), string)
+        stream = io.StringIO()
+        self.logger.write_repr(stream, "log")
+        self.assertEqual(stream.getvalue(), self.logger.log_repr)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "report.txt")
+            self.logger.write_repr(path, "details")
+            with open(path, encoding="utf-8") as file:
+                self.assertEqual(file.read(), self.logger.details_repr)
+        with self.assertRaises(ValueError):
+            list(self.logger.iter_repr("unknown"))
+        with self.assertRaises(TypeError):
+            self.logger.write_repr(1)
+
+    def test_ring_representation(self):
+        logger = TimerCounterLogger(max_records=4)
+
+        @logger
+        def func():
+            pass
+
+        for _ in range(10):
+            func()
+        dates = [str(record[0]) for record in logger.logger]
+        lines = logger.log_repr.splitlines()[1:5]
+        self.assertEqual([line[1:line.index("]")] for line in lines], dates)
+
+    def test_incremental_sort(self):
+        logger = TimerCounterLogger()
+
+        @logger
+        def inner():
+            pass
+
+        @logger
+        def outer():
+            inner()
+
+        # The outer calls start first but are logged after the inner calls.
+        for _ in range(3):
+            outer()
+        log = logger._merged_log()
+        self.assertFalse(log.is_sorted)
+        # The representations sort the logger by date, like sort_by_date.
+        self.assertEqual([line.split(" function : ")[1].split(" ")[0] for line in logger.log_repr.splitlines()[1:7]], ["outer", "inner"] * 3)
+        self.assertTrue(log.is_sorted)
+        self.assertEqual([record[1] for record in logger.logger], ["outer", "inner"] * 3)
+        inner()
+        self.assertTrue(log.is_sorted)
+        outer()
+        logger.sort_by_date()
+        dates = [record[0] for record in logger.logger]
+        self.assertEqual(dates, sorted(dates))
+        self.assertEqual([record[1] for record in logger.logger][-3:], ["inner", "outer", "inner"])
+        self.assertEqual(len(logger.get_logcall("inner")), 5)
+
+    def test_incremental_merge(self):
+        logger = TimerCounterLogger(max_records=6, threadsafe=True)
+
+        @logger
+        def func():
+            pass
+
+        for count in range(1, 5):
+            func()
+            func()
+            self.assertEqual(logger.total_runcall, 2 * count)
+            self.assertEqual(logger.number_calls("func"), 2 * count)
+            self.assertEqual(len(logger.logger), min(2 * count, 6))
+        dates = [record[0] for record in logger.logger]
+        self.assertEqual(dates, sorted(dates))
+
+    def test_view(self):
+        for _ in range(3):
+            self.first(1)
+            time.sleep(0.001)
+            self.second()
+            time.sleep(0.001)
+        view = self.logger.logger
+        self.assertIsInstance(view, LogView)
+        self.assertEqual(len(view), 6)
+        self.assertEqual([record[1] for record in view[1::2]], ["second"] * 3)
+        self.assertEqual(view[-1][1], "second")
+        self.assertEqual(len(view[:4][1:]), 3)
+        self.assertEqual(len(view.filter("first")), 3)
+        self.assertEqual(len(view.filter("unknown")), 0)
+        self.assertEqual(len(view[::-1].filter("second")), 3)
+        dates = [record[0] for record in view]
+        self.assertEqual(view.filter(start=dates[2]).materialize(), view[2:].materialize())
+        self.assertEqual(view.filter(start=dates[1], end=dates[4]).materialize(), view[1:4].materialize())
+        self.assertEqual(len(view.filter("first", start=dates[1])), 2)
+        records = view.materialize()
+        self.assertIsInstance(records, list)
+        self.logger.snapshot(reset=True)
+        with self.assertRaises(IndexError):
+            view[0]
+        self.assertEqual(len(records), 6)
+        with self.assertRaises(TypeError):
+            view.filter(start=1.0)
+
+    def test_view_rounded_dates(self):
+        # Timestamps around the rounding to the microsecond of the dates.
+        log = CallLog()
+        func_id = log.intern("func")
+        base = 10 ** 12 - log.epoch % 1000
+        for index in range(1000):
+            log.append(func_id, base + index * 1000 + (499, 500, 501, 999, 0)[index % 5], 1)
+        view = LogView(log)
+        for index, record in enumerate(view):
+            self.assertEqual(view.filter(start=record[0])[0], record)
+            self.assertNotIn(record, view.filter(end=record[0]).materialize())
+
+    def test_shared_epoch(self):
+        logger = TimerCounterLogger(threadsafe=True)
+
+        @logger
+        def func():
+            pass
+
+        func()
+        thread = threading.Thread(target=func)
+        thread.start()
+        thread.join()
+        logger.initialize()
+        func()
+        # Every log of the decorator converts the timestamps with the same epoch.
+        logs = [log for _, log in logger._all_shards()] + [logger._merged_log(), logger.snapshot().data]
+        self.assertEqual({log.epoch for log in logs}, {logger._log_epoch})
+        log = CallLog(epoch=123)
+        log.clear()
+        self.assertEqual(log.epoch, 123)
+        self.assertEqual(CallLog.merge([log], epoch=456).epoch, 456)
+        with self.assertRaises(TypeError):
+            CallLog(epoch=1.0)
+
+    def test_initialize(self):
+        self.first(1)
+        self.logger.initialize()
+        self.assertEqual(self.logger.total_runcall, 0)
+        self.assertEqual(self.logger.get_functions(), [])
+
+if __name__ == "__main__":
+    unittest.main()